@@ -32,6 +32,7 @@ class UserDataSchema(BaseModel):
     # Identity verification
     gst_number: Optional[str] = None
     aadhaar_number: Optional[str] = None
+    version: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -71,4 +72,5 @@ class UserProfileUpdate(BaseModel):
     # Identity verification
     gst_number: Optional[str] = None
     aadhaar_number: Optional[str] = None
-
+    # Version the client last read; a stale value is rejected with 409
+    version: Optional[int] = None
@@ -1,7 +1,9 @@
+import os
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
+from urllib.parse import parse_qsl, urlencode
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
@@ -13,9 +15,15 @@ SECRET_KEY = "supersecretkeyneedschanging"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 24 * 60  # 24 hours
 
+# Comma-separated emails allowed to use book-wide analytics and ops endpoints
+ADMIN_EMAILS = {e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()}
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Browser EventSource cannot set headers, so these routes may pass the token as ?access_token=
+QUERY_TOKEN_PATHS = {"/notifications/stream"}
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -33,11 +41,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+    return get_user_from_token(token, db)
+
+def get_user_from_token(token: Optional[str], db: Session):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if not token:
+        raise credentials_exception
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -51,3 +64,31 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     if user is None:
         raise credentials_exception
     return user
+
+def get_current_admin(current_user: models.User = Depends(get_current_user)):
+    if not current_user.email or current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+
+class QueryTokenMiddleware:
+    """
+    ASGI middleware for QUERY_TOKEN_PATHS: moves ?access_token= into an Authorization header
+    and drops it from the query string, so routes authenticate it like any bearer token and
+    the token never shows up in access logs, request logs or metrics. The scope is edited in
+    place because the server's access log reads the same dict. Add it last (outermost).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in QUERY_TOKEN_PATHS and b"access_token=" in scope["query_string"]:
+            params = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+            token = next((value for name, value in params if name == "access_token"), None)
+            scope["query_string"] = urlencode([(name, value) for name, value in params if name != "access_token"]).encode("latin-1")
+            headers = list(scope.get("headers", []))
+            if token and not any(name == b"authorization" for name, _ in headers):
+                headers.append((b"authorization", f"Bearer {token}".encode("latin-1")))
+            scope["headers"] = headers
+        await self.app(scope, receive, send)
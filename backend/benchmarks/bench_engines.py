@@ -0,0 +1,182 @@
+"""
+Micro-benchmarks for the service engines.
+
+Times finance_engine.generate_job_plan, recommendation_engine (single profile and
+recommend_batch), portfolio_engine.build_allocations and
+indicators.calculate_rsi on synthetic inputs at 1, 1k and 1M inputs. Each case
+reports the best of several rounds, so one slow round from a noisy machine does
+not count.
+
+Timings are divided by a fixed calibration workload before they are compared with
+engine_baseline.json, so the baseline carries over to other machines. --check
+exits non-zero if any case is more than --threshold times (default 2x) slower
+than its baseline.
+
+    python -m backend.benchmarks.bench_engines [--sizes 1 1000] [--only recommendations]
+    python -m backend.benchmarks.bench_engines --check
+    python -m backend.benchmarks.bench_engines --update-baseline
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.services import finance_engine, indicators, portfolio_engine, recommendation_engine
+from backend.services.profile_input import ProfileInput
+
+SIZES = [1, 1_000, 1_000_000]
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "engine_baseline.json")
+DEFAULT_THRESHOLD = 2.0
+MIN_TIME = 0.2  # seconds of rounds per case; long cases run once
+MAX_ROUNDS = 1_000
+
+RISKS = np.array(["low", "moderate", "high"])
+
+
+def synthetic_inputs(size, seed=7):
+    rng = np.random.default_rng(seed)
+    income = rng.uniform(1_000, 30_000, size)
+    return {
+        "income": income,
+        "expenses": income * rng.uniform(0.2, 1.1, size),
+        "savings": rng.uniform(0, 250_000, size),
+        "risk_tolerance": RISKS[rng.integers(0, 3, size)],
+        "amount": rng.uniform(100, 10_000, size),
+        "prices": 100 + np.cumsum(rng.normal(0, 1, size)),
+    }
+
+
+def job_plan_case(data):
+    rows = list(zip(data["income"].tolist(), data["expenses"].tolist(), data["risk_tolerance"].tolist()))
+    return lambda: [finance_engine.generate_job_plan(income, expenses, risk) for income, expenses, risk in rows]
+
+
+def recommendations_case(data):
+    if len(data["income"]) == 1:
+        profile = ProfileInput(
+            user_id=None, user_type="job", income=float(data["income"][0]), expenses=float(data["expenses"][0]),
+            savings=float(data["savings"][0]), risk_tolerance=str(data["risk_tolerance"][0]),
+            monthly_investment=0.0, ai_investment_amount=None, budget=0.0,
+        )
+
+        def single():
+            # Time the computation, not a memo hit
+            recommendation_engine._recommend.cache_clear()
+            return recommendation_engine.generate_recommendations(profile)
+        return single
+    columns = (data["income"].tolist(), data["expenses"].tolist(), data["savings"].tolist(), data["risk_tolerance"].tolist())
+    return lambda: recommendation_engine.recommend_batch(*columns)
+
+
+def portfolio_case(data):
+    rows = list(zip(data["amount"].tolist(), data["risk_tolerance"].tolist()))
+    return lambda: [portfolio_engine.build_allocations(amount, risk) for amount, risk in rows]
+
+
+def rsi_case(data):
+    prices = pd.Series(data["prices"])
+    return lambda: indicators.calculate_rsi(prices, period=14)
+
+
+CASES = {
+    "job_plan": (job_plan_case, SIZES),
+    "recommendations": (recommendations_case, SIZES),
+    "portfolio": (portfolio_case, SIZES),
+    "rsi": (rsi_case, SIZES),
+}
+
+
+def best_time(fn):
+    """Best wall time of one call, over as many rounds as fit in MIN_TIME (at least one). GC is off, as in timeit."""
+    best = float("inf")
+    spent = 0.0
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(MAX_ROUNDS):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            best = min(best, elapsed)
+            spent += elapsed
+            if spent >= MIN_TIME:
+                break
+    finally:
+        gc.enable()
+    return best
+
+
+def calibrate():
+    """Seconds for a fixed mix of interpreter and NumPy work; benchmark timings are reported relative to it."""
+    values = np.random.default_rng(0).uniform(size=1_000_000)
+    items = values[:200_000].tolist()
+
+    def workload():
+        rows = [{"value": v, "scaled": v * 1.5} for v in items]
+        np.sort(values)
+        return rows
+    return min(best_time(workload) for _ in range(5))
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def run(args):
+    calibration = calibrate()
+    baseline = load_baseline(args.baseline)
+    base_cases = (baseline or {}).get("cases", {})
+
+    print(f"calibration {calibration * 1000:.2f} ms")
+    print(f"{'case':<28}  {'ms':>10}  {'per input us':>12}  {'vs baseline':>11}")
+    results, regressions = {}, []
+    for name, (make_case, sizes) in CASES.items():
+        if args.only and name not in args.only:
+            continue
+        for size in sizes:
+            if args.sizes and size not in args.sizes:
+                continue
+            key = f"{name}[{size}]"
+            seconds = best_time(make_case(synthetic_inputs(size)))
+            relative = seconds / calibration
+            results[key] = {"seconds": seconds, "relative": relative}
+
+            ratio = relative / base_cases[key]["relative"] if key in base_cases else None
+            if ratio is not None and ratio > args.threshold:
+                regressions.append((key, ratio))
+            compare = f"{ratio:>10.2f}x" if ratio is not None else f"{'new':>11}"
+            print(f"{key:<28}  {seconds * 1000:>10.3f}  {seconds / size * 1e6:>12.3f}  {compare}")
+
+    if args.update_baseline:
+        cases = dict(base_cases)
+        cases.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"calibration_seconds": calibration, "cases": cases}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than {args.threshold}x baseline:")
+        for key, ratio in regressions:
+            print(f"  {key}: {ratio:.2f}x")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", help=f"subset of {SIZES}")
+    parser.add_argument("--only", nargs="+", choices=list(CASES), help="engines to run")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--check", action="store_true", help="exit 1 on any regression past the threshold")
+    parser.add_argument("--update-baseline", action="store_true", help="record these timings as the baseline")
+    run(parser.parse_args())
@@ -0,0 +1,75 @@
+"""
+Benchmark for POST /startups/validate-ids lookups.
+
+Seeds a throwaway SQLite database with startups, then times
+id_validation.find_existing_ids for each strategy at growing input sizes
+(half the submitted ids exist, with some duplicates).
+
+    python -m backend.benchmarks.bench_validate_ids [--startups 100000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend.db import models
+from backend.services import id_validation
+
+SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def seed(engine, count):
+    rows = [
+        {"id": str(uuid.uuid4()), "name": f"Bench {i}", "creator_email": "bench@example.com"}
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(models.Startup), rows)
+    return [r["id"] for r in rows]
+
+
+def make_input(existing_ids, size):
+    hits = random.sample(existing_ids, min(size // 2, len(existing_ids)))
+    misses = [str(uuid.uuid4()) for _ in range(size - len(hits))]
+    ids = hits + misses
+    random.shuffle(ids)
+    # ~5% duplicates, as stale client caches tend to have
+    ids += ids[: size // 20]
+    return ids
+
+
+def run(startups):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+
+        print(f"Seeding {startups:,} startups...")
+        existing_ids = seed(engine, startups)
+
+        print(f"{'ids':>8}  {'strategy':>10}  {'ms':>9}  {'valid':>7}")
+        for size in SIZES:
+            ids = make_input(existing_ids, size)
+            for strategy in ("in", "temp_table"):
+                db = Session()
+                try:
+                    start = time.perf_counter()
+                    found = id_validation.find_existing_ids(db, ids, strategy=strategy)
+                    elapsed = (time.perf_counter() - start) * 1000
+                finally:
+                    db.close()
+                print(f"{len(ids):>8,}  {strategy:>10}  {elapsed:>9.1f}  {len(found):>7,}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--startups", type=int, default=100_000)
+    args = parser.parse_args()
+    random.seed(42)
+    run(args.startups)
@@ -0,0 +1,325 @@
+"""
+HTTP load test for the backend API.
+
+Seeds a throwaway SQLite database with realistic volumes (investors, founders,
+startups, investment requests, notifications), starts uvicorn against it
+(DATABASE_URL), drives the main read routes with concurrent clients for a fixed
+duration and reports throughput and p50/p95/p99 latency per route.
+
+Results are written to backend/benchmarks/results/load-<commit>.json; pass an
+earlier file as --compare to print the change per route.
+
+    python -m backend.benchmarks.load_test [--clients 16] [--duration 30]
+    python -m backend.benchmarks.load_test --database /tmp/load.db   # seed once, reuse
+    python -m backend.benchmarks.load_test --compare backend/benchmarks/results/load-<old>.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import requests
+from sqlalchemy import create_engine, insert, select
+
+from backend.auth import utils
+from backend.db import models
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+PASSWORD = "loadtest123"
+
+INDUSTRIES = ["fintech", "healthtech", "edtech", "saas", "climate", "logistics", "retail", "ai"]
+NAME_WORDS = ["nova", "quant", "ledger", "pulse", "orbit", "vertex", "harbor", "cedar", "flux", "signal"]
+SEARCH_TERMS = NAME_WORDS + ["payments", "platform", "analytics"]
+
+# (name, role, weight, method, path, params, body); role "any" runs for both investors and founders
+ROUTES = [
+    ("finance_me", "any", 10, "GET", "/finance/me", None, None),
+    ("notifications", "any", 10, "GET", "/notifications/", {"limit": 20}, None),
+    ("notifications_unread", "any", 12, "GET", "/notifications/unread-count", None, None),
+    ("job_plan", "investor", 8, "GET", "/finance/job-plan", None, None),
+    ("portfolio_me", "investor", 8, "GET", "/portfolio/me", None, None),
+    ("recommendations", "investor", 6, "GET", "/recommendations/job", None, None),
+    ("startup_search", "investor", 10, "GET", "/startups/search", "search", None),
+    ("startups_recommended", "investor", 6, "GET", "/startups/recommended", {"k": 10}, None),
+    ("scenario_simulate", "investor", 2, "POST", "/scenarios/simulate", None,
+     {"type": "invest", "capital": 10000, "years": 5, "paths": 2000}),
+    ("startup_requests", "founder", 6, "GET", "/invest/startup/requests", None, None),
+    ("my_startups", "founder", 4, "GET", "/startups/my", None, None),
+]
+
+
+def seed(url, investors, founders, startups, investment_requests, notifications):
+    """Bulk-insert the dataset with Core inserts, then materialize derived rows via the services."""
+    from backend.services import portfolio_rebuild, ranking_engine, startup_search
+    from sqlalchemy.orm import sessionmaker
+
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    startup_search.ensure_fulltext_index(engine)
+    password_hash = utils.get_password_hash(PASSWORD)  # bcrypt is slow; every user shares one hash
+    now = datetime.utcnow()
+
+    def user_rows(role, count, user_type):
+        users, data = [], []
+        for i in range(count):
+            user_id = str(uuid.uuid4())
+            users.append({"id": user_id, "email": f"{role}{i}@load.example.com", "password_hash": password_hash, "created_at": now})
+            income = random.uniform(3_000, 30_000)
+            data.append({
+                "id": str(uuid.uuid4()), "user_id": user_id, "user_type": user_type, "version": 1,
+                "income": income, "expenses": income * random.uniform(0.3, 0.9),
+                "current_savings": random.uniform(0, 200_000),
+                "risk_tolerance": random.choice(["low", "moderate", "high"]),
+                "monthly_investment": random.uniform(0, 5_000), "budget": random.uniform(0, 500_000),
+                "cash_balance": random.uniform(0, 2_000_000), "updated_at": now,
+            })
+        return users, data
+
+    investor_users, investor_data = user_rows("investor", investors, "job")
+    founder_users, founder_data = user_rows("founder", founders, "startup")
+
+    startup_rows = []
+    for i in range(startups):
+        founder = founder_users[i % founders]
+        words = random.sample(NAME_WORDS, 2)
+        startup_rows.append({
+            "id": str(uuid.uuid4()), "name": f"{words[0].title()} {words[1].title()} {i}",
+            "description": f"{random.choice(INDUSTRIES)} {random.choice(SEARCH_TERMS)} platform",
+            "creator_email": founder["email"], "industry": random.choice(INDUSTRIES),
+            "revenue": random.uniform(0, 200_000), "burn": random.uniform(5_000, 150_000),
+            "cash": random.uniform(0, 3_000_000), "growth": random.uniform(-10, 60),
+            "team": random.randint(1, 80), "runway": random.randint(1, 36),
+            "survival_score": random.randint(0, 100),
+            "created_at": now - timedelta(minutes=random.randint(0, 525_600)), "updated_at": now,
+        })
+    founder_ids = {u["email"]: u["id"] for u in founder_users}
+
+    request_rows = []
+    for _ in range(investment_requests):
+        startup = random.choice(startup_rows)
+        request_rows.append({
+            "id": str(uuid.uuid4()), "investor_user_id": random.choice(investor_users)["id"],
+            "startup_user_id": founder_ids[startup["creator_email"]], "startup_id": startup["id"],
+            "startup_name": startup["name"], "startup_owner": startup["creator_email"],
+            "message": "Interested in your round", "status": random.choice(["pending", "accepted", "rejected"]),
+            "is_read": random.random() < 0.6, "created_at": now - timedelta(minutes=random.randint(0, 525_600)),
+        })
+
+    receivers = [u["email"] for u in investor_users + founder_users]
+    notification_rows = [
+        {
+            "id": str(uuid.uuid4()), "receiver_email": random.choice(receivers),
+            "type": random.choice(["investor_request_accepted", "investor_request_rejected", "new_investment_request"]),
+            "message": "Load test notification", "read": random.random() < 0.7,
+            "created_at": now - timedelta(minutes=random.randint(0, 525_600)),
+        }
+        for _ in range(notifications)
+    ]
+
+    with engine.begin() as conn:
+        for model, rows in (
+            (models.User, investor_users + founder_users),
+            (models.UserData, investor_data + founder_data),
+            (models.Startup, startup_rows),
+            (models.InvestmentRequest, request_rows),
+            (models.Notification, notification_rows),
+        ):
+            for start in range(0, len(rows), 5000):
+                conn.execute(insert(model), rows[start:start + 5000])
+
+    db = sessionmaker(bind=engine)()
+    try:
+        ranking_engine.refresh_scores(db)
+        portfolio_rebuild.regenerate_portfolios(db, only_stale=False)
+    finally:
+        db.close()
+    engine.dispose()
+    return [u["email"] for u in investor_users], [u["email"] for u in founder_users]
+
+
+def seeded_emails(url):
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(models.User.email).where(models.User.email.like("%@load.example.com"))
+        ).scalars().all()
+    engine.dispose()
+    return [e for e in rows if e.startswith("investor")], [e for e in rows if e.startswith("founder")]
+
+
+def start_server(url, port, workers):
+    env = dict(os.environ, DATABASE_URL=url, LOG_LEVEL=os.getenv("LOG_LEVEL", "WARNING"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--workers", str(workers)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(120):
+        try:
+            requests.get(f"{base_url}/openapi.json", timeout=1)
+            return server, base_url
+        except requests.ConnectionError:
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start within 30s")
+
+
+def client_loop(base_url, role, emails, deadline, warmup_until, results, lock, rng):
+    routes = [r for r in ROUTES if r[1] in (role, "any")]
+    weights = [r[2] for r in routes]
+    token = {e: utils.create_access_token({"sub": e}, timedelta(hours=2)) for e in emails}
+    session = requests.Session()
+    samples = []
+    while True:
+        started = time.perf_counter()
+        if started >= deadline:
+            break
+        name, _, _, method, path, params, body = rng.choices(routes, weights)[0]
+        if params == "search":
+            params = {"q": rng.choice(SEARCH_TERMS), "limit": 20}
+        email = rng.choice(emails)
+        try:
+            status = session.request(
+                method, base_url + path, params=params, json=body,
+                headers={"Authorization": f"Bearer {token[email]}"}, timeout=30
+            ).status_code
+        except requests.RequestException:
+            status = 0
+        if started >= warmup_until:
+            samples.append((name, time.perf_counter() - started, status))
+    with lock:
+        results.extend(samples)
+
+
+def summarize(samples, duration):
+    by_route = {}
+    for name, elapsed, status in samples:
+        by_route.setdefault(name, ([], [0]))
+        by_route[name][0].append(elapsed)
+        if status == 0 or status >= 400:
+            by_route[name][1][0] += 1
+    summary = {}
+    for name, (latencies, errors) in sorted(by_route.items()):
+        ms = np.asarray(latencies) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        summary[name] = {
+            "requests": len(ms), "errors": errors[0], "rps": round(len(ms) / duration, 1),
+            "p50_ms": round(float(p50), 2), "p95_ms": round(float(p95), 2), "p99_ms": round(float(p99), 2),
+        }
+    return summary
+
+
+def git_commit():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+        dirty = subprocess.call(["git", "diff", "--quiet", "HEAD"], stderr=subprocess.DEVNULL) != 0
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(summary, baseline=None):
+    header = f"{'route':<22}  {'reqs':>7}  {'err':>5}  {'rps':>7}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}"
+    if baseline:
+        header += f"  {'p95 vs base':>11}"
+    print(header)
+    for name, row in summary.items():
+        line = (
+            f"{name:<22}  {row['requests']:>7,}  {row['errors']:>5,}  {row['rps']:>7.1f}  "
+            f"{row['p50_ms']:>8.1f}  {row['p95_ms']:>8.1f}  {row['p99_ms']:>8.1f}"
+        )
+        base = (baseline or {}).get(name)
+        if base:
+            line += f"  {(row['p95_ms'] / base['p95_ms'] - 1) * 100 if base['p95_ms'] else 0:>+10.1f}%"
+        print(line)
+
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.abspath(args.database or os.path.join(tmp, "load.db"))
+        url = f"sqlite:///{path}"
+        if os.path.exists(path):
+            print(f"Reusing seeded database {path}")
+            investors, founders = seeded_emails(url)
+        else:
+            print(
+                f"Seeding {args.investors:,} investors, {args.founders:,} founders, {args.startups:,} startups, "
+                f"{args.requests:,} requests, {args.notifications:,} notifications..."
+            )
+            investors, founders = seed(url, args.investors, args.founders, args.startups, args.requests, args.notifications)
+
+        server, base_url = start_server(url, args.port, args.workers)
+        try:
+            founder_clients = round(args.clients * args.founder_share)
+            roles = ["founder"] * founder_clients + ["investor"] * (args.clients - founder_clients)
+            print(f"Running {args.clients} clients for {args.duration}s (+{args.warmup}s warmup) against {base_url}...")
+            results, lock = [], threading.Lock()
+            warmup_until = time.perf_counter() + args.warmup
+            deadline = warmup_until + args.duration
+            threads = [
+                threading.Thread(target=client_loop, args=(
+                    base_url, role, founders if role == "founder" else investors,
+                    deadline, warmup_until, results, lock, random.Random(args.seed + i)
+                ))
+                for i, role in enumerate(roles)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            server.terminate()
+            server.wait()
+
+    summary = summarize(results, args.duration)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["routes"]
+    print_report(summary, baseline)
+
+    commit = git_commit()
+    record = {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("compare", "output")},
+        "total_rps": round(len(results) / args.duration, 1),
+        "routes": summary,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(record, f, indent=2)
+    print(f"Total {record['total_rps']:.1f} req/s. Results written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--investors", type=int, default=2_000)
+    parser.add_argument("--founders", type=int, default=500)
+    parser.add_argument("--startups", type=int, default=2_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--notifications", type=int, default=50_000)
+    parser.add_argument("--database", help="SQLite file to seed (or reuse if it exists); default is a temp file")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--founder-share", type=float, default=0.25, help="fraction of clients acting as founders")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--compare", help="earlier results JSON to compare p95 against")
+    parser.add_argument("--output", help="results path (default results/load-<commit>.json)")
+    args = parser.parse_args()
+    random.seed(args.seed)
+    run(args)
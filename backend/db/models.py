@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -41,29 +41,64 @@ class UserData(Base):
 
     # Corporate Treasury fields (startup users)
     cash_balance = Column(Float, default=0.0)
-    runway_months = Column(Float, default=0.0)
+    runway_months = Column(Float, nullable=True) # Materialized by treasury_engine.apply_runway; None = not burning cash
     debt = Column(Float, default=0.0)
     other_assets = Column(Float, default=0.0)
 
     # Store user query/market text
     market_text = Column(String, nullable=True)
 
+    # /finance/job-plan response precomputed on profile writes (services.job_plans)
+    job_plan_json = Column(String, nullable=True)
+    job_plan_hash = Column(String, nullable=True) # Hash of the plan's inputs when it was built
+    job_plan_format = Column(Integer, nullable=True) # finance_engine.PLAN_FORMAT_VERSION it was built with
+
     # Identity verification
     gst_number = Column(String, nullable=True)      # For startup users (15 char alphanumeric)
     aadhaar_number = Column(String, nullable=True)   # For job users (12 digit)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Optimistic concurrency: every UPDATE is compare-and-swap on this column
+    version = Column(Integer, nullable=False, default=1)
     
     owner = relationship("User", back_populates="data")
 
+    __mapper_args__ = {"version_id_col": version}
+
 class UserPortfolio(Base):
     __tablename__ = "user_portfolio"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String, ForeignKey("users.id"))
+    user_id = Column(String, ForeignKey("users.id"), unique=True, index=True) # One portfolio per user
     monthly_investment = Column(Float, default=0.0)
-    allocation_json = Column(String) # JSON string of allocation
+    allocation_json = Column(String, nullable=True) # Deprecated: legacy rows only, see PortfolioAllocation
+    template_version = Column(Integer, nullable=True) # Allocation template file version the rows were built from
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     owner = relationship("User", back_populates="portfolio")
+    allocations = relationship(
+        "PortfolioAllocation",
+        back_populates="portfolio",
+        order_by="PortfolioAllocation.position",
+        cascade="all, delete-orphan"
+    )
+
+class PortfolioAllocation(Base):
+    __tablename__ = "portfolio_allocations"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    portfolio_id = Column(String, ForeignKey("user_portfolio.id"), index=True)
+    user_id = Column(String, ForeignKey("users.id"), index=True)
+    position = Column(Integer, default=0) # Display order within the portfolio
+    asset = Column(String)
+    asset_class = Column(String, index=True) # equity, bonds, crypto, cash, ...
+    percent = Column(Float)
+    amount = Column(Float)
+    color = Column(String, nullable=True)
+
+    portfolio = relationship("UserPortfolio", back_populates="allocations")
 
 class InvestmentRequest(Base):
     __tablename__ = "investment_requests_v2"
@@ -72,7 +107,7 @@ class InvestmentRequest(Base):
     investor_user_id = Column(String, ForeignKey("users.id"))
     startup_user_id = Column(String, ForeignKey("users.id"))
 
-    startup_id = Column(String) # Can be same as startup_user_id or specific project ID
+    startup_id = Column(String, index=True) # Can be same as startup_user_id or specific project ID
     startup_name = Column(String, nullable=True) # Checkpoint for history
     startup_owner = Column(String, nullable=True) # The email of the creator, for filtering
     message = Column(String, nullable=True)
@@ -90,8 +125,8 @@ class Startup(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String)
     description = Column(String, nullable=True)
-    creator_email = Column(String, nullable=False) # Critical field
-    industry = Column(String, nullable=True)
+    creator_email = Column(String, nullable=False, index=True) # Critical field
+    industry = Column(String, nullable=True, index=True)
     
     # Financial Snapshots
     revenue = Column(Float, default=0.0)
@@ -101,8 +136,24 @@ class Startup(Base):
     team = Column(Integer, default=0)
     runway = Column(Integer, default=0)
     survival_score = Column(Integer, default=0)
+
+    # Materialized by services.ranking_engine (moderate-profile fundability, 0-100)
+    fundability_score = Column(Float, nullable=True)
+
+    # Stable integer key for the FTS5 index (content_rowid); assigned by services.startup_search's
+    # insert trigger. The implicit rowid of a table with a string primary key can change on VACUUM.
+    search_key = Column(Integer, nullable=True, index=True)
     
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Discovery sorts are keyset-paginated on (metric, id)
+    __table_args__ = (
+        Index("ix_startups_fundability_score_id", "fundability_score", "id"),
+        Index("ix_startups_survival_score_id", "survival_score", "id"),
+        Index("ix_startups_growth_id", "growth", "id"),
+        Index("ix_startups_created_at_id", "created_at", "id"),
+    )
 
 class Notification(Base):
     __tablename__ = "notifications"
@@ -113,3 +164,34 @@ class Notification(Base):
     message = Column(String)
     read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Structured links for cascades (never match on message text)
+    startup_id = Column(String, nullable=True, index=True)
+    request_id = Column(String, nullable=True, index=True)
+
+    # Feed is always "this receiver, newest first" -> keyset pages straight off the index
+    __table_args__ = (
+        Index("ix_notifications_receiver_created", "receiver_email", "created_at"),
+    )
+
+class NotificationArchive(Base):
+    __tablename__ = "notifications_archive"
+
+    # Old read notifications moved out of the hot table by the retention job
+    id = Column(String, primary_key=True)
+    receiver_email = Column(String, index=True)
+    type = Column(String)
+    message = Column(String)
+    read = Column(Boolean, default=True)
+    created_at = Column(DateTime)
+    startup_id = Column(String, nullable=True, index=True)
+    request_id = Column(String, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+class UnreadCounter(Base):
+    __tablename__ = "unread_counters"
+
+    # One row per user; missing rows are rebuilt from the source tables on read
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    notifications = Column(Integer, default=0)
+    investment_requests = Column(Integer, default=0)
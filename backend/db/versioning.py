@@ -0,0 +1,30 @@
+from fastapi import HTTPException, status
+from sqlalchemy.orm.exc import StaleDataError
+
+CONFLICT_MESSAGE = "Your profile was changed in another session. Reload and try again."
+
+
+def conflict(current_version=None):
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"message": CONFLICT_MESSAGE, "current_version": current_version},
+    )
+
+
+def check_version(user_data, expected_version):
+    """Reject a write made against an older copy of the row (client sent the version it read)."""
+    if expected_version is not None and user_data.version != expected_version:
+        raise conflict(user_data.version)
+
+
+def commit_or_conflict(db):
+    """
+    Commit, turning a lost compare-and-swap into a 409.
+    UserData's UPDATE carries `WHERE version = <version read>` (mapper version_id_col),
+    so a concurrent writer that got there first makes it match no rows.
+    """
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise conflict()
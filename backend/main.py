@@ -1,8 +1,10 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import sys
 import os
+import logging
 
 # Fix path to allow imports from backend root
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,10 +13,23 @@ import yfinance as yf
 import pandas as pd
 
 from backend.db import models, database
-from backend.routers import auth, portfolio, finance, recommendations, invest, startup, notifications
+from backend.auth import utils as auth_utils
+from backend.routers import auth, portfolio, finance, recommendations, invest, startup, notifications, scenarios, admin
+from backend.services import job_plans, ranking_engine, startup_search
+from backend.services.indicators import calculate_rsi
+from backend.utils import log, metrics, profiling
+
+log.setup_logging()
+logger = logging.getLogger("backend.main")
 
 # Create Database Tables
 models.Base.metadata.create_all(bind=database.engine)
+startup_search.ensure_fulltext_index(database.engine)
+metrics.instrument_engine(database.engine)
+# Stored job plans from an older plan format are rebuilt off the request path
+job_plans.start_background_recompute(database.SessionLocal)
+# Startups saved before fundability_score existed get scored the same way
+ranking_engine.start_background_refresh(database.SessionLocal)
 
 app = FastAPI(title="GenFin Backend")
 
@@ -26,6 +41,8 @@ app.include_router(portfolio.router)
 app.include_router(invest.router)
 app.include_router(startup.router)
 app.include_router(notifications.router)
+app.include_router(scenarios.router)
+app.include_router(admin.router)
 
 
 
@@ -37,19 +54,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", log.REQUEST_ID_HEADER],
 )
+app.add_middleware(profiling.ProfilingMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(log.RequestIdMiddleware)
+# Outermost, so no layer (or the access log) sees a query-string token
+app.add_middleware(auth_utils.QueryTokenMiddleware)
+
+# Optional shared secret for the scraper; unset means open (e.g. behind a private network)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
 
-def calculate_rsi(series, period=14):
-    delta = series.diff()
-    gain = (delta.where(delta > 0, 0)).fillna(0)
-    loss = (-delta.where(delta < 0, 0)).fillna(0)
-    
-    avg_gain = gain.rolling(window=period, min_periods=1).mean()
-    avg_loss = loss.rolling(window=period, min_periods=1).mean()
-    
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+@app.get("/metrics", include_in_schema=False)
+def get_metrics(request: Request):
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 def read_root():
@@ -130,7 +150,7 @@ def predict_stock(symbol: str):
         }
 
     except Exception as e:
-        print(f"Error analyzing {symbol}: {e}")
+        logger.warning("prediction failed, returning neutral", exc_info=True, extra={"symbol": symbol})
         # Fallback to a neutral response instead of crashing
         return {
              "symbol": symbol.upper(),
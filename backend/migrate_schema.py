@@ -0,0 +1,189 @@
+"""
+Migration script: bring an existing app.db up to the current models.
+New tables are created by create_all on startup; this adds the columns and
+indexes that create_all cannot add to tables that already exist.
+Safe to run multiple times — skips anything that already exists.
+"""
+import sqlite3
+import os
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "db", "app.db")
+
+COLUMNS_TO_ADD = {
+    "notifications": [
+        ("startup_id", "VARCHAR"),
+        ("request_id", "VARCHAR"),
+    ],
+    "notifications_archive": [
+        ("startup_id", "VARCHAR"),
+        ("request_id", "VARCHAR"),
+    ],
+    "startups": [
+        ("fundability_score", "REAL"),
+        ("updated_at", "DATETIME"),
+        ("search_key", "INTEGER"),
+    ],
+    "user_data": [
+        ("updated_at", "DATETIME"),
+        ("version", "INTEGER NOT NULL DEFAULT 1"),
+        ("job_plan_json", "VARCHAR"),
+        ("job_plan_hash", "VARCHAR"),
+        ("job_plan_format", "INTEGER"),
+    ],
+    "user_portfolio": [
+        ("updated_at", "DATETIME"),
+        ("template_version", "INTEGER"),
+    ],
+}
+
+INDEXES_TO_ADD = [
+    ("ix_notifications_receiver_created", "notifications", "receiver_email, created_at"),
+    ("ix_notifications_startup_id", "notifications", "startup_id"),
+    ("ix_notifications_request_id", "notifications", "request_id"),
+    ("ix_notifications_archive_startup_id", "notifications_archive", "startup_id"),
+    ("ix_investment_requests_v2_startup_id", "investment_requests_v2", "startup_id"),
+    ("ix_startups_creator_email", "startups", "creator_email"),
+    ("ix_startups_industry", "startups", "industry"),
+    ("ix_startups_survival_score_id", "startups", "survival_score, id"),
+    ("ix_startups_growth_id", "startups", "growth, id"),
+    ("ix_startups_created_at_id", "startups", "created_at, id"),
+    ("ix_startups_fundability_score_id", "startups", "fundability_score, id"),
+    ("ix_startups_search_key", "startups", "search_key"),
+]
+
+# A portfolio some other row of the same user supersedes (later updated_at, then larger id)
+SUPERSEDED_PORTFOLIO = """
+    EXISTS (
+        SELECT 1 FROM user_portfolio newer
+        WHERE newer.user_id = user_portfolio.user_id
+          AND (COALESCE(newer.updated_at, '') > COALESCE(user_portfolio.updated_at, '')
+               OR (COALESCE(newer.updated_at, '') = COALESCE(user_portfolio.updated_at, '')
+                   AND newer.id > user_portfolio.id))
+    )
+"""
+
+# One-off data fixes, each a no-op once applied
+BACKFILLS = [
+    (
+        "Link legacy acceptance notifications to their request",
+        """
+        UPDATE notifications SET request_id = (
+            SELECT r.id FROM investment_requests_v2 r
+            JOIN users u ON u.id = r.investor_user_id
+            WHERE u.email = notifications.receiver_email
+              AND r.status = 'accepted'
+              AND r.startup_name IS NOT NULL
+              AND notifications.message LIKE '%' || r.startup_name || '%'
+            ORDER BY r.created_at DESC LIMIT 1
+        )
+        WHERE request_id IS NULL AND type = 'investor_request_accepted'
+        """,
+    ),
+    (
+        "Copy startup_id from the linked request",
+        """
+        UPDATE notifications SET startup_id = (
+            SELECT r.startup_id FROM investment_requests_v2 r WHERE r.id = notifications.request_id
+        )
+        WHERE startup_id IS NULL AND request_id IS NOT NULL
+        """,
+    ),
+    (
+        "Stamp updated_at on rows that predate it",
+        """
+        UPDATE user_data SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL
+        """,
+    ),
+    (
+        "Stamp updated_at on portfolios that predate it",
+        """
+        UPDATE user_portfolio SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL
+        """,
+    ),
+    (
+        "Stamp updated_at on startups that predate it",
+        """
+        UPDATE startups SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL
+        """,
+    ),
+    (
+        "Delete allocation rows of duplicate portfolios",
+        f"""
+        DELETE FROM portfolio_allocations WHERE portfolio_id IN (
+            SELECT id FROM user_portfolio WHERE {SUPERSEDED_PORTFOLIO}
+        )
+        """,
+    ),
+    (
+        "Delete duplicate portfolios, keeping each user's latest",
+        f"""
+        DELETE FROM user_portfolio WHERE {SUPERSEDED_PORTFOLIO}
+        """,
+    ),
+    (
+        "Compute runway_months for rows saved before it was materialized",
+        """
+        UPDATE user_data SET runway_months = CASE
+            WHEN COALESCE(expenses, 0) - COALESCE(revenue, 0) / 12.0 > 0
+            THEN MAX(COALESCE(cash_balance, 0), 0) / (COALESCE(expenses, 0) - COALESCE(revenue, 0) / 12.0)
+        END
+        WHERE runway_months = 0
+        """,
+    ),
+]
+
+# Created after BACKFILLS, which remove the duplicates; replaces a non-unique index of the same name
+UNIQUE_INDEXES_TO_ADD = [
+    ("ix_user_portfolio_user_id", "user_portfolio", "user_id"),
+]
+
+def table_exists(cursor, table):
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,))
+    return cursor.fetchone() is not None
+
+def migrate(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    for table, columns in COLUMNS_TO_ADD.items():
+        if not table_exists(cursor, table):
+            print(f"  - Table '{table}' not created yet — skipping (create_all will build it)")
+            continue
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing_cols = {row[1] for row in cursor.fetchall()}
+        for col_name, col_def in columns:
+            if col_name in existing_cols:
+                print(f"  ✓ Column '{table}.{col_name}' already exists — skipping")
+            else:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_def}")
+                print(f"  ✚ Added column '{table}.{col_name}'")
+
+    for index_name, table, columns in INDEXES_TO_ADD:
+        if not table_exists(cursor, table):
+            continue
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})")
+        print(f"  ✓ Index '{index_name}' ready")
+
+    for description, sql in BACKFILLS:
+        try:
+            cursor.execute(sql)
+            print(f"  ✓ {description} ({cursor.rowcount} rows)")
+        except sqlite3.OperationalError as e:
+            # Source table not created yet on a fresh database
+            print(f"  - {description} — skipped ({e})")
+
+    for index_name, table, columns in UNIQUE_INDEXES_TO_ADD:
+        if not table_exists(cursor, table):
+            continue
+        cursor.execute(f"PRAGMA index_list({table})")
+        if any(row[1] == index_name and not row[2] for row in cursor.fetchall()):
+            cursor.execute(f"DROP INDEX {index_name}")
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})")
+        print(f"  ✓ Unique index '{index_name}' ready")
+
+    conn.commit()
+    conn.close()
+    print("\nMigration complete.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from ..db import models
+from ..auth import utils
+from ..utils import profiling
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"]
+)
+
+class ProfilingStart(BaseModel):
+    route: str  # Path template as declared, e.g. "/auth/profile" or "/api/predict/{symbol}"
+    method: str = "GET"
+    sample_rate: float = Field(1.0, gt=0, le=1)
+    interval_ms: float = Field(profiling.DEFAULT_INTERVAL * 1000, ge=1, le=1000)
+    max_requests: int = Field(profiling.DEFAULT_MAX_REQUESTS, ge=1, le=10000)
+
+@router.post("/profiling")
+def start_profiling(
+    data: ProfilingStart,
+    request: Request,
+    admin: models.User = Depends(utils.get_current_admin)
+):
+    """Start sampling requests to one route, replacing any running session."""
+    try:
+        session = profiling.start_session(
+            request.app, data.route, data.method.upper(),
+            sample_rate=data.sample_rate, interval=data.interval_ms / 1000, max_requests=data.max_requests
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return session.status()
+
+@router.get("/profiling")
+def profiling_status(admin: models.User = Depends(utils.get_current_admin)):
+    session = profiling.get_session()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session running")
+    return session.status()
+
+@router.get("/profiling/folded", response_class=PlainTextResponse)
+def profiling_folded(admin: models.User = Depends(utils.get_current_admin)):
+    """Folded stacks collected so far, for flamegraph.pl or speedscope."""
+    session = profiling.get_session()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session running")
+    return session.folded()
+
+@router.delete("/profiling", response_class=PlainTextResponse)
+def stop_profiling(admin: models.User = Depends(utils.get_current_admin)):
+    """Stop the session and return its folded stacks."""
+    session = profiling.stop_session()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session running")
+    return session.folded()
@@ -1,11 +1,15 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 import re
-from ..db import database, models
+from ..db import database, models, versioning
 from ..auth import schemas, utils
-from ..services import portfolio_engine, recommendation_engine
+from ..services import job_plans, portfolio_engine, portfolio_store, recommendation_engine, treasury_engine
+from ..services.profile_input import ProfileInput
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/auth",
@@ -35,7 +39,8 @@ def signup(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
         
         return new_user
     except Exception as e:
-        print(f"SIGNUP ERROR: {e}")
+        if not isinstance(e, HTTPException):  # The duplicate-email 400 lands here too; not an error
+            logger.exception("signup failed")
         raise HTTPException(status_code=500, detail=f"Signup Failed: {str(e)}")
 
 @router.post("/login", response_model=schemas.Token)
@@ -78,11 +83,11 @@ def update_profile(
 
     # Update fields
     user_data = current_user.data
-    print(f"DEBUG: Input profile_data: {profile_data.dict(exclude_unset=True)}")
-    print(f"DEBUG: Before update - Budget: {user_data.budget}, Revenue: {user_data.revenue}")
-
     # Validate GST and Aadhaar before updating
     update_dict = profile_data.dict(exclude_unset=True)
+    # Field names only: the payload carries GST/Aadhaar numbers
+    logger.debug("profile update", extra={"user_id": current_user.id, "fields": sorted(update_dict)})
+    versioning.check_version(user_data, update_dict.pop('version', None))
     if 'gst_number' in update_dict and update_dict['gst_number']:
         if not re.match(r'^[0-9A-Z]{15}$', update_dict['gst_number']):
             raise HTTPException(status_code=400, detail="Invalid GST Number. Must be exactly 15 alphanumeric characters (uppercase).")
@@ -113,11 +118,12 @@ def update_profile(
              user_data.monthly_investment = value
         else:
              setattr(user_data, key, value)
+    job_plans.refresh_plan(user_data)
+    treasury_engine.apply_runway(user_data)
     
-    print(f"DEBUG: After update - Budget: {user_data.budget}, Revenue: {user_data.revenue}, Monthly Inv: {user_data.monthly_investment}")
-    
-    db.commit()
+    versioning.commit_or_conflict(db)
     db.refresh(user_data)
+    profile = ProfileInput.from_user_data(user_data)
     
     # --- AUTO-GENERATE PORTFOLIO ---
     if user_data.user_type == 'job':
@@ -125,74 +131,52 @@ def update_profile(
         # 1. User Override (monthly_investment)
         # 2. AI Calculation (passed from frontend OR stored previously)
         
-        final_investment = 0.0
-        
-        if user_data.monthly_investment is not None and user_data.monthly_investment > 0:
-            final_investment = user_data.monthly_investment
-            print(f"DEBUG: Using USER SET monthly_investment: {final_investment}")
-        elif user_data.ai_investment_amount is not None:
-             final_investment = user_data.ai_investment_amount
-             print(f"DEBUG: Using AI GENERATED investment amount: {final_investment}")
+        final_investment = portfolio_engine.resolve_investment_amount(profile)
         
         # Fallback if both are missing (e.g. legacy data)
         if final_investment <= 0 and user_data.income > 0:
              try:
-                recs = recommendation_engine.generate_recommendations(user_data)
+                recs = recommendation_engine.generate_recommendations(profile)
                 final_investment = recs.get("recommended_investment", 0)
                 # Save this as AI amount for consistency?
                 user_data.ai_investment_amount = final_investment
                 db.commit() 
-                print(f"DEBUG: Calculated Fallback AI investment: {final_investment}")
-             except:
-                pass
+             except Exception:
+                # e.g. lost the version check to a concurrent write; keep the session usable
+                db.rollback()
+                logger.warning("fallback AI investment not saved", exc_info=True, extra={"user_id": current_user.id})
 
         if final_investment > 0:
             try:
                 # 2. Generate allocation
-                allocation_json = portfolio_engine.generate_portfolio(final_investment, user_data.risk_tolerance)
+                allocations = portfolio_engine.allocations_for_profile(profile, final_investment)
                 
                 # 3. Save/Update Portfolio
-                existing_portfolio = db.query(models.UserPortfolio).filter(models.UserPortfolio.user_id == current_user.id).first()
-                if existing_portfolio:
-                    existing_portfolio.monthly_investment = final_investment
-                    existing_portfolio.allocation_json = allocation_json
-                else:
-                    new_portfolio = models.UserPortfolio(
-                        user_id=current_user.id,
-                        monthly_investment=final_investment,
-                        allocation_json=allocation_json
-                    )
-                    db.add(new_portfolio)
+                portfolio_store.save_portfolio(
+                    db, current_user.id, final_investment, allocations, portfolio_engine.template_version()
+                )
                 db.commit()
-                print(f"DEBUG: Auto-generated portfolio for {current_user.email} with amount ${final_investment}")
-            except Exception as e:
-                print(f"ERROR generating portfolio: {e}")
+                logger.debug("portfolio generated", extra={"user_id": current_user.id, "amount": final_investment})
+            except Exception:
+                logger.exception("portfolio generation failed", extra={"user_id": current_user.id})
 
     # --- AUTO-GENERATE STARTUP PORTFOLIO ---
     elif user_data.user_type == 'startup' and user_data.budget > 0:
         try:
             # Investment Capital = 30% of Annual Budget (as per requirement)
-            invest_amount = user_data.budget * 0.3
+            invest_amount = portfolio_engine.resolve_investment_amount(profile)
             
             # Generate Startup Allocation
-            allocation_json = portfolio_engine.generate_portfolio(invest_amount, "high", user_type='startup')
+            allocations = portfolio_engine.allocations_for_profile(profile, invest_amount)
             
             # Save/Update
-            existing_portfolio = db.query(models.UserPortfolio).filter(models.UserPortfolio.user_id == current_user.id).first()
-            if existing_portfolio:
-                existing_portfolio.monthly_investment = invest_amount
-                existing_portfolio.allocation_json = allocation_json
-            else:
-                new_portfolio = models.UserPortfolio(
-                    user_id=current_user.id,
-                    monthly_investment=invest_amount,
-                    allocation_json=allocation_json
-                )
-                db.add(new_portfolio)
+            portfolio_store.save_portfolio(
+                db, current_user.id, invest_amount, allocations, portfolio_engine.template_version()
+            )
             db.commit()
-            print(f"DEBUG: Auto-generated STARTUP portfolio for {current_user.email}")
-        except Exception as e:
-            print(f"ERROR generating startup portfolio: {e}")
+            logger.debug("startup portfolio generated", extra={"user_id": current_user.id, "amount": invest_amount})
+        except Exception:
+            logger.exception("startup portfolio generation failed", extra={"user_id": current_user.id})
 
     return current_user
 
@@ -205,14 +189,15 @@ def update_investment(data: dict, current_user: models.User = Depends(utils.get_
     if not user_data:
         raise HTTPException(status_code=404, detail="Profile not found")
 
+    versioning.check_version(user_data, data.get("version"))
     user_data.monthly_investment = amount
-    db.commit()
+    versioning.commit_or_conflict(db)
     db.refresh(user_data)
     
     # Also update the portfolio if it exists so they match
     existing_portfolio = db.query(models.UserPortfolio).filter(models.UserPortfolio.user_id == current_user.id).first()
     if existing_portfolio:
-         existing_portfolio.monthly_investment = amount
+         portfolio_store.rescale_portfolio(db, existing_portfolio, amount)
          db.commit()
 
-    return {"success": True, "monthly_investment": user_data.monthly_investment}
+    return {"success": True, "monthly_investment": user_data.monthly_investment, "version": user_data.version}
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from ..db import database, models
+from ..db import database, models, versioning
 from ..auth import utils
-from ..services import finance_engine
-from pydantic import BaseModel
+from ..services import finance_engine, job_plans, treasury_engine
+from ..services.profile_input import ProfileInput
+from ..utils import conditional
+from datetime import date
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 router = APIRouter(
     prefix="/finance",
@@ -12,6 +16,7 @@ router = APIRouter(
 
 @router.get("/job-plan")
 def get_job_plan(
+    request: Request,
     current_user: models.User = Depends(utils.get_current_user),
     db: Session = Depends(database.get_db)
 ):
@@ -24,18 +29,24 @@ def get_job_plan(
     # Check if user is 'job' type
     if user_data.user_type != "job":
         raise HTTPException(status_code=400, detail="Financial plan is only available for Job users.")
-    
-    plan = finance_engine.generate_job_plan(
-        income=user_data.income,
-        expenses=user_data.expenses,
-        risk_tolerance=user_data.risk_tolerance or "moderate"
-    )
-    
-    return plan
+
+    # The plan is a function of its inputs and format, so they identify it (updated_at moves on unrelated edits)
+    profile = ProfileInput.from_user_data(user_data)
+    digest = job_plans.input_hash(profile)
+    etag = conditional.make_etag("job-plan", user_data.id, finance_engine.PLAN_FORMAT_VERSION, digest)
+    cached = conditional.not_modified(request, etag)
+    if cached:
+        return cached
+
+    # Stored as JSON on profile writes; send it as is
+    response = Response(content=job_plans.plan_json(user_data, profile, digest), media_type="application/json")
+    conditional.set_etag(response, etag)
+    return response
 
 
 class InvestmentUpdate(BaseModel):
     amount: float
+    version: Optional[int] = None  # Version the client last read
 
 @router.put("/investment")
 def update_investment(
@@ -46,16 +57,20 @@ def update_investment(
     if not current_user.data:
         raise HTTPException(status_code=400, detail="User data not found")
     
+    versioning.check_version(current_user.data, data.version)
+
     # Update logic
     current_user.data.investment_amount = data.amount
     # Ensure AI amount doesn't override this in future logic, 
     # but we keep it for reference or fallback if user clears it (set to 0)
     
-    db.commit()
-    return {"monthly_investment": current_user.data.investment_amount}
+    versioning.commit_or_conflict(db)
+    return {"monthly_investment": current_user.data.investment_amount, "version": current_user.data.version}
 
 @router.get("/me")
 def get_my_finance(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(utils.get_current_user),
     db: Session = Depends(database.get_db)
 ):
@@ -65,6 +80,16 @@ def get_my_finance(
         
     # Fetch Portfolio Value
     portfolio = db.query(models.UserPortfolio).filter(models.UserPortfolio.user_id == current_user.id).first()
+
+    etag = conditional.make_etag(
+        "finance", user_data.id, user_data.updated_at,
+        portfolio.id if portfolio else None, portfolio.updated_at if portfolio else None
+    )
+    cached = conditional.not_modified(request, etag)
+    if cached:
+        return cached
+    conditional.set_etag(response, etag)
+
     portfolio_value = portfolio.monthly_investment if portfolio else 0.0
     
     # Calculate Net Worth
@@ -84,7 +109,8 @@ def get_my_finance(
         "current_savings": user_data.current_savings or 0.0,
         "portfolio_value": portfolio_value, # This might be total accumulated, distinct from monthly input
         "net_worth": net_worth,
-        "monthly_investment": monthly_investment 
+        "monthly_investment": monthly_investment,
+        "version": user_data.version
     }
 
 
@@ -95,6 +121,7 @@ class PersonalFinanceUpdate(BaseModel):
     monthly_expenses: float
     current_savings: float
     monthly_investment: float
+    version: Optional[int] = None  # Version the client last read
 
 
 @router.put("/personal")
@@ -103,7 +130,7 @@ def update_personal_finance(
     current_user: models.User = Depends(utils.get_current_user),
     db: Session = Depends(database.get_db)
 ):
-    fields = payload.dict()
+    fields = payload.dict(exclude={"version"})
     for key, value in fields.items():
         if value is None or value != value:
             raise HTTPException(status_code=400, detail=f"Invalid value for {key}")
@@ -118,12 +145,15 @@ def update_personal_finance(
         db.refresh(current_user)
         user_data = current_user.data
 
+    versioning.check_version(user_data, payload.version)
     user_data.income = payload.monthly_income
     user_data.expenses = payload.monthly_expenses
     user_data.current_savings = payload.current_savings
     user_data.monthly_investment = payload.monthly_investment
+    job_plans.refresh_plan(user_data)
+    treasury_engine.apply_runway(user_data)
 
-    db.commit()
+    versioning.commit_or_conflict(db)
     db.refresh(user_data)
 
     portfolio = db.query(models.UserPortfolio).filter(models.UserPortfolio.user_id == current_user.id).first()
@@ -139,6 +169,7 @@ def update_personal_finance(
             "monthly_investment": user_data.monthly_investment,
             "portfolio_value": portfolio_value,
             "net_worth": net_worth,
+            "version": user_data.version,
         }
     }
 
@@ -151,10 +182,22 @@ class TreasuryUpdate(BaseModel):
     monthly_expenses: float
     debt: float
     other_assets: float
+    version: Optional[int] = None  # Version the client last read
+
+
+class TreasuryForecastRequest(BaseModel):
+    # Monthly rates as fractions: 0.05 = +5% a month
+    months: int = Field(treasury_engine.DEFAULT_MONTHS, ge=1, le=treasury_engine.MAX_MONTHS)
+    revenue_growth: float = Field(0.0, gt=-1)
+    burn_change: float = Field(0.0, gt=-1)
+    growth_grid: List[float] = Field(default_factory=list, max_length=50)
+    burn_grid: List[float] = Field(default_factory=list, max_length=50)
 
 
 @router.get("/treasury")
 def get_treasury(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(utils.get_current_user),
     db: Session = Depends(database.get_db)
 ):
@@ -162,15 +205,50 @@ def get_treasury(
     if not user_data:
         raise HTTPException(status_code=400, detail="User data not found")
 
+    # cash_zero_date is relative to today, so the day is part of the version
+    today = date.today()
+    etag = conditional.make_etag("treasury", user_data.id, user_data.updated_at, today)
+    cached = conditional.not_modified(request, etag)
+    if cached:
+        return cached
+    conditional.set_etag(response, etag)
+
+    cash_balance, revenue, expenses = user_data.cash_balance or 0.0, user_data.revenue or 0.0, user_data.expenses or 0.0
+    runway = treasury_engine.static_runway(cash_balance, revenue, expenses)
+    zero_date = treasury_engine.cash_zero_date(runway, today)
     return {
-        "cash_balance": user_data.cash_balance or 0.0,
-        "annual_revenue": user_data.revenue or 0.0,
-        "monthly_expenses": user_data.expenses or 0.0,
+        "cash_balance": cash_balance,
+        "annual_revenue": revenue,
+        "monthly_expenses": expenses,
         "debt": user_data.debt or 0.0,
         "other_assets": user_data.other_assets or 0.0,
+        "monthly_net_burn": treasury_engine.monthly_net_burn(revenue, expenses),
+        "runway_months": runway,
+        "cash_zero_date": zero_date.isoformat() if zero_date else None,
+        "version": user_data.version,
     }
 
 
+@router.post("/treasury/forecast")
+def forecast_treasury(
+    data: TreasuryForecastRequest,
+    current_user: models.User = Depends(utils.get_current_user)
+):
+    """Runway, burn multiple and cash projection from the stored treasury, with an optional growth x burn sweep."""
+    user_data = current_user.data
+    if not user_data:
+        raise HTTPException(status_code=400, detail="User data not found")
+
+    try:
+        return treasury_engine.forecast(
+            user_data.cash_balance or 0.0, user_data.revenue or 0.0, user_data.expenses or 0.0,
+            revenue_growth=data.revenue_growth, burn_change=data.burn_change, months=data.months,
+            growth_grid=data.growth_grid, burn_grid=data.burn_grid
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.put("/treasury")
 def update_treasury(
     payload: TreasuryUpdate,
@@ -178,7 +256,7 @@ def update_treasury(
     db: Session = Depends(database.get_db)
 ):
     # Validation: all values must be >= 0
-    fields = payload.dict()
+    fields = payload.dict(exclude={"version"})
     for key, value in fields.items():
         if value is None or value != value:  # NaN check: NaN != NaN
             raise HTTPException(status_code=400, detail=f"Invalid value for {key}")
@@ -194,13 +272,15 @@ def update_treasury(
         db.refresh(current_user)
         user_data = current_user.data
 
+    versioning.check_version(user_data, payload.version)
     user_data.cash_balance = payload.cash_balance
     user_data.revenue = payload.annual_revenue
     user_data.expenses = payload.monthly_expenses
     user_data.debt = payload.debt
     user_data.other_assets = payload.other_assets
+    treasury_engine.apply_runway(user_data)
 
-    db.commit()
+    versioning.commit_or_conflict(db)
     db.refresh(user_data)
 
     return {
@@ -211,6 +291,8 @@ def update_treasury(
             "monthly_expenses": user_data.expenses,
             "debt": user_data.debt,
             "other_assets": user_data.other_assets,
+            "runway_months": user_data.runway_months,
+            "version": user_data.version,
         }
     }
 
@@ -1,3 +1,4 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
@@ -6,6 +7,10 @@ from datetime import datetime
 
 from ..db import database, models
 from ..auth import utils as services
+from ..services import unread_counters, notification_bus
+from .notifications import serialize_notification
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/invest",
@@ -27,9 +32,7 @@ def connect_startup(
     current_user: models.User = Depends(services.get_current_user)
 ):
     try:
-        print(f"--- CONNECT START ---")
-        print(f"User: {current_user.email} (ID: {current_user.id})")
-        print(f"Target Startup ID: {req.startupId}")
+        logger.debug("connect start", extra={"user_id": current_user.id, "startup_id": req.startupId})
         
         # 1. Check duplicate
         existing = db.query(models.InvestmentRequest).filter(
@@ -39,12 +42,8 @@ def connect_startup(
         ).first()
         
         if existing:
-            print(f"DUPLICATE FOUND! Existing Request ID: {existing.id}")
-            print(f"  - Startup ID: {existing.startup_id}")
-            print(f"  - Investor ID: {existing.investor_user_id}")
+            logger.info("duplicate connect request", extra={"existing_request_id": existing.id, "startup_id": existing.startup_id})
             return {"success": False, "message": "Request already sent"}
-        else:
-            print("No duplicate found. Proceeding...")
 
         # 2. Identify Target Startup and Owner
         # Check against Startup Table first (Project)
@@ -72,7 +71,7 @@ def connect_startup(
                  target_owner_email = target_user.email
                  target_name = "Startup Profile"
 
-        print(f"TARGET IDENTIFIED: Name={target_name}, OwnerEmail={target_owner_email}, UserID={target_user_id}")
+        logger.debug("connect target", extra={"startup_name": target_name, "owner_user_id": target_user_id})
 
         # 3. Create Record
         new_request = models.InvestmentRequest(
@@ -87,19 +86,18 @@ def connect_startup(
         )
         
         db.add(new_request)
+        unread_counters.increment(db, target_user_id, unread_counters.INVESTMENT_REQUESTS)
         db.commit()
         db.refresh(new_request)
         
-        print("DB INSERT RESULT:", new_request.id, new_request.status)
+        logger.info("investment request created", extra={"investment_request_id": new_request.id, "startup_id": req.startupId})
         
         # 4. NO EMAIL - Internal Messaging Only
         
         return {"success": True, "message": "Request sent to startup dashboard"}
 
     except Exception as e:
-        print(f"CONNECT ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("connect failed")
         return {"success": False, "message": f"Server error: {str(e)}"}
 
 @router.get("/requests")
@@ -137,39 +135,61 @@ def mark_as_read(
 ):
     req = db.query(models.InvestmentRequest).filter(
         models.InvestmentRequest.id == request_id,
-        models.InvestmentRequest.startup_user_id == current_user.id
+        unread_counters.inbox_filter(current_user.id, current_user.email)
     ).first()
     
-    if req:
+    if req and not req.is_read:
         req.is_read = True
+        unread_counters.decrement(db, current_user.id, unread_counters.INVESTMENT_REQUESTS)
         db.commit()
     
     return {"success": True}
 
+class BulkReadRequest(BaseModel):
+    ids: Optional[List[str]] = None
+    before: Optional[datetime] = None # Mark everything created at or before this cursor
+
+@router.post("/read-bulk")
+def mark_many_as_read(
+    payload: BulkReadRequest,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(services.get_current_user)
+):
+    """Mark a set of requests as read in a single UPDATE.
+
+    With no ids and no cursor every unread request for this startup is marked.
+    """
+    query = db.query(models.InvestmentRequest).filter(
+        unread_counters.inbox_filter(current_user.id, current_user.email),
+        models.InvestmentRequest.is_read == False
+    )
+    if payload.ids is not None:
+        if not payload.ids:
+            return {"success": True, "updated": 0}
+        query = query.filter(models.InvestmentRequest.id.in_(payload.ids))
+    if payload.before is not None:
+        query = query.filter(models.InvestmentRequest.created_at <= payload.before)
+
+    updated = query.update({models.InvestmentRequest.is_read: True}, synchronize_session=False)
+    unread_counters.decrement(db, current_user.id, unread_counters.INVESTMENT_REQUESTS, updated)
+    db.commit()
+
+    return {"success": True, "updated": updated}
+
 @router.get("/startup/requests")
 def get_startup_requests(
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(services.get_current_user)
 ):
-    # Ensure user is a startup (optional strict check, or just filter by ID)
-    # We filter by startup_user_id == current_user.id
-    
-    print(f"DEBUG STARTUP FETCH: User {current_user.email} requesting dashboard.")
-
     # Filter by startup_owner matching current_user.email OR startup_user_id matching current_user.id
-    # This covers both email-based and ID-based linking
-    from sqlalchemy import or_
-    
+    # This covers both email-based and ID-based linking (the unread badge counts the same rows)
     requests = db.query(models.InvestmentRequest).options(
         joinedload(models.InvestmentRequest.investor)
     ).filter(
-        or_(
-            models.InvestmentRequest.startup_owner == current_user.email,
-            models.InvestmentRequest.startup_user_id == current_user.id
-        )
+        unread_counters.inbox_filter(current_user.id, current_user.email)
     ).order_by(models.InvestmentRequest.created_at.desc()).all()
     
-    print(f"DEBUG STARTUP FETCH: Found {len(requests)} requests for {current_user.email} (ID: {current_user.id})")
+    logger.debug("startup requests fetched", extra={"user_id": current_user.id, "count": len(requests)})
     
     return [
         {
@@ -183,6 +203,14 @@ def get_startup_requests(
         for r in requests
     ]
 
+@router.get("/startup/requests/unread-count")
+def get_startup_requests_unread_count(
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(services.get_current_user)
+):
+    """Badge count for the startup inbox, served from the per-user counter row."""
+    return {"unread": unread_counters.get_count(db, current_user, unread_counters.INVESTMENT_REQUESTS)}
+
 class UpdateRequestStatus(BaseModel):
     id: str
     action: str # "accept" | "reject"
@@ -217,9 +245,16 @@ def update_request_status(
         notif = models.Notification(
             receiver_email=request_record.investor.email,
             type="investor_request_accepted",
-            message=f"Your investment request for {request_record.startup_name or 'a startup'} was accepted."
+            message=f"Your investment request for {request_record.startup_name or 'a startup'} was accepted.",
+            startup_id=request_record.startup_id,
+            request_id=request_record.id
         )
         db.add(notif)
+        unread_counters.increment(db, request_record.investor.id, unread_counters.NOTIFICATIONS)
         db.commit()
+        db.refresh(notif)
+
+        # Push to any live sessions of the investor
+        notification_bus.publish(notif.receiver_email, serialize_notification(notif))
     
     return {"success": True, "message": f"Request {request_record.status}"}
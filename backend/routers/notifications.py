@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+import json
 
 from ..db import database, models
 from ..auth import utils
+from ..services import unread_counters, notification_bus
 
 router = APIRouter(
     prefix="/notifications",
@@ -11,26 +17,117 @@ router = APIRouter(
 )
 
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(n):
+    return f"{n.created_at.isoformat()}|{n.id}"
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, notif_id = cursor.split("|", 1)
+        return datetime.fromisoformat(created_at), notif_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/")
 def get_notifications(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
     current_user: models.User = Depends(utils.get_current_user),
     db: Session = Depends(database.get_db)
 ):
-    """Return all notifications for the logged-in user, newest first."""
-    rows = db.query(models.Notification).filter(
+    """
+    Return one page of notifications for the logged-in user, newest first.
+    Pass the X-Next-Cursor header back as `cursor` for the next page, or
+    `since` to fetch only what arrived after a timestamp.
+    """
+    query = db.query(models.Notification).filter(
         models.Notification.receiver_email == current_user.email
-    ).order_by(models.Notification.created_at.desc()).all()
+    )
+    if since is not None:
+        query = query.filter(models.Notification.created_at > since)
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            models.Notification.created_at < cursor_created_at,
+            and_(
+                models.Notification.created_at == cursor_created_at,
+                models.Notification.id < cursor_id
+            )
+        ))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.order_by(
+        models.Notification.created_at.desc(),
+        models.Notification.id.desc()
+    ).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1])
+
+    return [serialize_notification(n) for n in rows]
+
+
+def serialize_notification(n):
+    return {
+        "id": n.id,
+        "type": n.type,
+        "message": n.message,
+        "read": n.read,
+        "created_at": n.created_at.isoformat() if n.created_at else None,
+    }
+
+
+HEARTBEAT_SECONDS = 15
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    current_user: models.User = Depends(utils.get_current_user),
+    db: Session = Depends(database.get_db)
+):
+    """Server-sent events: pushes each new notification for the logged-in user as it is created."""
+    receiver_email = current_user.email
+    # Nothing else needs the DB for the lifetime of the stream
+    db.close()
 
-    return [
-        {
-            "id": n.id,
-            "type": n.type,
-            "message": n.message,
-            "read": n.read,
-            "created_at": n.created_at.isoformat() if n.created_at else None,
-        }
-        for n in rows
-    ]
+    broker = notification_bus.get_broker()
+    subscription = broker.subscribe(receiver_email)
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: notification\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/unread-count")
+def get_unread_count(
+    current_user: models.User = Depends(utils.get_current_user),
+    db: Session = Depends(database.get_db)
+):
+    """Badge count served from the per-user counter row instead of the full feed."""
+    return {"unread": unread_counters.get_count(db, current_user, unread_counters.NOTIFICATIONS)}
 
 
 class MarkReadRequest(BaseModel):
@@ -52,7 +149,39 @@ def mark_notification_read(
     if not notif:
         raise HTTPException(status_code=404, detail="Notification not found")
 
-    notif.read = True
-    db.commit()
+    if not notif.read:
+        notif.read = True
+        unread_counters.decrement(db, current_user.id, unread_counters.NOTIFICATIONS)
+        db.commit()
 
     return {"success": True}
+
+
+class BulkMarkReadRequest(BaseModel):
+    ids: Optional[List[str]] = None
+    before: Optional[datetime] = None  # Mark everything created at or before this cursor
+
+
+@router.post("/read-bulk")
+def mark_notifications_read(
+    payload: BulkMarkReadRequest,
+    current_user: models.User = Depends(utils.get_current_user),
+    db: Session = Depends(database.get_db)
+):
+    """Mark many notifications as read with one UPDATE (all unread if no filter is given)."""
+    query = db.query(models.Notification).filter(
+        models.Notification.receiver_email == current_user.email,
+        models.Notification.read == False
+    )
+    if payload.ids is not None:
+        if not payload.ids:
+            return {"success": True, "updated": 0}
+        query = query.filter(models.Notification.id.in_(payload.ids))
+    if payload.before is not None:
+        query = query.filter(models.Notification.created_at <= payload.before)
+
+    updated = query.update({models.Notification.read: True}, synchronize_session=False)
+    unread_counters.decrement(db, current_user.id, unread_counters.NOTIFICATIONS, updated)
+    db.commit()
+
+    return {"success": True, "updated": updated}
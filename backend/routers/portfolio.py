@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from ..db import database, models
 from ..auth import utils, schemas
-import json
+from ..services import portfolio_engine, portfolio_store, stress_engine
+from ..services.profile_input import ProfileInput
+from ..utils import conditional
 
 router = APIRouter(
     prefix="/portfolio",
@@ -11,6 +15,8 @@ router = APIRouter(
 
 @router.get("/me")
 def get_my_portfolio(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(utils.get_current_user),
     db: Session = Depends(database.get_db)
 ):
@@ -18,10 +24,16 @@ def get_my_portfolio(
     
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
+
+    etag = conditional.make_etag("portfolio", portfolio.id, portfolio.updated_at)
+    cached = conditional.not_modified(request, etag)
+    if cached:
+        return cached
+    conditional.set_etag(response, etag)
         
     return {
         "monthly_investment": portfolio.monthly_investment,
-        "allocation": json.loads(portfolio.allocation_json)
+        "allocation": portfolio_store.allocation_list(portfolio)
     }
 
 class PortfolioGenerate(schemas.BaseModel):
@@ -33,33 +45,73 @@ def generate_portfolio_endpoint(
     current_user: models.User = Depends(utils.get_current_user),
     db: Session = Depends(database.get_db)
 ):
-    from services import portfolio_engine
-    
     # Fetch risk tolerance from DB
     if not current_user.data:
          raise HTTPException(status_code=400, detail="User profile not completed")
          
-    risk_tolerance = current_user.data.risk_tolerance or "moderate"
-    user_type = current_user.data.user_type or "job"
+    profile = ProfileInput.from_user_data(current_user.data)
     
     # Generate new allocation
-    allocation_json = portfolio_engine.generate_portfolio(data.amount, risk_tolerance, user_type)
-    
-    # Check if exists
-    portfolio = db.query(models.UserPortfolio).filter(models.UserPortfolio.user_id == current_user.id).first()
+    allocations = portfolio_engine.allocations_for_profile(profile, data.amount)
     
-    if portfolio:
-        portfolio.monthly_investment = data.amount
-        portfolio.allocation_json = allocation_json
-    else:
-        portfolio = models.UserPortfolio(
-            user_id=current_user.id,
-            monthly_investment=data.amount,
-            allocation_json=allocation_json
-        )
-        db.add(portfolio)
-        
+    portfolio_store.save_portfolio(
+        db, current_user.id, data.amount, allocations, portfolio_engine.template_version()
+    )
     db.commit()
-    db.refresh(portfolio)
     
-    return {"message": "Portfolio generated successfully", "allocation": json.loads(allocation_json)}
+    return {"message": "Portfolio generated successfully", "allocation": allocations}
+
+@router.get("/exposure")
+def get_book_exposure(
+    admin: models.User = Depends(utils.get_current_admin),
+    db: Session = Depends(database.get_db)
+):
+    """Aggregate exposure per asset class across every user's portfolio."""
+    return portfolio_store.exposure_by_asset_class(db)
+
+
+class StressScenario(BaseModel):
+    name: str
+    description: Optional[str] = None
+    shocks: Dict[str, float]  # asset_class -> fractional return, e.g. {"equity": -0.3}
+
+class StressRequest(BaseModel):
+    scenarios: List[StressScenario] = []
+    include_defaults: bool = True
+
+def _scenarios(data: Optional[StressRequest]):
+    if data is None:
+        return stress_engine.DEFAULT_SCENARIOS
+    custom = [s.model_dump() for s in data.scenarios]
+    scenarios = (stress_engine.DEFAULT_SCENARIOS if data.include_defaults else []) + custom
+    if not scenarios:
+        raise HTTPException(status_code=400, detail="No scenarios to run")
+    try:
+        stress_engine.shock_matrix(scenarios)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return scenarios
+
+@router.get("/stress")
+@router.post("/stress")
+def stress_my_portfolio(
+    data: Optional[StressRequest] = Body(None),
+    current_user: models.User = Depends(utils.get_current_user),
+    db: Session = Depends(database.get_db)
+):
+    """Run shock scenarios against the user's portfolio. POST a body to add custom scenarios."""
+    scenarios = _scenarios(data)
+    portfolio = db.query(models.UserPortfolio).filter(models.UserPortfolio.user_id == current_user.id).first()
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    return stress_engine.stress_portfolio(portfolio_store.allocation_list(portfolio), scenarios)
+
+@router.get("/stress/book")
+@router.post("/stress/book")
+def stress_book(
+    data: Optional[StressRequest] = Body(None),
+    admin: models.User = Depends(utils.get_current_admin),
+    db: Session = Depends(database.get_db)
+):
+    """Book-wide drawdown per scenario across every user's portfolio."""
+    return stress_engine.stress_book(db, _scenarios(data))
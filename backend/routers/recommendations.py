@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from ..db import database, models
 from ..auth import utils
-from ..services import recommendation_engine
+from ..services import recommendation_engine, id_validation
+from ..services.profile_input import ProfileInput
+from ..utils import conditional
 
 router = APIRouter(
     prefix="/recommendations",
@@ -11,6 +15,8 @@ router = APIRouter(
 
 @router.get("/job")
 def get_job_recommendations(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(utils.get_current_user),
     db: Session = Depends(database.get_db)
 ):
@@ -22,7 +28,62 @@ def get_job_recommendations(
     if current_user.data.user_type != 'job':
         raise HTTPException(status_code=400, detail="Recommendations available for job users only")
 
+    # Recommendations are deterministic, so the row version identifies them
+    etag = conditional.make_etag("recommendations", current_user.data.id, current_user.data.version)
+    cached = conditional.not_modified(request, etag)
+    if cached:
+        return cached
+    conditional.set_etag(response, etag)
+
     # Generate recommendations
-    recommendations = recommendation_engine.generate_recommendations(current_user.data)
+    recommendations = recommendation_engine.generate_recommendations(
+        ProfileInput.from_user_data(current_user.data)
+    )
     
     return recommendations
+
+
+MAX_BATCH = 100000
+
+class BatchRecommendationRequest(BaseModel):
+    # Either user_ids to score stored profiles, or the four input columns of equal length
+    user_ids: Optional[List[str]] = None
+    income: Optional[List[float]] = None
+    expenses: Optional[List[float]] = None
+    savings: Optional[List[float]] = None
+    risk_tolerance: Optional[List[Optional[str]]] = None
+
+@router.post("/batch")
+def batch_recommendations(
+    data: BatchRecommendationRequest,
+    admin: models.User = Depends(utils.get_current_admin),
+    db: Session = Depends(database.get_db)
+):
+    """Score many users in one vectorized pass. Returns one list per field, in input order."""
+    result = {}
+    if data.user_ids is not None:
+        user_ids = id_validation.dedupe(data.user_ids)
+        if len(user_ids) > MAX_BATCH:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH} users per batch")
+        profiles = {}
+        for start in range(0, len(user_ids), id_validation.IN_CHUNK_SIZE):
+            chunk = user_ids[start:start + id_validation.IN_CHUNK_SIZE]
+            rows = db.query(*ProfileInput.columns()).filter(models.UserData.user_id.in_(chunk))
+            for row in rows:
+                profiles.setdefault(row[0], ProfileInput.from_row(row))
+        found = [uid for uid in user_ids if uid in profiles]
+        columns = recommendation_engine.columns_from_profiles([profiles[uid] for uid in found])
+        result["user_ids"] = found
+    else:
+        columns = (data.income, data.expenses, data.savings, data.risk_tolerance)
+        if any(c is None for c in columns):
+            raise HTTPException(status_code=400, detail="Provide user_ids or income, expenses, savings and risk_tolerance")
+        if len({len(c) for c in columns}) != 1:
+            raise HTTPException(status_code=400, detail="Input columns must have the same length")
+        if len(data.income) > MAX_BATCH:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH} users per batch")
+
+    batch = recommendation_engine.recommend_batch(*columns)
+    for field in recommendation_engine.RECOMMENDATION_FIELDS:
+        result[field] = batch[field].tolist()
+    return result
@@ -0,0 +1,51 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field, model_validator
+from ..db import models
+from ..auth import utils
+from ..services import simulation_engine
+
+router = APIRouter(
+    prefix="/scenarios",
+    tags=["scenarios"]
+)
+
+class SimulationRequest(BaseModel):
+    type: Literal["startup", "invest", "hybrid"]
+    capital: float = Field(0.0, ge=0)
+    monthly_contribution: Optional[float] = Field(None, ge=0)  # Defaults to the profile's monthly_investment
+    risk_profile: Optional[str] = None  # Defaults to the profile's risk_tolerance
+    years: int = Field(5, ge=1, le=30)
+    paths: int = Field(simulation_engine.DEFAULT_PATHS, ge=100, le=50000)
+    goals: List[float] = Field(default_factory=list, max_length=10)
+    seed: int = simulation_engine.DEFAULT_SEED
+
+    @model_validator(mode="after")
+    def check_size(self):
+        # Bound memory per request: the engine holds several paths x months float matrices
+        if self.paths * self.years * 12 > simulation_engine.MAX_CELLS:
+            raise ValueError(
+                f"paths x months must be at most {simulation_engine.MAX_CELLS:,} "
+                f"(e.g. {simulation_engine.MAX_CELLS // (self.years * 12)} paths over {self.years} years)"
+            )
+        return self
+
+@router.post("/simulate")
+def simulate(
+    data: SimulationRequest,
+    current_user: models.User = Depends(utils.get_current_user)
+):
+    """Monte Carlo projection of a scenario: percentile bands, goal probabilities and drawdowns."""
+    profile = current_user.data
+    contribution = data.monthly_contribution
+    if contribution is None:
+        contribution = (profile.monthly_investment if profile else 0.0) or 0.0
+    risk_profile = data.risk_profile or (profile.risk_tolerance if profile else None)
+
+    try:
+        return simulation_engine.run_simulation(
+            data.type, data.capital, contribution, risk_profile,
+            months=data.years * 12, paths=data.paths, goals=data.goals, seed=data.seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
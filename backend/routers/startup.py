@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from ..db import database, models
 from ..auth import utils
+from ..utils import conditional
+from ..services import unread_counters, startup_search, ranking_engine, id_validation
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
@@ -14,6 +17,7 @@ router = APIRouter(
 class StartupCreate(BaseModel):
     name: str
     description: Optional[str] = None
+    industry: Optional[str] = None
     revenue: float
     burn: float
     cash: float
@@ -26,17 +30,27 @@ class StartupResponse(BaseModel):
     id: str
     name: str
     description: Optional[str]
+    industry: Optional[str] = None
     creator_email: str
     created_at: datetime
     # Metrics
     revenue: float
     burn: float
     cash: float
+    growth: Optional[float] = None
     team: int
     survival_score: int
+    fundability_score: Optional[float] = None
     
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+class RankedStartupResponse(StartupResponse):
+    match_score: float
+
+class StartupSearchResponse(BaseModel):
+    results: List[StartupResponse]
+    next_cursor: Optional[str] = None
 
 @router.post("/", response_model=StartupResponse)
 def create_startup(
@@ -52,6 +66,7 @@ def create_startup(
     new_startup = models.Startup(
         name=startup.name,
         description=startup.description,
+        industry=startup.industry,
         creator_email=creator_email,
         revenue=startup.revenue,
         burn=startup.burn,
@@ -61,6 +76,7 @@ def create_startup(
         runway=startup.runway,
         survival_score=startup.survival_score
     )
+    ranking_engine.apply_score(new_startup)
     
     db.add(new_startup)
     db.commit()
@@ -70,9 +86,21 @@ def create_startup(
 
 @router.get("/my", response_model=List[StartupResponse])
 def get_my_startups(
+    request: Request,
+    response: Response,
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(utils.get_current_user)
 ):
+    # Count + newest update changes on any create, edit or delete -> cheap version stamp
+    count, last_updated = db.query(
+        func.count(models.Startup.id), func.max(models.Startup.updated_at)
+    ).filter(models.Startup.creator_email == current_user.email).one()
+    etag = conditional.make_etag("startups", current_user.id, count, last_updated)
+    cached = conditional.not_modified(request, etag)
+    if cached:
+        return cached
+    conditional.set_etag(response, etag)
+
     # Fetch ONLY startups created by this user
     startups = db.query(models.Startup).filter(
         models.Startup.creator_email == current_user.email
@@ -80,18 +108,94 @@ def get_my_startups(
     
     return startups
 
+@router.get("/search", response_model=StartupSearchResponse)
+def search_startups(
+    q: Optional[str] = None,
+    industry: Optional[str] = None,
+    min_revenue: Optional[float] = None,
+    max_revenue: Optional[float] = None,
+    min_burn: Optional[float] = None,
+    max_burn: Optional[float] = None,
+    min_growth: Optional[float] = None,
+    max_growth: Optional[float] = None,
+    min_survival_score: Optional[int] = None,
+    max_survival_score: Optional[int] = None,
+    sort: str = "survival_score",
+    limit: int = Query(startup_search.DEFAULT_PAGE_SIZE, ge=1, le=startup_search.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(utils.get_current_user)
+):
+    """Investor discovery: full-text + metric filters, keyset-paginated by the chosen sort."""
+    if sort not in startup_search.SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {list(startup_search.SORT_COLUMNS)}")
+
+    try:
+        results, next_cursor = startup_search.search(
+            db,
+            q=q,
+            industry=industry,
+            ranges={
+                "revenue": (min_revenue, max_revenue),
+                "burn": (min_burn, max_burn),
+                "growth": (min_growth, max_growth),
+                "survival_score": (min_survival_score, max_survival_score),
+            },
+            sort=sort,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return {"results": results, "next_cursor": next_cursor}
+
+@router.get("/recommended", response_model=List[RankedStartupResponse])
+def get_recommended_startups(
+    k: int = Query(10, ge=1, le=100),
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(utils.get_current_user)
+):
+    """Top-k startups ranked for the investor's risk profile."""
+    risk_tolerance = (current_user.data.risk_tolerance if current_user.data else None) or "moderate"
+    ranked = ranking_engine.top_k(db, risk_tolerance, k)
+    if not ranked:
+        return []
+
+    by_id = {
+        s.id: s for s in db.query(models.Startup).filter(
+            models.Startup.id.in_([startup_id for _, startup_id in ranked])
+        ).all()
+    }
+    results = []
+    for score, startup_id in ranked:
+        startup = by_id.get(startup_id)
+        if startup:
+            results.append(RankedStartupResponse(
+                **StartupResponse.model_validate(startup).model_dump(),
+                match_score=round(score, 2)
+            ))
+    return results
+
 @router.post("/validate-ids")
 def validate_startup_ids(
     ids: List[str],
+    format: str = "ids",
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(utils.get_current_user)
 ):
-    """Return which startup IDs still exist in the database."""
-    existing = db.query(models.Startup.id).filter(
-        models.Startup.id.in_(ids)
-    ).all()
-    valid_ids = {row[0] for row in existing}
-    return {"valid_ids": list(valid_ids)}
+    """
+    Return which startup IDs still exist in the database.
+    format=ids (default): {"valid_ids": [...]} in request order, deduplicated.
+    format=bitmap: {"size": n, "bitmap": base64} with one bit per submitted id.
+    """
+    if format not in ("ids", "bitmap"):
+        raise HTTPException(status_code=400, detail="format must be 'ids' or 'bitmap'")
+
+    existing = id_validation.find_existing_ids(db, ids)
+    if format == "bitmap":
+        return {"size": len(ids), "bitmap": id_validation.encode_bitmap(ids, existing)}
+    return {"valid_ids": id_validation.ordered_valid_ids(ids, existing)}
 
 @router.delete("/{startup_id}")
 def delete_startup(
@@ -106,34 +210,28 @@ def delete_startup(
     if startup.creator_email != current_user.email:
         raise HTTPException(status_code=403, detail="Not authorized to delete this startup")
 
-    startup_name = startup.name  # capture before delete
-
     try:
         # Cascade: investment requests
         db.query(models.InvestmentRequest).filter(
             models.InvestmentRequest.startup_id == startup_id
         ).delete(synchronize_session=False)
 
-        # Cascade: notifications mentioning this startup
-        db.query(models.Notification).filter(
-            models.Notification.message.contains(startup_name)
+        # Cascade: notifications linked to this startup (indexed on startup_id)
+        notif_filter = models.Notification.startup_id == startup_id
+        affected_emails = [
+            row[0] for row in db.query(models.Notification.receiver_email).filter(notif_filter).distinct().all()
+        ]
+        db.query(models.Notification).filter(notif_filter).delete(synchronize_session=False)
+        db.query(models.NotificationArchive).filter(
+            models.NotificationArchive.startup_id == startup_id
         ).delete(synchronize_session=False)
 
-        # Delete the startup itself
-        db.delete(startup)
-        db.flush()
-
-        # Verification: ensure no orphan investment requests remain
-        orphans = db.query(models.InvestmentRequest).filter(
-            models.InvestmentRequest.startup_id == startup_id
-        ).count()
-        if orphans > 0:
-            db.rollback()
-            raise HTTPException(status_code=500, detail="Cascade delete verification failed")
+        # Unread counters of everyone touched by the cascade are recounted on next read
+        unread_counters.invalidate(db, user_ids=[current_user.id], emails=affected_emails)
 
+        # Delete the startup itself; everything above commits or rolls back together
+        db.delete(startup)
         db.commit()
-    except HTTPException:
-        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
@@ -1,3 +1,6 @@
+# Bump whenever generate_job_plan's output changes; stored plans built with an older format are rebuilt
+PLAN_FORMAT_VERSION = 1
+
 
 def generate_job_plan(income: float, expenses: float, risk_tolerance: str = "moderate") -> dict:
     """
@@ -44,3 +47,8 @@ def generate_job_plan(income: float, expenses: float, risk_tolerance: str = "mod
         "recommended_emergency_fund": emergency,
         "message": message
     }
+
+
+def generate_job_plan_for(profile) -> dict:
+    """generate_job_plan for a ProfileInput."""
+    return generate_job_plan(profile.income, profile.expenses, profile.risk_tolerance)
@@ -0,0 +1,72 @@
+import base64
+
+import numpy as np
+from sqlalchemy import select, text
+
+from ..db import models
+
+# Stay well under SQLite's bound-parameter limit (999 on older builds)
+IN_CHUNK_SIZE = 500
+# Above this many unique ids a temp-table join beats repeated IN statements
+TEMP_TABLE_THRESHOLD = 20000
+
+
+def dedupe(ids):
+    """Drop repeated ids, keeping first-seen order."""
+    return list(dict.fromkeys(ids))
+
+
+def _existing_via_in(db, ids):
+    existing = set()
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        chunk = ids[start:start + IN_CHUNK_SIZE]
+        existing.update(
+            row[0] for row in db.execute(select(models.Startup.id).where(models.Startup.id.in_(chunk)))
+        )
+    return existing
+
+
+def _existing_via_temp_table(db, ids):
+    # Inside a SAVEPOINT that is rolled back: the temp table and its rows go away without
+    # touching the caller's transaction or anything it has flushed but not committed
+    savepoint = db.begin_nested()
+    try:
+        conn = db.connection()
+        # No key on the temp table: the join probes the startups primary key per row
+        conn.execute(text("CREATE TEMP TABLE IF NOT EXISTS validate_ids_tmp (id VARCHAR)"))
+        placeholder = "?" if conn.dialect.paramstyle == "qmark" else "%s"
+        conn.exec_driver_sql(
+            f"INSERT INTO validate_ids_tmp (id) VALUES ({placeholder})", [(i,) for i in ids]
+        )
+        rows = conn.execute(text(
+            "SELECT s.id FROM validate_ids_tmp t JOIN startups s ON s.id = t.id"
+        )).all()
+        return {row[0] for row in rows}
+    finally:
+        savepoint.rollback()
+
+
+def find_existing_ids(db, ids, strategy=None):
+    """
+    Return the set of ids that exist in the startups table.
+    `strategy` forces "in" or "temp_table"; by default it is picked from the input size.
+    """
+    unique = dedupe(ids)
+    if not unique:
+        return set()
+    if strategy is None:
+        strategy = "temp_table" if len(unique) > TEMP_TABLE_THRESHOLD else "in"
+    if strategy == "temp_table":
+        return _existing_via_temp_table(db, unique)
+    return _existing_via_in(db, unique)
+
+
+def ordered_valid_ids(ids, existing):
+    """Valid ids in the client's order, without repeats."""
+    return [i for i in dedupe(ids) if i in existing]
+
+
+def encode_bitmap(ids, existing):
+    """Base64 bitmap where bit i (MSB first) is set if ids[i] exists."""
+    bits = np.fromiter((i in existing for i in ids), dtype=bool, count=len(ids))
+    return base64.b64encode(np.packbits(bits).tobytes()).decode("ascii")
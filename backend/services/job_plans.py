@@ -0,0 +1,152 @@
+"""
+Job plans precomputed on profile writes.
+
+A plan depends only on income, expenses and risk tolerance, so the profile writes store its
+JSON on user_data together with a hash of those inputs and the plan format it was built with;
+/finance/job-plan serves that JSON as long as both still match. Bumping
+finance_engine.PLAN_FORMAT_VERSION makes every stored plan stale: recompute_stale_plans()
+rebuilds them in keyset batches (the app starts it in a background thread), and until a row
+is reached its reads fall back to building the plan without storing it.
+"""
+import hashlib
+import json
+import logging
+import threading
+
+from sqlalchemy import bindparam, func, or_, select
+
+from ..db import models
+from . import finance_engine
+from .profile_input import ProfileInput
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def input_hash(profile):
+    """Hash of the ProfileInput fields generate_job_plan reads."""
+    key = f"{profile.income!r}|{profile.expenses!r}|{profile.risk_tolerance}"
+    return hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+
+
+def build_plan_json(profile):
+    return json.dumps(finance_engine.generate_job_plan_for(profile))
+
+
+def _is_current(user_data, digest):
+    return (
+        user_data.job_plan_json is not None
+        and user_data.job_plan_hash == digest
+        and user_data.job_plan_format == finance_engine.PLAN_FORMAT_VERSION
+    )
+
+
+def refresh_plan(user_data):
+    """
+    Store an up-to-date plan on a job user's row. Call before the profile write commits so the
+    plan goes out in the same versioned UPDATE; a no-op when the stored plan still matches.
+    """
+    if user_data.user_type != "job":
+        return
+    profile = ProfileInput.from_user_data(user_data)
+    digest = input_hash(profile)
+    if _is_current(user_data, digest):
+        return
+    user_data.job_plan_json = build_plan_json(profile)
+    user_data.job_plan_hash = digest
+    user_data.job_plan_format = finance_engine.PLAN_FORMAT_VERSION
+
+
+def plan_json(user_data, profile, digest):
+    """The stored plan if it was built from these inputs and format, else a freshly built one (not stored)."""
+    if _is_current(user_data, digest):
+        return user_data.job_plan_json
+    return build_plan_json(profile)
+
+
+def _stale():
+    UserData = models.UserData
+    return or_(UserData.job_plan_format.is_(None), UserData.job_plan_format != finance_engine.PLAN_FORMAT_VERSION)
+
+
+def stale_plan_count(db):
+    UserData = models.UserData
+    return db.execute(
+        select(func.count()).select_from(UserData).where(UserData.user_type == "job", _stale())
+    ).scalar()
+
+
+def recompute_stale_plans(db, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Rebuild every job user's plan that predates the current format, one committed batch at a time.
+
+    Writes are compare-and-swap on the version read with the batch, so a row a profile write
+    changed meanwhile is left alone (that write stored its own plan). They bypass the ORM, so
+    neither version nor updated_at moves: a derived column changing is not a profile edit.
+    Returns the number of rows processed.
+    """
+    UserData = models.UserData
+    table = UserData.__table__
+    update = (
+        table.update()
+        .where(table.c.id == bindparam("b_id"), table.c.version == bindparam("b_version"))
+        .values(
+            job_plan_json=bindparam("b_json"),
+            job_plan_hash=bindparam("b_hash"),
+            job_plan_format=finance_engine.PLAN_FORMAT_VERSION,
+            updated_at=table.c.updated_at,
+        )
+    )
+
+    processed = 0
+    last_id = None
+    while True:
+        stmt = (
+            select(UserData.id, UserData.version, *ProfileInput.columns())
+            .where(UserData.user_type == "job", _stale())
+            .order_by(UserData.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            stmt = stmt.where(UserData.id > last_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        params = []
+        for row in rows:
+            profile = ProfileInput.from_row(row[2:])
+            params.append({
+                "b_id": row[0], "b_version": row[1],
+                "b_json": build_plan_json(profile), "b_hash": input_hash(profile),
+            })
+        db.execute(update, params)
+        db.commit()
+
+        processed += len(rows)
+        if progress:
+            progress(processed, last_id)
+    return processed
+
+
+def start_background_recompute(session_factory, batch_size=DEFAULT_BATCH_SIZE):
+    """Run recompute_stale_plans in a daemon thread with its own session; returns the thread."""
+
+    def run():
+        db = session_factory()
+        try:
+            stale = stale_plan_count(db)
+            if stale:
+                logger.info("rebuilding job plans", extra={"stale": stale, "format": finance_engine.PLAN_FORMAT_VERSION})
+                processed = recompute_stale_plans(db, batch_size)
+                logger.info("job plans rebuilt", extra={"processed": processed})
+        except Exception:
+            logger.exception("job plan rebuild failed")
+        finally:
+            db.close()
+
+    thread = threading.Thread(target=run, name="job-plan-rebuild", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,155 @@
+import abc
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """
+    One connected client session listening for a receiver_email.
+    Events may be delivered from worker threads (sync routes), so they are
+    handed to the subscriber's event loop with call_soon_threadsafe.
+    """
+
+    def __init__(self, receiver_email, loop):
+        self.receiver_email = receiver_email
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow client: drop the event, it can resync from GET /notifications/
+            pass
+
+    def deliver(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # Event loop already closed; the session is going away
+            pass
+
+    async def get(self, timeout):
+        """Wait for the next event, returning None if nothing arrived within timeout seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class NotificationBroker(abc.ABC):
+    """
+    Interface for fanning notifications out to connected sessions.
+    Routes call publish(); the stream endpoint calls subscribe()/unsubscribe().
+    """
+
+    @abc.abstractmethod
+    def publish(self, receiver_email, event):
+        ...
+
+    @abc.abstractmethod
+    def subscribe(self, receiver_email):
+        ...
+
+    @abc.abstractmethod
+    def unsubscribe(self, subscription):
+        ...
+
+
+class InProcessBroker(NotificationBroker):
+    """
+    Single-worker pub/sub: subscribers live in this process and publish
+    fans out to them directly.
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, receiver_email):
+        sub = Subscription(receiver_email, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(receiver_email, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subs = self._subscribers.get(subscription.receiver_email)
+            if subs:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscribers[subscription.receiver_email]
+
+    def connection_count(self, receiver_email=None):
+        with self._lock:
+            if receiver_email is not None:
+                return len(self._subscribers.get(receiver_email, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+    def fanout(self, receiver_email, event):
+        """Deliver an event to every session connected to this process for receiver_email."""
+        with self._lock:
+            subs = list(self._subscribers.get(receiver_email, ()))
+        for sub in subs:
+            sub.deliver(event)
+
+    def publish(self, receiver_email, event):
+        self.fanout(receiver_email, event)
+
+
+class MemoryBus:
+    """
+    Local stand-in for an external message bus (Redis pub/sub, Postgres
+    LISTEN/NOTIFY, ...). A real bus only needs the same attach/send pair.
+    """
+
+    def __init__(self):
+        self._listeners = []
+
+    def attach(self, callback):
+        self._listeners.append(callback)
+
+    def send(self, receiver_email, event):
+        for callback in list(self._listeners):
+            callback(receiver_email, event)
+
+
+class BusBroker(InProcessBroker):
+    """
+    Multi-worker broker: publishes go through the shared bus and every
+    worker fans the message out to its own connected sessions.
+    """
+
+    def __init__(self, bus):
+        super().__init__()
+        self.bus = bus
+        bus.attach(self.fanout)
+
+    def publish(self, receiver_email, event):
+        self.bus.send(receiver_email, event)
+
+
+_broker = InProcessBroker()
+
+
+def get_broker():
+    return _broker
+
+
+def set_broker(broker):
+    """Swap the process-wide broker, e.g. for a BusBroker in multi-worker deployments."""
+    global _broker
+    _broker = broker
+
+
+def publish(receiver_email, event):
+    """Push an event to the receiver's live sessions. Never raises into the calling route."""
+    try:
+        _broker.publish(receiver_email, event)
+    except Exception:
+        logger.exception("notification push failed")
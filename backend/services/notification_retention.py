@@ -0,0 +1,59 @@
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from ..db import models
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_BATCH_SIZE = 1000
+
+
+def archive_read_notifications(db, older_than_days=DEFAULT_RETENTION_DAYS, batch_size=DEFAULT_BATCH_SIZE, max_batches=None):
+    """
+    Move read notifications older than the cutoff into notifications_archive.
+    Works in batches with a commit per batch so the hot table is never locked
+    for long and an interrupted run can simply be started again.
+    Returns the number of rows moved.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    Notification = models.Notification
+    Archive = models.NotificationArchive
+
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = [
+            row[0] for row in db.query(Notification.id).filter(
+                Notification.read == True,
+                Notification.created_at < cutoff
+            ).limit(batch_size).all()
+        ]
+        if not ids:
+            break
+
+        db.execute(
+            insert(Archive).from_select(
+                ["id", "receiver_email", "type", "message", "read", "created_at", "startup_id", "request_id"],
+                select(
+                    Notification.id,
+                    Notification.receiver_email,
+                    Notification.type,
+                    Notification.message,
+                    Notification.read,
+                    Notification.created_at,
+                    Notification.startup_id,
+                    Notification.request_id
+                ).where(Notification.id.in_(ids))
+            )
+        )
+        db.query(Notification).filter(Notification.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+
+        moved += len(ids)
+        batches += 1
+        logger.info("archived notification batch", extra={"batch": batches, "rows": len(ids), "total": moved})
+
+    return moved
@@ -1,36 +1,102 @@
 import json
+import os
+from functools import lru_cache
 
-def generate_portfolio(amount, risk_tolerance, user_type='job'):
+# Allocation templates live in a versioned data file; PORTFOLIO_TEMPLATES_PATH points at an alternative one
+DEFAULT_TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "allocation_templates.json")
+TEMPLATES_PATH = os.getenv("PORTFOLIO_TEMPLATES_PATH", DEFAULT_TEMPLATES_PATH)
+
+STARTUP_TEMPLATE = "startup"
+STARTUP_INVESTMENT_SHARE = 0.3 # Startups invest 30% of their annual budget
+
+
+class AllocationTemplate:
+    """One template's lines, with the weight vector precomputed so scaling is a single multiply per line."""
+    __slots__ = ("key", "lines", "weights")
+
+    def __init__(self, key, lines):
+        total = sum(line["percent"] for line in lines)
+        if abs(total - 100) > 1e-6:
+            raise ValueError(f"Allocation template '{key}' sums to {total}%, expected 100%")
+        self.key = key
+        self.lines = tuple(
+            {
+                "asset": line["asset"],
+                "asset_class": line.get("asset_class", "other"),
+                "percent": line["percent"],
+                "color": line.get("color"),
+            }
+            for line in lines
+        )
+        self.weights = tuple(line["percent"] / 100 for line in lines)
+
+    def scale(self, amount):
+        return [dict(line, amount=amount * weight) for line, weight in zip(self.lines, self.weights)]
+
+
+class TemplateRegistry:
+    __slots__ = ("version", "default", "templates", "asset_classes")
+
+    def __init__(self, data):
+        self.version = data["version"]
+        self.templates = {key: AllocationTemplate(key, lines) for key, lines in data["templates"].items()}
+        self.default = data.get("default", "moderate")
+        if self.default not in self.templates:
+            raise ValueError(f"Default allocation template '{self.default}' is not defined")
+        self.asset_classes = {
+            line["asset"]: line["asset_class"]
+            for template in self.templates.values()
+            for line in template.lines
+        }
+
+    def resolve(self, risk_tolerance, user_type='job'):
+        if user_type == 'startup' and STARTUP_TEMPLATE in self.templates:
+            return self.templates[STARTUP_TEMPLATE]
+        return self.templates.get(risk_tolerance) or self.templates[self.default]
+
+
+@lru_cache(maxsize=1)
+def get_registry():
+    """Load the template file once per process."""
+    with open(TEMPLATES_PATH) as f:
+        return TemplateRegistry(json.load(f))
+
+
+def reload_templates():
+    """Drop the loaded templates so the next call rereads the file (e.g. after editing it)."""
+    get_registry.cache_clear()
+
+
+def template_version():
+    return get_registry().version
+
+
+def asset_class_of(asset):
+    return get_registry().asset_classes.get(asset, "other")
+
+
+def resolve_investment_amount(profile):
     """
-    Generate portfolio allocation based on risk tolerance and user type.
+    Amount a user's portfolio (a ProfileInput) is built for: a job user's own monthly_investment
+    wins over the AI amount; startups invest a fixed share of their annual budget. 0 means no portfolio.
     """
-    allocations = []
-    
-    if user_type == 'startup':
-        allocations = [
-            {"asset": "Business Reinvestment", "percent": 60, "amount": amount * 0.60, "color": "#10B981"}, # Emerald
-            {"asset": "Cash Reserve (OpEx)", "percent": 20, "amount": amount * 0.20, "color": "#3B82F6"},   # Blue
-            {"asset": "Market Hedge (Puts/Gold)", "percent": 20, "amount": amount * 0.20, "color": "#F59E0B"} # Amber
-        ]
-        return json.dumps(allocations)
-    
-    if risk_tolerance == 'low':
-        allocations = [
-            {"asset": "Index Funds (S&P 500)", "percent": 60, "amount": amount * 0.60, "color": "#10B981"}, # Emerald
-            {"asset": "Government Bonds", "percent": 30, "amount": amount * 0.30, "color": "#3B82F6"}, # Blue
-            {"asset": "Gold / Real Estate", "percent": 10, "amount": amount * 0.10, "color": "#F59E0B"}  # Amber
-        ]
-    elif risk_tolerance == 'high':
-        allocations = [
-            {"asset": "Tech Growth Stocks", "percent": 60, "amount": amount * 0.60, "color": "#8B5CF6"}, # Violet
-            {"asset": "Emerging Markets", "percent": 30, "amount": amount * 0.30, "color": "#EC4899"},   # Pink
-            {"asset": "Crypto / Alt Assets", "percent": 10, "amount": amount * 0.10, "color": "#EF4444"}  # Red
-        ]
-    else: # moderate
-        allocations = [
-            {"asset": "Diversified ETFs", "percent": 50, "amount": amount * 0.50, "color": "#3B82F6"}, # Blue
-            {"asset": "Tech Sector", "percent": 30, "amount": amount * 0.30, "color": "#8B5CF6"},      # Violet
-            {"asset": "Corporate Bonds", "percent": 20, "amount": amount * 0.20, "color": "#10B981"}   # Emerald
-        ]
-        
-    return json.dumps(allocations)
+    if profile.user_type == 'job':
+        if profile.monthly_investment > 0:
+            return profile.monthly_investment
+        return profile.ai_investment_amount or 0.0
+    if profile.user_type == 'startup' and profile.budget > 0:
+        return profile.budget * STARTUP_INVESTMENT_SHARE
+    return 0.0
+
+
+def build_allocations(amount, risk_tolerance, user_type='job'):
+    """
+    Portfolio allocation lines (asset, asset_class, percent, amount, color)
+    based on risk tolerance and user type.
+    """
+    return get_registry().resolve(risk_tolerance, user_type).scale(amount)
+
+
+def allocations_for_profile(profile, amount):
+    """Allocation lines for a ProfileInput's user type and risk tolerance."""
+    return build_allocations(amount, profile.risk_tolerance, profile.user_type or 'job')
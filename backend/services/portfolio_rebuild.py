@@ -0,0 +1,143 @@
+import uuid
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import select, or_
+
+from ..db import database, models
+from . import portfolio_engine
+from .profile_input import ProfileInput
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def regenerate_portfolios(db, batch_size=DEFAULT_BATCH_SIZE, start_after=None, only_stale=True, progress=None):
+    """
+    Rebuild every user's portfolio from the current allocation templates.
+
+    Streams user_data in keyset order (by id) so memory stays at one batch, scales each
+    risk bucket's amounts against its weight vector in one outer product, and writes
+    each batch with bulk updates and an upsert on user_id (a profile write may create a
+    portfolio mid-batch) before committing it. Resumable: pass the last id reported to
+    `progress(processed, rebuilt, last_id)` as start_after.
+    With only_stale, portfolios already built from the current template version are skipped.
+    A user whose profile resolves to no amount keeps their portfolio's own amount, rebuilt
+    and stamped with the current version; without a portfolio they are skipped.
+    Returns (processed, rebuilt).
+    """
+    registry = portfolio_engine.get_registry()
+    version = registry.version
+    UserData, Portfolio, Allocation = models.UserData, models.UserPortfolio, models.PortfolioAllocation
+
+    processed = rebuilt = 0
+    last_id = start_after
+    while True:
+        stmt = select(UserData.id, *ProfileInput.columns()).where(UserData.user_type.in_(("job", "startup"))).order_by(UserData.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(UserData.id > last_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        processed += len(rows)
+        profiles = [ProfileInput.from_row(row[1:]) for row in rows]
+
+        existing = {
+            user_id: (portfolio_id, template_version, monthly_investment)
+            for portfolio_id, user_id, template_version, monthly_investment in db.execute(
+                select(Portfolio.id, Portfolio.user_id, Portfolio.template_version, Portfolio.monthly_investment)
+                .where(Portfolio.user_id.in_([p.user_id for p in profiles]))
+            )
+        }
+
+        # Bucket (user_id, amount) by template
+        buckets = {}
+        seen = set()
+        for p in profiles:
+            if p.user_id in seen:
+                continue
+            seen.add(p.user_id)
+            current = existing.get(p.user_id)
+            if only_stale and current is not None and current[1] == version:
+                continue
+            amount = portfolio_engine.resolve_investment_amount(p)
+            if amount <= 0:
+                if current is None:
+                    continue
+                # The profile no longer gives an amount (e.g. an explicit /portfolio/generate one):
+                # rebuild at the portfolio's own amount so it is stamped current and stops showing as stale
+                amount = current[2] or 0.0
+            key = registry.resolve(p.risk_tolerance, p.user_type).key
+            users, amounts = buckets.setdefault(key, ([], []))
+            users.append(p.user_id)
+            amounts.append(amount)
+
+        now = datetime.utcnow()
+        new_portfolios, portfolio_updates, lines_by_user = [], [], {}
+        for key, (users, amounts) in buckets.items():
+            template = registry.templates[key]
+            amounts = np.asarray(amounts, dtype=float)
+            line_amounts = np.outer(amounts, np.asarray(template.weights))  # users x lines
+            for user_id, amount, per_line in zip(users, amounts.tolist(), line_amounts.tolist()):
+                current = existing.get(user_id)
+                if current is None:
+                    new_portfolios.append({
+                        "id": str(uuid.uuid4()), "user_id": user_id, "monthly_investment": amount,
+                        "allocation_json": None, "template_version": version, "created_at": now, "updated_at": now,
+                    })
+                else:
+                    portfolio_updates.append({
+                        "id": current[0], "monthly_investment": amount, "allocation_json": None,
+                        "template_version": version, "updated_at": now,
+                    })
+                lines_by_user[user_id] = [
+                    {
+                        "position": position, "asset": line["asset"], "asset_class": line["asset_class"],
+                        "percent": line["percent"], "amount": line_amount, "color": line["color"],
+                    }
+                    for position, (line, line_amount) in enumerate(zip(template.lines, per_line))
+                ]
+
+        portfolio_ids = {}
+        if portfolio_updates:
+            db.bulk_update_mappings(Portfolio, portfolio_updates)
+            portfolio_ids.update((user_id, existing[user_id][0]) for user_id in lines_by_user if user_id in existing)
+        if new_portfolios:
+            # Upsert on user_id: a profile write may have created the portfolio since `existing` was read
+            insert = database.dialect_insert(db)(Portfolio.__table__)
+            db.execute(insert.on_conflict_do_update(
+                index_elements=[Portfolio.user_id],
+                set_={
+                    column: insert.excluded[column]
+                    for column in ("monthly_investment", "allocation_json", "template_version", "updated_at")
+                },
+            ), new_portfolios)
+            new_users = [row["user_id"] for row in new_portfolios]
+            portfolio_ids.update(db.execute(
+                select(Portfolio.user_id, Portfolio.id).where(Portfolio.user_id.in_(new_users))
+            ).all())
+        if portfolio_ids:
+            # Replace, never append: clears old rows and any a concurrent writer just inserted
+            db.query(Allocation).filter(
+                Allocation.portfolio_id.in_(list(portfolio_ids.values()))
+            ).delete(synchronize_session=False)
+            db.bulk_insert_mappings(Allocation, [
+                dict(line, id=str(uuid.uuid4()), portfolio_id=portfolio_ids[user_id], user_id=user_id)
+                for user_id, lines in lines_by_user.items()
+                for line in lines
+            ])
+        db.commit()
+
+        rebuilt += len(new_portfolios) + len(portfolio_updates)
+        if progress:
+            progress(processed, rebuilt, last_id)
+    return processed, rebuilt
+
+
+def stale_portfolio_count(db):
+    """Portfolios not built from the current template version (including unconverted legacy rows)."""
+    version = portfolio_engine.template_version()
+    Portfolio = models.UserPortfolio
+    return db.query(Portfolio).filter(
+        or_(Portfolio.template_version.is_(None), Portfolio.template_version != version)
+    ).count()
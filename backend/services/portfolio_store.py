@@ -0,0 +1,102 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import func
+
+from ..db import models
+from . import portfolio_engine
+
+
+def save_portfolio(db, user_id, amount, allocations, template_version=None):
+    """
+    Create or update the user's portfolio and replace its allocation rows.
+    Does not commit; the caller owns the transaction.
+    """
+    portfolio = db.query(models.UserPortfolio).filter(models.UserPortfolio.user_id == user_id).first()
+    if portfolio is None:
+        portfolio = models.UserPortfolio(user_id=user_id)
+        db.add(portfolio)
+    return set_allocations(portfolio, amount, allocations, template_version)
+
+
+def set_allocations(portfolio, amount, allocations, template_version=None):
+    """
+    Replace a portfolio's amount and allocation rows in place. Does not commit.
+    template_version records which template file produced the lines (None for converted legacy data).
+    """
+    portfolio.monthly_investment = amount
+    portfolio.template_version = template_version
+    portfolio.allocation_json = None
+    # Allocation rows live in another table; bump explicitly so the portfolio ETag changes
+    portfolio.updated_at = datetime.utcnow()
+    portfolio.allocations = [
+        models.PortfolioAllocation(
+            user_id=portfolio.user_id,
+            position=position,
+            asset=line["asset"],
+            asset_class=line.get("asset_class"),
+            percent=line["percent"],
+            amount=line["amount"],
+            color=line.get("color"),
+        )
+        for position, line in enumerate(allocations)
+    ]
+    return portfolio
+
+
+def rescale_portfolio(db, portfolio, amount):
+    """Change the invested amount, rescaling every allocation row in one UPDATE. Does not commit."""
+    portfolio.monthly_investment = amount
+    db.query(models.PortfolioAllocation).filter(
+        models.PortfolioAllocation.portfolio_id == portfolio.id
+    ).update(
+        {models.PortfolioAllocation.amount: models.PortfolioAllocation.percent * (amount or 0) / 100},
+        synchronize_session=False
+    )
+
+
+def allocation_list(portfolio):
+    """Allocation lines as API dicts; falls back to the legacy JSON blob for unmigrated rows."""
+    if portfolio.allocations:
+        return [
+            {
+                "asset": a.asset,
+                "asset_class": a.asset_class,
+                "percent": a.percent,
+                "amount": a.amount,
+                "color": a.color,
+            }
+            for a in portfolio.allocations
+        ]
+    if portfolio.allocation_json:
+        lines = json.loads(portfolio.allocation_json)
+        # Legacy blobs predate asset classes; derive them so the lines stress like migrated rows
+        for line in lines:
+            if not line.get("asset_class"):
+                line["asset_class"] = portfolio_engine.asset_class_of(line["asset"])
+        return lines
+    return []
+
+
+def exposure_by_asset_class(db):
+    """Book-wide exposure: total invested amount and holder count per asset class, in SQL."""
+    Allocation = models.PortfolioAllocation
+    rows = db.query(
+        Allocation.asset_class,
+        func.sum(Allocation.amount),
+        func.count(func.distinct(Allocation.user_id))
+    ).group_by(Allocation.asset_class).order_by(func.sum(Allocation.amount).desc()).all()
+
+    total = sum(amount or 0 for _, amount, _ in rows)
+    return {
+        "total_amount": round(total, 2),
+        "asset_classes": [
+            {
+                "asset_class": asset_class,
+                "amount": round(amount or 0, 2),
+                "share": round((amount or 0) / total, 4) if total else 0.0,
+                "holders": holders,
+            }
+            for asset_class, amount, holders in rows
+        ],
+    }
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from ..db import models
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileInput:
+    """
+    The profile fields the finance, recommendation and portfolio engines read, normalized once
+    (None -> 0 / 'moderate') so the engines never touch ORM objects or guess attribute names.
+    """
+    user_id: Optional[str]
+    user_type: Optional[str]
+    income: float
+    expenses: float
+    savings: float  # UserData.current_savings
+    risk_tolerance: str
+    monthly_investment: float
+    ai_investment_amount: Optional[float]
+    budget: float
+
+    @staticmethod
+    def columns():
+        """UserData columns in field order, for building records straight from a Core select."""
+        UserData = models.UserData
+        return (
+            UserData.user_id, UserData.user_type, UserData.income, UserData.expenses,
+            UserData.current_savings, UserData.risk_tolerance, UserData.monthly_investment,
+            UserData.ai_investment_amount, UserData.budget,
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """Build from a row of columns() values (or any sequence in that order)."""
+        user_id, user_type, income, expenses, savings, risk, monthly_investment, ai_amount, budget = row
+        return cls(
+            user_id=user_id,
+            user_type=user_type,
+            income=float(income or 0),
+            expenses=float(expenses or 0),
+            savings=float(savings or 0),
+            risk_tolerance=risk or "moderate",
+            monthly_investment=float(monthly_investment or 0),
+            ai_investment_amount=ai_amount,
+            budget=float(budget or 0),
+        )
+
+    @classmethod
+    def from_user_data(cls, user_data):
+        return cls.from_row((
+            user_data.user_id, user_data.user_type, user_data.income, user_data.expenses,
+            user_data.current_savings, user_data.risk_tolerance, user_data.monthly_investment,
+            user_data.ai_investment_amount, user_data.budget,
+        ))
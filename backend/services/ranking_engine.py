@@ -0,0 +1,177 @@
+import heapq
+import logging
+import threading
+
+import numpy as np
+from sqlalchemy import and_, or_, select
+
+from ..db import models
+
+logger = logging.getLogger(__name__)
+
+# Component weights per investor risk profile: survival, runway, burn efficiency, growth.
+# "moderate" matches lib/fundability.ts and is the score materialized on every startup.
+RISK_WEIGHTS = {
+    "low": np.array([0.45, 0.35, 0.15, 0.05]),
+    "moderate": np.array([0.40, 0.30, 0.20, 0.10]),
+    "high": np.array([0.25, 0.15, 0.15, 0.45]),
+}
+BASE_PROFILE = "moderate"
+
+GROWTH_TARGET = 20.0  # % monthly growth that earns full growth points
+SCAN_CHUNK_SIZE = 500
+
+
+def score_components(survival, runway, burn, growth):
+    """
+    Per-startup component scores (0-100), vectorized over equal-length arrays.
+    Returns an (n, 4) matrix: survival, runway, burn efficiency, growth.
+    """
+    survival = np.clip(np.nan_to_num(np.asarray(survival, dtype=float)), 0, 100)
+    runway = np.nan_to_num(np.asarray(runway, dtype=float))
+    burn = np.nan_to_num(np.asarray(burn, dtype=float))
+    growth = np.nan_to_num(np.asarray(growth, dtype=float))
+
+    # Ideal runway is 18+ months, under 3 months earns nothing
+    runway_score = np.clip((runway - 3) / (18 - 3), 0, 1) * 100
+    # Under $20k/mo burn earns full points, over $100k earns nothing
+    burn_score = np.clip((100000 - burn) / (100000 - 20000), 0, 1) * 100
+    growth_score = np.clip(growth / GROWTH_TARGET, 0, 1) * 100
+
+    return np.column_stack([survival, runway_score, burn_score, growth_score])
+
+
+def fundability_scores(survival, runway, burn, growth, risk_tolerance=BASE_PROFILE):
+    """Weighted fundability (0-100) for a batch of startups under a risk profile."""
+    weights = RISK_WEIGHTS.get(risk_tolerance, RISK_WEIGHTS[BASE_PROFILE])
+    return score_components(survival, runway, burn, growth) @ weights
+
+
+def apply_score(startup):
+    """Set the materialized fundability_score on a single Startup before it is saved."""
+    startup.fundability_score = float(fundability_scores(
+        [startup.survival_score], [startup.runway], [startup.burn], [startup.growth]
+    )[0])
+    return startup
+
+
+def refresh_scores(db, batch_size=1000, only_missing=False):
+    """
+    Recompute fundability_score for every startup (or, with only_missing, those that have
+    none yet) in vectorized batches. Returns rows updated.
+    """
+    Startup = models.Startup
+    updated = 0
+    last_id = None
+    while True:
+        stmt = select(
+            Startup.id, Startup.survival_score, Startup.runway, Startup.burn, Startup.growth
+        ).order_by(Startup.id).limit(batch_size)
+        if only_missing:
+            stmt = stmt.where(Startup.fundability_score.is_(None))
+        if last_id is not None:
+            stmt = stmt.where(Startup.id > last_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+
+        ids, survival, runway, burn, growth = zip(*rows)
+        scores = fundability_scores(survival, runway, burn, growth)
+        db.bulk_update_mappings(Startup, [
+            {"id": startup_id, "fundability_score": float(score)}
+            for startup_id, score in zip(ids, scores)
+        ])
+        db.commit()
+
+        updated += len(rows)
+        last_id = ids[-1]
+    return updated
+
+
+def start_background_refresh(session_factory, batch_size=1000):
+    """Score startups saved before fundability_score existed, in a daemon thread with its own session."""
+
+    def run():
+        db = session_factory()
+        try:
+            updated = refresh_scores(db, batch_size, only_missing=True)
+            if updated:
+                logger.info("fundability scores backfilled", extra={"updated": updated})
+        except Exception:
+            logger.exception("fundability backfill failed")
+        finally:
+            db.close()
+
+    thread = threading.Thread(target=run, name="fundability-backfill", daemon=True)
+    thread.start()
+    return thread
+
+
+def _push_top(heap, k, ids, scores):
+    for startup_id, score in zip(ids, scores.tolist()):
+        if len(heap) < k:
+            heapq.heappush(heap, (score, startup_id))
+        elif score > heap[0][0]:
+            heapq.heapreplace(heap, (score, startup_id))
+
+
+def _max_gain(weights):
+    # Largest amount a profile's score can exceed the base score (components are 0-100)
+    return float(100 * np.clip(weights - RISK_WEIGHTS[BASE_PROFILE], 0, None).sum())
+
+
+def top_k(db, risk_tolerance, k, chunk_size=SCAN_CHUNK_SIZE):
+    """
+    Best k startups for a risk profile as [(match_score, startup_id)], best first.
+
+    Walks the indexed fundability_score column in descending chunks, re-scores
+    each chunk for the profile, and keeps the running top k in a min-heap.
+    Stops once no unseen startup can beat the current k-th best: its profile
+    score is at most its base score plus _max_gain(weights). Startups not scored
+    yet (no bound to prune on) are then scored in full, so they rank too.
+    """
+    Startup = models.Startup
+    weights = RISK_WEIGHTS.get(risk_tolerance, RISK_WEIGHTS[BASE_PROFILE])
+    slack = _max_gain(weights)
+
+    heap = []
+    cursor = None
+    while True:
+        stmt = select(
+            Startup.id, Startup.survival_score, Startup.runway, Startup.burn,
+            Startup.growth, Startup.fundability_score
+        ).where(Startup.fundability_score.isnot(None))
+        if cursor is not None:
+            cursor_score, cursor_id = cursor
+            stmt = stmt.where(or_(
+                Startup.fundability_score < cursor_score,
+                and_(Startup.fundability_score == cursor_score, Startup.id < cursor_id)
+            ))
+        rows = db.execute(
+            stmt.order_by(Startup.fundability_score.desc(), Startup.id.desc()).limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+
+        ids, survival, runway, burn, growth, base = zip(*rows)
+        _push_top(heap, k, ids, score_components(survival, runway, burn, growth) @ weights)
+
+        cursor = (base[-1], ids[-1])
+        if len(heap) == k and base[-1] + slack <= heap[0][0]:
+            break
+
+    last_id = None
+    while True:
+        stmt = select(
+            Startup.id, Startup.survival_score, Startup.runway, Startup.burn, Startup.growth
+        ).where(Startup.fundability_score.is_(None)).order_by(Startup.id).limit(chunk_size)
+        if last_id is not None:
+            stmt = stmt.where(Startup.id > last_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+        ids, survival, runway, burn, growth = zip(*rows)
+        _push_top(heap, k, ids, score_components(survival, runway, burn, growth) @ weights)
+        last_id = ids[-1]
+
+    return sorted(heap, reverse=True)
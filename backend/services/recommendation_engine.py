@@ -1,118 +1,209 @@
-import random
+from functools import lru_cache
 
+import numpy as np
+from sqlalchemy import select
 
-def calculate_confidence(user_data, asset_info: dict) -> int:
+from ..db import models
+from .profile_input import ProfileInput
+
+# Integer codes for categorical inputs in the batch arrays
+RISK_CODES = {"low": 0, "moderate": 1, "high": 2}
+OTHER_RISK = 3  # Any other stored value: matches no asset risk
+OUTLOOK_CODES = {"low": 0, "medium": 1, "high": 2}
+MARKET_BOOST = np.array([5, 10, 15])
+RISK_MULTIPLIERS = np.array([0.6, 1.0, 1.4, 1.0])
+
+RECOMMENDATION_FIELDS = (
+    "monthly_disposable", "recommended_investment", "recommended_savings", "emergency_fund_allocation",
+    "confidence_score", "invest_confidence", "savings_confidence", "emergency_confidence",
+)
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def _inputs(profile: ProfileInput):
+    """The only fields recommendations depend on; also the cache key."""
+    return (profile.income, profile.expenses, profile.savings, profile.risk_tolerance)
+
+
+def risk_codes(risk_tolerances):
+    """Map risk tolerance strings to RISK_CODES (None counts as moderate)."""
+    return np.fromiter(
+        (RISK_CODES.get(r or "moderate", OTHER_RISK) for r in risk_tolerances),
+        dtype=np.int64, count=len(risk_tolerances)
+    )
+
+
+def _mix(h):
+    # splitmix64 finalizer; uint64 arithmetic wraps, which is what we want here
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def _cents(values):
+    return np.round(values * 100).astype(np.int64).view(np.uint64)
+
+
+def _jitter(income, expenses, savings, risk, asset_risk, alloc, outlook):
+    """Stable +-3 per user and asset, hashed from the inputs, so the same profile always gets the same score."""
+    h = _mix(_cents(income))
+    for part in (_cents(expenses), _cents(savings), risk.astype(np.uint64)):
+        h = _mix(h ^ part)
+    tag = (
+        (np.asarray(asset_risk).astype(np.uint64) << np.uint64(16))
+        | np.uint64(alloc << 4)
+        | np.asarray(outlook).astype(np.uint64)
+    )
+    h = _mix(h ^ tag)
+    return (h % np.uint64(7)).astype(np.int64) - 3
+
+
+def confidence_scores(income, expenses, savings, risk, asset_risk, alloc, outlook):
     """
-    Calculate a dynamic AI confidence score (55-95%) for a recommendation.
+    AI confidence scores (55-95%) for one recommendation category across N users.
     Factors: income stability, savings ratio, risk alignment, allocation weight, market outlook.
+    income/expenses/savings are float arrays, risk an array of RISK_CODES; asset_risk and outlook
+    are codes (scalar or per-user array), alloc the category's allocation percent.
     """
-    score = 50
-
-    income = getattr(user_data, 'income', 0) or 0
-    expenses = getattr(user_data, 'expenses', 0) or 0
-    savings = getattr(user_data, 'monthly_savings', 0) or 0
-    risk_tolerance = getattr(user_data, 'risk_tolerance', 'moderate') or 'moderate'
+    score = np.full(len(income), 50, dtype=np.int64)
 
     # 1. Income stability: positive cash flow => more reliable recommendation
-    if income > expenses and income > 0:
-        score += 10
+    score += np.where((income > expenses) & (income > 0), 10, 0)
 
     # 2. Savings ratio: 3x+ income saved => strong financial base
-    if savings > income * 3:
-        score += 10
-    elif savings > income:
-        score += 5
+    score += np.where(savings > income * 3, 10, np.where(savings > income, 5, 0))
 
     # 3. Risk alignment: does the asset match the user's risk profile?
-    asset_risk = asset_info.get("risk", "moderate")
-    if asset_risk == risk_tolerance:
-        score += 15
-    elif asset_risk == "moderate":
-        score += 5  # moderate assets are somewhat suitable for everyone
-    else:
-        score -= 5
+    # moderate assets are somewhat suitable for everyone
+    score += np.where(asset_risk == risk, 15, np.where(asset_risk == RISK_CODES["moderate"], 5, -5))
 
     # 4. Allocation strength: higher allocation = stronger recommendation
-    alloc = asset_info.get("allocation", 30)
-    if alloc >= 40:
-        score += 5
-    elif alloc >= 25:
-        score += 3
+    score += 5 if alloc >= 40 else (3 if alloc >= 25 else 0)
 
     # 5. Market outlook factor
-    outlook = asset_info.get("market_outlook", "medium")
-    market_boost = {"low": 5, "medium": 10, "high": 15}
-    score += market_boost.get(outlook, 10)
+    score += MARKET_BOOST[outlook]
 
-    # 6. Random jitter for realism (+-3)
-    score += random.randint(-3, 3)
+    # 6. Jitter for realism (+-3), deterministic per profile
+    score += _jitter(income, expenses, savings, risk, asset_risk, alloc, outlook)
 
     # Clamp to 55-95 range
-    score = max(55, min(score, 95))
-    return score
+    return np.clip(score, 55, 95)
 
 
-def generate_recommendations(user_data):
+def recommend_batch(income, expenses, savings, risk_tolerance):
     """
-    Generate financial recommendations based on user data.
-    Input: user_data object (SQLAlchemy model or dict)
+    Recommendations for N users from columnar inputs: income, expenses and savings as
+    numeric arrays, risk_tolerance as strings or RISK_CODES. Returns a dict of arrays,
+    one per RECOMMENDATION_FIELDS entry, without a Python loop per user.
     """
-    # Extract data safely
-    income = getattr(user_data, 'income', 0) or 0
-    expenses = getattr(user_data, 'expenses', 0) or 0
-    risk_tolerance = getattr(user_data, 'risk_tolerance', 'moderate') or 'moderate'
-
-    disposable = max(0, income - expenses)
-
-    # Base allocations
-    base_invest = disposable * 0.5
-    base_save = disposable * 0.3
+    income = np.asarray(income, dtype=float)
+    expenses = np.asarray(expenses, dtype=float)
+    savings = np.asarray(savings, dtype=float)
+    risk = np.asarray(risk_tolerance)
+    if risk.dtype.kind not in "iu":
+        risk = risk_codes(list(risk_tolerance))
+    risk = risk.astype(np.int64)
+
+    disposable = np.maximum(0, income - expenses)
+
+    # Base allocations, with the investment share adjusted for risk
+    risk_multiplier = RISK_MULTIPLIERS[risk]
+    recommended_investment = disposable * 0.5 * risk_multiplier
+    recommended_savings = disposable * 0.3
     emergency_fund_monthly = disposable * 0.2
 
-    # Risk adjustment
-    risk_multiplier = 1.0
-    if risk_tolerance == 'low':
-        risk_multiplier = 0.6
-    elif risk_tolerance == 'high':
-        risk_multiplier = 1.4
-
-    recommended_investment = base_invest * risk_multiplier
-    recommended_savings = base_save
-
     # Dynamic confidence scores per recommendation category
-    invest_confidence = calculate_confidence(user_data, {
-        "risk": "high" if risk_multiplier > 1.0 else ("low" if risk_multiplier < 1.0 else "moderate"),
-        "allocation": 50,
-        "market_outlook": "high" if risk_tolerance == "high" else "medium",
-    })
-
-    savings_confidence = calculate_confidence(user_data, {
-        "risk": "low",
-        "allocation": 30,
-        "market_outlook": "medium",
-    })
-
-    emergency_confidence = calculate_confidence(user_data, {
-        "risk": "low",
-        "allocation": 20,
-        "market_outlook": "low",
-    })
-
-    # Overall confidence = weighted average
-    overall_confidence = round(
-        (invest_confidence * 0.5 + savings_confidence * 0.3 + emergency_confidence * 0.2)
+    invest_asset_risk = np.where(risk_multiplier > 1.0, RISK_CODES["high"],
+                                 np.where(risk_multiplier < 1.0, RISK_CODES["low"], RISK_CODES["moderate"]))
+    invest_outlook = np.where(risk == RISK_CODES["high"], OUTLOOK_CODES["high"], OUTLOOK_CODES["medium"])
+    invest_confidence = confidence_scores(income, expenses, savings, risk, invest_asset_risk, 50, invest_outlook)
+    savings_confidence = confidence_scores(
+        income, expenses, savings, risk, RISK_CODES["low"], 30, OUTLOOK_CODES["medium"]
+    )
+    emergency_confidence = confidence_scores(
+        income, expenses, savings, risk, RISK_CODES["low"], 20, OUTLOOK_CODES["low"]
     )
 
-    print(f"[RecommendationEngine] Confidence — invest:{invest_confidence}%, savings:{savings_confidence}%, emergency:{emergency_confidence}%, overall:{overall_confidence}%")
+    # Overall confidence = weighted average
+    overall_confidence = np.round(
+        invest_confidence * 0.5 + savings_confidence * 0.3 + emergency_confidence * 0.2
+    ).astype(np.int64)
 
     return {
         "monthly_disposable": disposable,
-        "recommended_investment": round(recommended_investment, 2),
-        "recommended_savings": round(recommended_savings, 2),
-        "emergency_fund_allocation": round(emergency_fund_monthly, 2),
+        "recommended_investment": np.round(recommended_investment, 2),
+        "recommended_savings": np.round(recommended_savings, 2),
+        "emergency_fund_allocation": np.round(emergency_fund_monthly, 2),
         "confidence_score": overall_confidence,
         "invest_confidence": invest_confidence,
         "savings_confidence": savings_confidence,
         "emergency_confidence": emergency_confidence,
-        "message": f"Based on your {risk_tolerance} risk profile, we recommend investing ${round(recommended_investment, 2)} monthly."
     }
+
+
+def batch_to_records(batch):
+    """Row-wise dicts of plain Python numbers from a recommend_batch result."""
+    columns = [batch[field].tolist() for field in RECOMMENDATION_FIELDS]
+    return [dict(zip(RECOMMENDATION_FIELDS, row)) for row in zip(*columns)]
+
+
+def calculate_confidence(profile: ProfileInput, asset_info: dict) -> int:
+    """
+    Calculate a dynamic AI confidence score (55-95%) for a recommendation.
+    Factors: income stability, savings ratio, risk alignment, allocation weight, market outlook.
+    """
+    income, expenses, savings, risk_tolerance = _inputs(profile)
+    return int(confidence_scores(
+        np.array([income]), np.array([expenses]), np.array([savings]), risk_codes([risk_tolerance]),
+        RISK_CODES.get(asset_info.get("risk", "moderate"), OTHER_RISK),
+        asset_info.get("allocation", 30),
+        OUTLOOK_CODES.get(asset_info.get("market_outlook", "medium"), OUTLOOK_CODES["medium"]),
+    )[0])
+
+
+def generate_recommendations(profile: ProfileInput):
+    """
+    Generate financial recommendations for one profile.
+    Results are a pure function of _inputs(profile) and are memoized on them, so a
+    profile write that changes any of them misses the cache and nothing else can go stale.
+    """
+    return dict(_recommend(*_inputs(profile)))
+
+
+@lru_cache(maxsize=4096)
+def _recommend(income, expenses, savings, risk_tolerance):
+    # A batch of one, so single-user and batch scoring can never disagree
+    result = batch_to_records(recommend_batch([income], [expenses], [savings], [risk_tolerance]))[0]
+    result["message"] = (
+        f"Based on your {risk_tolerance} risk profile, we recommend investing ${result['recommended_investment']} monthly."
+    )
+    return result
+
+
+def columns_from_profiles(profiles):
+    """Columnar (income, expenses, savings, risk_tolerance) lists from ProfileInput records, for recommend_batch."""
+    return tuple(map(list, zip(*(_inputs(p) for p in profiles)))) or ([], [], [], [])
+
+
+def iter_user_scores(db, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Score every job user's profile, batch_size users at a time in keyset order.
+    Selects only the input columns (no ORM objects). Yields (user_ids, recommend_batch result) per batch.
+    """
+    UserData = models.UserData
+    last_id = None
+    while True:
+        stmt = select(UserData.id, *ProfileInput.columns()).where(
+            UserData.user_type == 'job'
+        ).order_by(UserData.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(UserData.id > last_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        profiles = [ProfileInput.from_row(row[1:]) for row in rows]
+        yield [p.user_id for p in profiles], recommend_batch(*columns_from_profiles(profiles))
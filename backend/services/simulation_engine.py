@@ -0,0 +1,115 @@
+import numpy as np
+
+DEFAULT_PATHS = 10000
+DEFAULT_MONTHS = 60
+DEFAULT_SEED = 42
+# paths x months per run: each float64 matrix of this size is 24 MB, and a run holds a few at once
+MAX_CELLS = 3_000_000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Annual (expected growth, volatility) per scenario type and risk profile, as in lib/scenarioEngine.ts
+ANNUAL_PARAMS = {
+    ("invest", "low"): (0.04, 0.05),
+    ("invest", "medium"): (0.08, 0.12),
+    ("invest", "high"): (0.12, 0.20),
+    ("startup", "low"): (0.0, 0.10),
+    ("startup", "medium"): (0.40, 0.50),
+    ("startup", "high"): (0.80, 0.90),
+    ("hybrid", "low"): (0.15, 0.25),
+    ("hybrid", "medium"): (0.15, 0.25),
+    ("hybrid", "high"): (0.15, 0.25),
+}
+
+# Same scale as the client engine
+RISK_SCORES = {"startup": 9, "hybrid": 6}
+INVEST_RISK_SCORES = {"low": 2, "medium": 5, "high": 7}
+
+
+def normalize_risk(risk_profile):
+    """The profile stores 'moderate'; the scenario UI says 'medium'."""
+    risk = (risk_profile or "medium").lower()
+    return "medium" if risk == "moderate" else risk
+
+
+def monthly_growth_factors(scenario_type, risk_profile, paths, months, rng):
+    """paths x months matrix of gross monthly returns, lognormal with the profile's annual mean and volatility."""
+    growth, volatility = ANNUAL_PARAMS[(scenario_type, normalize_risk(risk_profile))]
+    sigma = volatility / np.sqrt(12)
+    mu = np.log1p(growth) / 12 - 0.5 * sigma ** 2  # So E[annual gross return] = 1 + growth
+    return np.exp(mu + sigma * rng.standard_normal((paths, months)))
+
+
+def simulate_paths(capital, monthly_contribution, growth_factors):
+    """
+    Portfolio value after each month for every path, with the contribution added before each month's return:
+    V_t = (V_{t-1} + c) * G_t. Closed form V_t = P_t * (capital + c * sum_{s<=t} 1/P_{s-1}), where P is the
+    cumulative product of G, so the whole matrix is two cumulative ops instead of a Python loop over months.
+    """
+    cumulative = np.cumprod(growth_factors, axis=1)
+    previous = np.empty_like(cumulative)
+    previous[:, 0] = 1.0
+    previous[:, 1:] = cumulative[:, :-1]
+    return cumulative * (capital + monthly_contribution * np.cumsum(1.0 / previous, axis=1))
+
+
+def max_drawdowns(values, capital):
+    """Largest peak-to-trough fall of each path, as a fraction of the peak."""
+    start = np.full((values.shape[0], 1), float(capital))
+    peaks = np.maximum.accumulate(np.hstack([start, values]), axis=1)[:, 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peaks > 0, 1 - values / peaks, 0.0)
+    return drawdown.max(axis=1)
+
+
+def run_simulation(scenario_type, capital, monthly_contribution, risk_profile,
+                   months=DEFAULT_MONTHS, paths=DEFAULT_PATHS, goals=(), seed=DEFAULT_SEED):
+    """
+    Monte Carlo projection. The same inputs and seed always give the same result.
+    Raises ValueError on an unknown scenario type or risk profile, or more than MAX_CELLS paths x months.
+    """
+    if paths * months > MAX_CELLS:
+        raise ValueError(f"{paths} paths x {months} months exceeds the {MAX_CELLS:,} cell limit")
+    risk = normalize_risk(risk_profile)
+    if (scenario_type, risk) not in ANNUAL_PARAMS:
+        raise ValueError(f"Unknown scenario '{scenario_type}' / risk profile '{risk_profile}'")
+
+    rng = np.random.default_rng(seed)
+    values = simulate_paths(capital, monthly_contribution, monthly_growth_factors(scenario_type, risk, paths, months, rng))
+    final = values[:, -1]
+
+    # Percentile bands at each year end (and the final month if it is not one)
+    checkpoints = list(range(11, months, 12))
+    if not checkpoints or checkpoints[-1] != months - 1:
+        checkpoints.append(months - 1)
+    bands = np.percentile(values[:, checkpoints], PERCENTILES, axis=0)  # percentiles x checkpoints
+
+    drawdowns = max_drawdowns(values, capital)
+    contributed = capital + monthly_contribution * months
+
+    return {
+        "scenario": scenario_type,
+        "risk_profile": risk,
+        "paths": paths,
+        "months": months,
+        "seed": seed,
+        "total_contributed": round(contributed, 2),
+        "final": {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(final, PERCENTILES))},
+        "mean_final": round(float(final.mean()), 2),
+        "probability_of_loss": float((final < contributed).mean()),
+        "goals": [
+            {"target": goal, "probability": float((final >= goal).mean())}
+            for goal in goals
+        ],
+        "max_drawdown": {
+            "median": float(np.median(drawdowns)),
+            "p95": float(np.percentile(drawdowns, 95)),
+        },
+        "projections": [
+            {
+                "month": month + 1,
+                **{f"p{p}": round(float(bands[i, col]), 2) for i, p in enumerate(PERCENTILES)},
+            }
+            for col, month in enumerate(checkpoints)
+        ],
+        "risk_score": INVEST_RISK_SCORES[risk] if scenario_type == "invest" else RISK_SCORES[scenario_type],
+    }
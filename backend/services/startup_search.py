@@ -0,0 +1,193 @@
+import logging
+import re
+from datetime import datetime
+
+from sqlalchemy import func, or_, text, tuple_
+
+from ..db import models
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+SORT_COLUMNS = {
+    "survival_score": models.Startup.survival_score,
+    "growth": models.Startup.growth,
+    "fundability_score": models.Startup.fundability_score,
+    "created_at": models.Startup.created_at,
+}
+# Sorts whose column can be NULL (unscored rows); the others always have a value
+NULLABLE_SORTS = {"fundability_score"}
+
+# Which full-text backend ensure_fulltext_index() managed to set up
+_fulltext_backend = None
+
+
+FTS_TRIGGERS = ("startups_fts_ai", "startups_fts_ad", "startups_fts_au")
+
+# Give rows without a search key one past the current maximum. The scalar subquery is
+# uncorrelated, so SQLite evaluates it once and rowid keeps the new keys distinct.
+ASSIGN_MISSING_SEARCH_KEYS = (
+    "UPDATE startups SET search_key = rowid + (SELECT COALESCE(MAX(search_key), 0) FROM startups) "
+    "WHERE search_key IS NULL"
+)
+
+
+def ensure_fulltext_index(engine):
+    """
+    Build the full-text index over startup name/description for this dialect.
+    SQLite: an external-content FTS5 table keyed on startups.search_key and kept in sync by
+    triggers. The key is an explicit column rather than the implicit rowid, which VACUUM may
+    renumber on a table with a string primary key; an index built on rowid is dropped and rebuilt.
+    Postgres: a GIN index on the same tsvector expression search() uses.
+    Falls back to LIKE matching if neither is available.
+    """
+    global _fulltext_backend
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                existing = conn.execute(text(
+                    "SELECT sql FROM sqlite_master WHERE type='table' AND name='startups_fts'"
+                )).scalar()
+                if existing is not None and "search_key" not in existing:
+                    conn.execute(text("DROP TABLE startups_fts"))
+                    for trigger in FTS_TRIGGERS:
+                        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+                    existing = None
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS startups_fts USING fts5("
+                    "name, description, content='startups', content_rowid='search_key')"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS startups_fts_ai AFTER INSERT ON startups BEGIN "
+                    "UPDATE startups SET search_key = (SELECT COALESCE(MAX(search_key), 0) + 1 FROM startups) "
+                    "WHERE rowid = new.rowid AND search_key IS NULL; "
+                    "INSERT INTO startups_fts(rowid, name, description) "
+                    "SELECT search_key, name, description FROM startups WHERE rowid = new.rowid; END"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS startups_fts_ad AFTER DELETE ON startups BEGIN "
+                    "INSERT INTO startups_fts(startups_fts, rowid, name, description) "
+                    "VALUES ('delete', old.search_key, old.name, old.description); END"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS startups_fts_au AFTER UPDATE OF name, description ON startups BEGIN "
+                    "INSERT INTO startups_fts(startups_fts, rowid, name, description) "
+                    "VALUES ('delete', old.search_key, old.name, old.description); "
+                    "INSERT INTO startups_fts(rowid, name, description) VALUES (new.search_key, new.name, new.description); END"
+                ))
+                # Rows written without the triggers (before the column existed, or by raw inserts)
+                assigned = conn.execute(text(ASSIGN_MISSING_SEARCH_KEYS)).rowcount
+                if existing is None or assigned:
+                    # Index rows that predate the FTS table or its key
+                    conn.execute(text("INSERT INTO startups_fts(startups_fts) VALUES ('rebuild')"))
+                _fulltext_backend = "fts5"
+            elif dialect == "postgresql":
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_startups_fulltext ON startups USING GIN ("
+                    "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '')))"
+                ))
+                _fulltext_backend = "tsvector"
+    except Exception:
+        logger.warning("full-text index unavailable, using LIKE fallback", exc_info=True)
+        _fulltext_backend = None
+    return _fulltext_backend
+
+
+def _fts5_query(q):
+    # Quote each word so user input can't inject FTS syntax; prefix-match the terms
+    terms = re.findall(r"\w+", q)
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+def _text_filter(q):
+    Startup = models.Startup
+    if _fulltext_backend == "fts5":
+        match = _fts5_query(q)
+        if not match:
+            return None
+        return text(
+            "startups.search_key IN (SELECT rowid FROM startups_fts WHERE startups_fts MATCH :fts_query)"
+        ).bindparams(fts_query=match)
+    if _fulltext_backend == "tsvector":
+        document = func.to_tsvector(
+            "english",
+            func.coalesce(Startup.name, "") + " " + func.coalesce(Startup.description, "")
+        )
+        return document.op("@@")(func.plainto_tsquery("english", q))
+    pattern = f"%{q}%"
+    return or_(Startup.name.ilike(pattern), Startup.description.ilike(pattern))
+
+
+def encode_cursor(startup, sort):
+    value = getattr(startup, sort)
+    if value is None:
+        value = ""
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    return f"{value}|{startup.id}"
+
+
+def decode_cursor(cursor, sort):
+    """Return (sort value, id) or raise ValueError for a malformed cursor. The value is None past the NULLs-last boundary."""
+    value, startup_id = cursor.rsplit("|", 1)
+    if value == "":
+        return None, startup_id
+    if sort == "created_at":
+        return datetime.fromisoformat(value), startup_id
+    return float(value), startup_id
+
+
+def search(db, q=None, industry=None, ranges=None, sort="survival_score", limit=DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    Filtered, keyset-paginated startup listing, best first.
+    `ranges` maps a Startup column name to a (min, max) pair; either bound may be None.
+    Returns (rows, next_cursor).
+    """
+    Startup = models.Startup
+    sort_col = SORT_COLUMNS[sort]
+
+    query = db.query(Startup)
+    if industry:
+        query = query.filter(Startup.industry == industry)
+    for column_name, (low, high) in (ranges or {}).items():
+        column = getattr(Startup, column_name)
+        if low is not None:
+            query = query.filter(column >= low)
+        if high is not None:
+            query = query.filter(column <= high)
+    if q and q.strip():
+        condition = _text_filter(q.strip())
+        if condition is None:
+            return [], None
+        query = query.filter(condition)
+
+    cursor_value, cursor_id = decode_cursor(cursor, sort) if cursor else (None, None)
+    nullable = sort in NULLABLE_SORTS
+
+    # Each page is a (sort, id) < (value, id) range seek on ix_startups_<sort>_id
+    rows = []
+    if cursor_id is None or cursor_value is not None:
+        ranked = query
+        if cursor_id is not None:
+            # A NULL sort value never compares less, so this also stops before the NULL tail
+            ranked = ranked.filter(tuple_(sort_col, Startup.id) < (cursor_value, cursor_id))
+        elif nullable:
+            ranked = ranked.filter(sort_col.isnot(None))
+        rows = ranked.order_by(sort_col.desc(), Startup.id.desc()).limit(limit + 1).all()
+
+    # Rows without a sort value (legacy rows not scored yet) come last, in id order, served
+    # by their own seek once the ranked range runs out
+    if nullable and len(rows) <= limit:
+        tail = query.filter(sort_col.is_(None))
+        if cursor_id is not None and cursor_value is None:
+            tail = tail.filter(Startup.id < cursor_id)
+        rows += tail.order_by(Startup.id.desc()).limit(limit + 1 - len(rows)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1], sort)
+    return rows, next_cursor
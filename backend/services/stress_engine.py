@@ -0,0 +1,148 @@
+import numpy as np
+from sqlalchemy import select, func
+
+from ..db import models
+
+# Rows of the shock matrix
+ASSET_CLASSES = ("equity", "bonds", "crypto", "cash", "business", "hedge", "real_assets", "other")
+_CLASS_INDEX = {name: i for i, name in enumerate(ASSET_CLASSES)}
+
+# Same shocks as lib/portfolioStress.ts; classes it does not mention are unshocked
+DEFAULT_SCENARIOS = [
+    {
+        "name": "Global Recession",
+        "description": "Severe economic downturn",
+        "shocks": {"equity": -0.30, "crypto": -0.50, "bonds": 0.05},
+    },
+    {
+        "name": "High Inflation",
+        "description": "Purchasing power decline",
+        "shocks": {"equity": -0.10, "crypto": 0.10, "bonds": -0.05},
+    },
+    {
+        "name": "Tech Bull Run",
+        "description": "Aggressive growth cycle",
+        "shocks": {"equity": 0.25, "crypto": 0.40, "bonds": -0.02},
+    },
+]
+
+BOOK_CHUNK_SIZE = 5000
+SEVERE_LOSS = -0.20  # Book report counts portfolios losing more than this in a scenario
+
+
+def shock_matrix(scenarios):
+    """Asset class x scenario matrix of fractional returns. Raises ValueError on unknown classes or shocks below -100%."""
+    matrix = np.zeros((len(ASSET_CLASSES), len(scenarios)))
+    for col, scenario in enumerate(scenarios):
+        for asset_class, shock in scenario["shocks"].items():
+            if asset_class not in _CLASS_INDEX:
+                raise ValueError(f"Unknown asset class '{asset_class}' in scenario '{scenario['name']}'")
+            if shock < -1:
+                raise ValueError(f"Scenario '{scenario['name']}' shocks {asset_class} below -100%")
+            matrix[_CLASS_INDEX[asset_class], col] = shock
+    return matrix
+
+
+def exposure_vector(allocations):
+    """Amount held per asset class, in ASSET_CLASSES order."""
+    exposure = np.zeros(len(ASSET_CLASSES))
+    for line in allocations:
+        exposure[_CLASS_INDEX.get(line.get("asset_class"), _CLASS_INDEX["other"])] += line.get("amount") or 0
+    return exposure
+
+
+def stress_portfolio(allocations, scenarios=None):
+    """P&L of one portfolio under each scenario: a single exposure-vector x shock-matrix product."""
+    scenarios = scenarios or DEFAULT_SCENARIOS
+    exposure = exposure_vector(allocations)
+    value = float(exposure.sum())
+    changes = exposure @ shock_matrix(scenarios)
+
+    return [
+        {
+            "scenario": scenario["name"],
+            "description": scenario.get("description"),
+            "change_percent": float(change / value) if value else 0.0,
+            "change_amount": round(float(change), 2),
+            "projected_value": round(value + float(change), 2),
+        }
+        for scenario, change in zip(scenarios, changes)
+    ]
+
+
+def stress_book(db, scenarios=None, chunk_size=BOOK_CHUNK_SIZE):
+    """
+    Stress every portfolio at once. Streams per-portfolio class exposures in chunks of
+    portfolios, builds a portfolios x classes matrix per chunk and multiplies it by the
+    shock matrix, accumulating book totals and the worst single-portfolio drawdown.
+    """
+    scenarios = scenarios or DEFAULT_SCENARIOS
+    shocks = shock_matrix(scenarios)
+    Portfolio, Allocation = models.UserPortfolio, models.PortfolioAllocation
+
+    book_value = 0.0
+    portfolios = 0
+    book_change = np.zeros(len(scenarios))
+    severe = np.zeros(len(scenarios), dtype=int)
+    worst_pct = np.full(len(scenarios), np.inf)
+    worst_id = [None] * len(scenarios)
+
+    last_id = None
+    while True:
+        stmt = select(Portfolio.id).order_by(Portfolio.id).limit(chunk_size)
+        if last_id is not None:
+            stmt = stmt.where(Portfolio.id > last_id)
+        ids = db.execute(stmt).scalars().all()
+        if not ids:
+            break
+        last_id = ids[-1]
+
+        rows = db.execute(
+            select(Allocation.portfolio_id, Allocation.asset_class, func.sum(Allocation.amount))
+            .where(Allocation.portfolio_id.in_(ids))
+            .group_by(Allocation.portfolio_id, Allocation.asset_class)
+        ).all()
+        if not rows:
+            continue
+
+        row_of = {}
+        portfolio_idx = np.fromiter((row_of.setdefault(pid, len(row_of)) for pid, _, _ in rows), dtype=int, count=len(rows))
+        class_idx = np.fromiter((_CLASS_INDEX.get(cls, _CLASS_INDEX["other"]) for _, cls, _ in rows), dtype=int, count=len(rows))
+        amounts = np.fromiter((amount or 0 for _, _, amount in rows), dtype=float, count=len(rows))
+
+        exposure = np.zeros((len(row_of), len(ASSET_CLASSES)))
+        np.add.at(exposure, (portfolio_idx, class_idx), amounts)
+        values = exposure.sum(axis=1)
+        changes = exposure @ shocks  # portfolios x scenarios
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(values[:, None] > 0, changes / values[:, None], 0.0)
+
+        book_value += float(values.sum())
+        portfolios += len(row_of)
+        book_change += changes.sum(axis=0)
+        severe += (pct < SEVERE_LOSS).sum(axis=0)
+
+        chunk_ids = list(row_of)
+        for col, row in enumerate(pct.argmin(axis=0)):
+            if pct[row, col] < worst_pct[col]:
+                worst_pct[col] = pct[row, col]
+                worst_id[col] = chunk_ids[row]
+
+    return {
+        "portfolios": portfolios,
+        "book_value": round(book_value, 2),
+        "scenarios": [
+            {
+                "scenario": scenario["name"],
+                "description": scenario.get("description"),
+                "change_amount": round(float(book_change[col]), 2),
+                "change_percent": float(book_change[col] / book_value) if book_value else 0.0,
+                "projected_value": round(book_value + float(book_change[col]), 2),
+                "worst_portfolio_change_percent": float(worst_pct[col]) if worst_id[col] else None,
+                "worst_portfolio_id": worst_id[col],
+                "portfolios_losing_over_20_percent": int(severe[col]),
+            }
+            for col, scenario in enumerate(scenarios)
+        ],
+    }
@@ -0,0 +1,154 @@
+"""
+Corporate treasury analytics: runway, burn multiple, cash-zero date and forward cash projections.
+
+Monthly model: revenue compounds at revenue_growth and expenses at burn_change per month, and
+cash moves by revenue - expenses each month. A scenario sweep evaluates every
+(revenue_growth, burn_change) pair of a grid as one growth x burn x months array.
+Rates are monthly fractions (0.05 = 5% a month).
+"""
+import math
+from datetime import date, timedelta
+
+import numpy as np
+
+DEFAULT_MONTHS = 24
+MAX_MONTHS = 120
+DAYS_PER_MONTH = 365.25 / 12
+
+
+def monthly_net_burn(annual_revenue, monthly_expenses):
+    """Cash consumed per month at today's run rate (negative when revenue covers expenses)."""
+    return monthly_expenses - annual_revenue / 12
+
+
+def static_runway(cash_balance, annual_revenue, monthly_expenses):
+    """Months of cash at today's burn; None when the company is not burning cash."""
+    burn = monthly_net_burn(annual_revenue, monthly_expenses)
+    if burn <= 0:
+        return None
+    return max(cash_balance, 0.0) / burn
+
+
+def burn_multiple(annual_revenue, monthly_expenses, revenue_growth):
+    """
+    Net burn per dollar of net new ARR, with net new ARR taken from the monthly growth rate.
+    0 when not burning; None when burning without revenue growth (unbounded).
+    """
+    burn = monthly_net_burn(annual_revenue, monthly_expenses)
+    if burn <= 0:
+        return 0.0
+    net_new_arr = annual_revenue * revenue_growth
+    if net_new_arr <= 0:
+        return None
+    return burn / net_new_arr
+
+
+def apply_runway(user_data):
+    """Set the materialized runway_months on a UserData row before it is saved."""
+    user_data.runway_months = static_runway(
+        user_data.cash_balance or 0.0, user_data.revenue or 0.0, user_data.expenses or 0.0
+    )
+    return user_data
+
+
+def _rates(values, name):
+    rates = np.atleast_1d(np.asarray(values, dtype=float))
+    if rates.ndim != 1 or not np.all(np.isfinite(rates)) or np.any(rates <= -1):
+        raise ValueError(f"{name} must be finite monthly rates above -1")
+    return rates
+
+
+def cash_paths(cash_balance, annual_revenue, monthly_expenses, revenue_growth, burn_change, months):
+    """
+    Monthly revenue (growth x months), expenses (burn x months) and end-of-month cash
+    (growth x burn x months) for every pair of revenue_growth and burn_change rates.
+    """
+    if not 1 <= months <= MAX_MONTHS:
+        raise ValueError(f"months must be between 1 and {MAX_MONTHS}")
+    growth = _rates(revenue_growth, "revenue_growth")
+    burn = _rates(burn_change, "burn_change")
+    t = np.arange(months)
+    revenue = (annual_revenue / 12) * (1 + growth)[:, None] ** t
+    expenses = monthly_expenses * (1 + burn)[:, None] ** t
+    cash = cash_balance + np.cumsum(revenue[:, None, :] - expenses[None, :, :], axis=-1)
+    return revenue, expenses, cash
+
+
+def cash_zero_months(cash_balance, cash):
+    """
+    Months until cash first drops below zero along the last axis, interpolated within that
+    month; NaN where it lasts the whole horizon.
+    """
+    below = cash < 0
+    first = below.argmax(axis=-1)[..., None]
+    opening = np.concatenate([np.full(cash.shape[:-1] + (1,), float(cash_balance)), cash[..., :-1]], axis=-1)
+    before = np.take_along_axis(opening, first, axis=-1)[..., 0]
+    after = np.take_along_axis(cash, first, axis=-1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(before > 0, before / (before - after), 0.0)
+    return np.where(below.any(axis=-1), first[..., 0] + fraction, np.nan)
+
+
+def cash_zero_date(months, today=None):
+    """Calendar date `months` from today, or None for no (or an unbounded) runway."""
+    if months is None or not math.isfinite(months):
+        return None
+    return (today or date.today()) + timedelta(days=months * DAYS_PER_MONTH)
+
+
+def _optional(value, digits=2):
+    return None if value is None or not math.isfinite(value) else round(float(value), digits)
+
+
+def _date_text(months, today):
+    day = cash_zero_date(months, today)
+    return day.isoformat() if day else None
+
+
+def forecast(cash_balance, annual_revenue, monthly_expenses, revenue_growth=0.0, burn_change=0.0,
+             months=DEFAULT_MONTHS, growth_grid=(), burn_grid=(), today=None):
+    """
+    Treasury summary and month-by-month projection for the base (revenue_growth, burn_change)
+    scenario, plus runway, ending cash and cash-zero date over the growth_grid x burn_grid sweep
+    when both grids are given. Raises ValueError on rates at or below -100% or a bad horizon.
+    """
+    today = today or date.today()
+    revenue, expenses, cash = cash_paths(cash_balance, annual_revenue, monthly_expenses, revenue_growth, burn_change, months)
+    revenue, expenses, cash = revenue[0], expenses[0], cash[0, 0]
+    projected = float(cash_zero_months(cash_balance, cash))
+    runway = static_runway(cash_balance, annual_revenue, monthly_expenses)
+
+    result = {
+        "summary": {
+            "monthly_net_burn": round(monthly_net_burn(annual_revenue, monthly_expenses), 2),
+            "runway_months": _optional(runway),
+            "projected_runway_months": _optional(projected),  # None: cash lasts the whole horizon
+            "cash_zero_date": _date_text(projected, today),
+            "burn_multiple": _optional(burn_multiple(annual_revenue, monthly_expenses, revenue_growth)),
+            "ending_cash": round(float(cash[-1]), 2),
+        },
+        "projection": [
+            {
+                "month": month + 1,
+                "revenue": round(r, 2),
+                "expenses": round(e, 2),
+                "net_cash_flow": round(r - e, 2),
+                "cash": round(c, 2),
+            }
+            for month, (r, e, c) in enumerate(zip(revenue.tolist(), expenses.tolist(), cash.tolist()))
+        ],
+        "grid": None,
+    }
+
+    if len(growth_grid) and len(burn_grid):
+        _, _, grid_cash = cash_paths(cash_balance, annual_revenue, monthly_expenses, growth_grid, burn_grid, months)
+        grid_runway = cash_zero_months(cash_balance, grid_cash)
+        result["grid"] = {
+            "revenue_growth": [float(g) for g in growth_grid],
+            "burn_change": [float(b) for b in burn_grid],
+            # Rows follow revenue_growth, columns burn_change
+            "runway_months": [[_optional(m) for m in row] for row in grid_runway.tolist()],
+            "cash_zero_date": [[_date_text(m, today) for m in row] for row in grid_runway.tolist()],
+            "ending_cash": np.round(grid_cash[..., -1], 2).tolist(),
+        }
+    return result
@@ -0,0 +1,117 @@
+from sqlalchemy import case, func, or_, select
+
+from ..db import database, models
+
+NOTIFICATIONS = "notifications"
+INVESTMENT_REQUESTS = "investment_requests"
+
+
+def _column(kind):
+    return getattr(models.UnreadCounter, kind)
+
+
+def inbox_filter(user_id, email):
+    """A startup's investment request inbox: requests linked by owner email or by user id."""
+    return or_(
+        models.InvestmentRequest.startup_owner == email,
+        models.InvestmentRequest.startup_user_id == user_id
+    )
+
+
+def _source_counts(user_id, email):
+    """Unread totals counted from the source tables, as scalar subqueries."""
+    return {
+        NOTIFICATIONS: select(func.count()).select_from(models.Notification).where(
+            models.Notification.receiver_email == email,
+            models.Notification.read == False
+        ).scalar_subquery(),
+        INVESTMENT_REQUESTS: select(func.count()).select_from(models.InvestmentRequest).where(
+            inbox_filter(user_id, email),
+            models.InvestmentRequest.is_read == False
+        ).scalar_subquery(),
+    }
+
+
+def _insert_counted(db, user_id, email, on_conflict=None):
+    """
+    INSERT the user's counter row from the source tables. On conflict (another writer created
+    it first) apply `on_conflict` to the existing row, or leave it alone when None.
+    """
+    Counter = models.UnreadCounter
+    insert = database.dialect_insert(db)(Counter).values(user_id=user_id, **_source_counts(user_id, email))
+    if on_conflict is None:
+        insert = insert.on_conflict_do_nothing(index_elements=[Counter.user_id])
+    else:
+        insert = insert.on_conflict_do_update(index_elements=[Counter.user_id], set_=on_conflict)
+    db.execute(insert)
+
+
+def _adjust(db, user_id, kind, value):
+    """
+    Set a counter to `value` (an expression over its current value) inside the caller's transaction.
+    The common case is one UPDATE. Without a row it is created from the source tables, which
+    already reflect the caller's change (flushed first), with an upsert: if a concurrent reconcile
+    created the row meanwhile without seeing that change, the adjustment lands on its row instead.
+    """
+    col = _column(kind)
+    updated = db.query(models.UnreadCounter).filter(
+        models.UnreadCounter.user_id == user_id
+    ).update({col: value}, synchronize_session=False)
+    if updated:
+        return
+    db.flush()
+    email = select(models.User.email).where(models.User.id == user_id).scalar_subquery()
+    _insert_counted(db, user_id, email, on_conflict={kind: value})
+
+
+def increment(db, user_id, kind, amount=1):
+    """
+    Bump a user's unread counter (n = n + amount) inside the caller's transaction.
+    Call after adding the new row, so a counter created here counts it.
+    """
+    if not user_id or amount <= 0:
+        return
+    col = _column(kind)
+    _adjust(db, user_id, kind, col + amount)
+
+
+def decrement(db, user_id, kind, amount=1):
+    """
+    Lower a user's unread counter inside the caller's transaction, never below zero
+    (MAX(n - amount, 0), spelled portably). Call after marking the rows read.
+    """
+    if not user_id or amount <= 0:
+        return
+    col = _column(kind)
+    _adjust(db, user_id, kind, case((col > amount, col - amount), else_=0))
+
+
+def invalidate(db, user_ids=None, emails=None):
+    """Drop counter rows so they are recounted from the source tables on next read."""
+    query = db.query(models.UnreadCounter)
+    if emails:
+        user_ids = list(user_ids or []) + [
+            row[0] for row in db.query(models.User.id).filter(models.User.email.in_(emails)).all()
+        ]
+    if not user_ids:
+        return
+    query.filter(models.UnreadCounter.user_id.in_(user_ids)).delete(synchronize_session=False)
+
+
+def reconcile(db, user):
+    """
+    Build a user's missing counter row from the source tables and commit it.
+    Insert-only (ON CONFLICT DO NOTHING): a row that exists already came from a writer that
+    saw at least as much, so a count taken here never overwrites it.
+    """
+    _insert_counted(db, user.id, user.email)
+    db.commit()
+    return db.get(models.UnreadCounter, user.id, populate_existing=True)
+
+
+def get_count(db, user, kind):
+    """Single primary-key lookup on the hot path; rebuilds the row only when it is missing."""
+    counter = db.get(models.UnreadCounter, user.id)
+    if counter is None:
+        counter = reconcile(db, user)
+    return getattr(counter, kind) or 0
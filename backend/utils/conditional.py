@@ -0,0 +1,36 @@
+import hashlib
+
+from fastapi import Request, Response
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts):
+    """Weak ETag from whatever identifies the payload version (ids, updated_at, counts)."""
+    digest = hashlib.blake2b("|".join(str(p) for p in parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _strip_weak(tag):
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def not_modified(request: Request, etag):
+    """
+    Return a 304 response if the client's If-None-Match already matches etag, else None.
+    Uses weak comparison, as RFC 9110 requires for If-None-Match.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    wanted = _strip_weak(etag)
+    for candidate in header.split(","):
+        if candidate.strip() == "*" or _strip_weak(candidate) == wanted:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
+
+def set_etag(response: Response, etag):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -2,6 +2,9 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 def send_connection_email(to_email: str, investor_email: str, message: str):
     """
@@ -29,10 +32,7 @@ def send_connection_email(to_email: str, investor_email: str, message: str):
 
     if not all([smtp_server, smtp_port, smtp_user, smtp_pass]):
         # Fallback: Log to console if no SMTP config
-        print(f"--- [MOCK EMAIL] To: {to_email} ---")
-        print(f"Subject: {subject}")
-        print(body)
-        print("-------------------------------------")
+        logger.info("mock email", extra={"to": to_email, "subject": subject, "body": body})
         return True
 
     try:
@@ -48,9 +48,9 @@ def send_connection_email(to_email: str, investor_email: str, message: str):
         text = msg.as_string()
         server.sendmail(smtp_user, to_email, text)
         server.quit()
-        print(f"Email sent to {to_email}")
+        logger.info("email sent", extra={"to": to_email})
         return True
-    except Exception as e:
-        print(f"Failed to send email: {e}")
+    except Exception:
+        logger.exception("email send failed", extra={"to": to_email})
         # We don't want to crash the request if email fails, just log it.
         return False
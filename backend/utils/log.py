@@ -0,0 +1,171 @@
+"""
+Structured logging for the backend.
+
+Every module logs through `logging.getLogger(__name__)`. setup_logging() routes the
+`backend` logger tree through a QueueHandler, so request threads only enqueue records;
+a single QueueListener thread formats them as JSON lines and writes to stdout.
+
+Environment:
+  LOG_LEVEL        minimum level (default INFO); DEBUG records are dropped before formatting
+  LOG_SAMPLE_RATE  fraction of requests whose DEBUG/INFO records are kept (default 1.0).
+                   Sampling is per request id, so a sampled request keeps all of its lines.
+                   WARNING and above are always kept.
+"""
+import atexit
+import contextvars
+import copy
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import uuid
+from datetime import datetime, timezone
+
+ROOT_LOGGER = "backend"
+REQUEST_ID_HEADER = "X-Request-ID"
+
+_request_id = contextvars.ContextVar("request_id", default=None)
+_listener = None
+
+# Attributes every LogRecord has; anything else came in through `extra=` and is a structured field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+def get_request_id():
+    return _request_id.get()
+
+
+def new_request_id(incoming=None):
+    """The caller's request id if it sent a sane one, else a fresh one."""
+    return incoming if incoming and len(incoming) <= 128 else uuid.uuid4().hex
+
+
+def _sampled(request_id, rate):
+    if rate >= 1 or request_id is None:
+        return True
+    bucket = int.from_bytes(hashlib.blake2b(request_id.encode(), digest_size=4).digest(), "big")
+    return bucket < rate * 0xFFFFFFFF
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps the current request id on each record and applies per-request sampling."""
+
+    def __init__(self, sample_rate=1.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record):
+        # Runs in the caller's thread, where the request's context is visible
+        record.request_id = _request_id.get()
+        return record.levelno >= logging.WARNING or _sampled(record.request_id, self.sample_rate)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Keeps records structured on their way through the queue. The stock prepare() folds the
+    traceback into msg; we only resolve the message and render the traceback to text (so
+    the record holds no frames), leaving the JSON formatting to the listener thread.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_traceback_formatter = logging.Formatter()
+
+
+def setup_logging(level=None, sample_rate=None, stream=None):
+    """Idempotent; called once at app startup (and by scripts that want service logs)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    sample_rate = float(sample_rate if sample_rate is not None else os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    records = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(RequestContextFilter(sample_rate))
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(level)
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware: gives every request an id (the caller's X-Request-ID if present),
+    exposes it to log records through a context variable and echoes it on the response.
+    Plain ASGI rather than BaseHTTPMiddleware so streaming responses are untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        incoming = None
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                incoming = value.decode("latin-1")
+                break
+        request_id = new_request_id(incoming)
+        token = _request_id.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _request_id.reset(token)
@@ -0,0 +1,165 @@
+"""
+Per-route request latency and DB query instrumentation.
+
+MetricsMiddleware times every HTTP request; SQLAlchemy cursor events count the queries and
+query time of the request that issued them (tracked in a contextvar, which FastAPI copies
+into the threadpool that runs sync endpoints). Each response gets a Server-Timing header,
+and render() produces Prometheus text format for GET /metrics.
+
+Metrics are per process; with several workers, scrape each one.
+"""
+import bisect
+import contextvars
+import threading
+import time
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+UNMATCHED_ROUTE = "unmatched"  # 404s etc.; raw paths would make label cardinality unbounded
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a label tuple. Thread-safe."""
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {series[-1]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route.",
+    ("method", "route", "status"), LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "db_queries_per_request", "SQL statements issued per request, by route.",
+    ("method", "route"), QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    "db_query_duration_seconds_per_request", "Total SQL time per request, by route.",
+    ("method", "route"), LATENCY_BUCKETS
+)
+HISTOGRAMS = (REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_TIME)
+
+
+def render():
+    """All metrics in Prometheus text exposition format."""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+def instrument_engine(engine):
+    """Attach query counting/timing hooks to an engine. Queries outside a request are ignored."""
+
+    # The start time lives on the statement's execution context, so a statement that fails
+    # (no after_cursor_execute) leaves nothing behind on the pooled connection
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_start", None)
+        stats = _current.get()
+        if stats is not None and started is not None:
+            stats.queries += 1
+            stats.db_seconds += time.perf_counter() - started
+
+
+def _route_label(scope):
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, query count and query time per request, and
+    sending them back as `Server-Timing: app;dur=..., db;dur=...;desc="N queries"`.
+    For streaming responses the header reflects the time to the first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'app;dur={elapsed_ms:.1f}, '
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = _route_label(scope)
+            method = scope.get("method", "")
+            REQUEST_LATENCY.observe((method, route, str(status)), elapsed)
+            REQUEST_QUERIES.observe((method, route), stats.queries)
+            REQUEST_DB_TIME.observe((method, route), stats.db_seconds)
+            _current.reset(token)
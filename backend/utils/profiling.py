@@ -0,0 +1,172 @@
+"""
+Opt-in sampling profiler for reproducing slow endpoints in place.
+
+An admin starts a session for one route (see routers/admin.py). ProfilingMiddleware then
+marks a sample_rate fraction of that route's requests; while any marked request is in flight
+a background thread snapshots the stacks of busy threads every interval and aggregates them
+as folded stacks ("frame;frame;frame count"), the input format of flamegraph.pl and speedscope.
+
+With no session the middleware costs one attribute check per request and no thread runs.
+Attribution is by time, not by thread: stacks of every busy thread are sampled while a marked
+request runs, so profile under a single worker with little concurrent traffic.
+"""
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from starlette.routing import compile_path
+
+DEFAULT_INTERVAL = 0.005
+DEFAULT_MAX_REQUESTS = 100
+MAX_STACK_DEPTH = 128
+
+# Leaf frames of threads that are parked, not working
+_IDLE_LEAVES = {
+    ("threading", "wait"), ("threading", "_wait_for_tstate_lock"), ("queue", "get"),
+    ("selectors", "select"), ("asyncio.base_events", "_run_once"),
+}
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _fold(frame):
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _is_idle(frame):
+    return (frame.f_globals.get("__name__"), frame.f_code.co_name) in _IDLE_LEAVES
+
+
+class ProfilingSession:
+    def __init__(self, path, method, sample_rate, interval, max_requests):
+        self.path = path
+        self._path_regex = compile_path(path)[0]
+        self.method = method
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.max_requests = max_requests
+        self.started_at = time.time()
+        self.requests_seen = 0
+        self.requests_profiled = 0
+        self.samples = 0
+        self.stacks = Counter()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._busy = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    @property
+    def active(self):
+        return not self._stopped.is_set() and self.requests_profiled < self.max_requests
+
+    def matches(self, scope):
+        return scope.get("method") == self.method and self._path_regex.match(scope["path"]) is not None
+
+    def begin(self):
+        """Called for a matching request; returns True if this one is sampled."""
+        with self._lock:
+            self.requests_seen += 1
+            if not self.active or random.random() >= self.sample_rate:
+                return False
+            self.requests_profiled += 1
+            self._in_flight += 1
+            self._busy.set()
+            return True
+
+    def end(self):
+        with self._lock:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._busy.clear()
+
+    def stop(self):
+        self._stopped.set()
+        self._busy.set()  # Wake the sampler so it can exit
+        self._thread.join(timeout=1)
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while True:
+            self._busy.wait()
+            if self._stopped.is_set():
+                return
+            for ident, frame in sys._current_frames().items():
+                if ident == own or _is_idle(frame):
+                    continue
+                stack = _fold(frame)
+                with self._lock:
+                    self.stacks[stack] += 1
+                    self.samples += 1
+            time.sleep(self.interval)
+
+    def folded(self):
+        with self._lock:
+            return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def status(self):
+        return {
+            "route": self.path,
+            "method": self.method,
+            "sample_rate": self.sample_rate,
+            "interval_ms": self.interval * 1000,
+            "max_requests": self.max_requests,
+            "requests_seen": self.requests_seen,
+            "requests_profiled": self.requests_profiled,
+            "samples": self.samples,
+            "distinct_stacks": len(self.stacks),
+            "active": self.active,
+            "started_at": self.started_at,
+        }
+
+
+_session = None
+
+
+def get_session():
+    return _session
+
+
+def start_session(app, path, method="GET", sample_rate=1.0, interval=DEFAULT_INTERVAL, max_requests=DEFAULT_MAX_REQUESTS):
+    """Replace any running session. Raises ValueError if the app declares no such path template and method."""
+    global _session
+    if method.lower() not in app.openapi().get("paths", {}).get(path, {}):
+        raise ValueError(f"No route {method} {path}")
+    stop_session()
+    _session = ProfilingSession(path, method, sample_rate, interval, max_requests)
+    return _session
+
+
+def stop_session():
+    """Stop sampling; the stopped session is returned so its results can still be read."""
+    global _session
+    session, _session = _session, None
+    if session is not None:
+        session.stop()
+    return session
+
+
+class ProfilingMiddleware:
+    """ASGI middleware; a pass-through unless a session is running."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        session = _session
+        if session is None or scope["type"] != "http" or not session.matches(scope) or not session.begin():
+            return await self.app(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            session.end()
@@ -34,12 +34,34 @@ export default function NotificationBell() {
         }
     }, []);
 
-    // Poll every 10 seconds
+    // Live push over server-sent events; slow polling only as a resync fallback
     useEffect(() => {
         if (!user) return;
         fetchNotifications();
-        const interval = setInterval(fetchNotifications, 10_000);
-        return () => clearInterval(interval);
+        const interval = setInterval(fetchNotifications, 60_000);
+
+        const token = localStorage.getItem('token');
+        let source: EventSource | null = null;
+        if (token && typeof EventSource !== 'undefined') {
+            source = new EventSource(
+                `http://localhost:8000/notifications/stream?access_token=${encodeURIComponent(token)}`
+            );
+            source.addEventListener('notification', (e) => {
+                try {
+                    const n: Notification = JSON.parse((e as MessageEvent).data);
+                    setNotifications((prev) =>
+                        prev.some((p) => p.id === n.id) ? prev : [n, ...prev]
+                    );
+                } catch {
+                    // Ignore malformed events
+                }
+            });
+        }
+
+        return () => {
+            clearInterval(interval);
+            source?.close();
+        };
     }, [user, fetchNotifications]);
 
     // Close dropdown on outside click
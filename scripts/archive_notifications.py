@@ -0,0 +1,28 @@
+import sys
+import os
+import argparse
+sys.path.append(os.getcwd())
+from backend.db import models, database
+from backend.services import notification_retention
+from backend.utils import log
+
+def archive(days, batch_size, max_batches):
+    log.setup_logging()  # Per-batch progress is logged by the service
+    models.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    try:
+        print(f"Archiving read notifications older than {days} days...")
+        moved = notification_retention.archive_read_notifications(
+            db, older_than_days=days, batch_size=batch_size, max_batches=max_batches
+        )
+        print(f"Done. {moved} notifications archived.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move old read notifications to notifications_archive")
+    parser.add_argument("--days", type=int, default=notification_retention.DEFAULT_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=notification_retention.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+    archive(args.days, args.batch_size, args.max_batches)
@@ -0,0 +1,63 @@
+import sys
+import os
+import json
+import logging
+sys.path.append(os.getcwd())
+from backend.db import models, database
+from backend.services import portfolio_engine, portfolio_store
+from backend.utils import log
+
+BATCH_SIZE = 500
+REQUIRED_KEYS = ("asset", "percent", "amount")
+
+logger = logging.getLogger("backend.scripts.backfill_portfolio_allocations")
+
+def legacy_lines(raw):
+    """Allocation lines from a legacy blob, or None if it is not a readable list of lines."""
+    try:
+        lines = json.loads(raw)
+    except ValueError:
+        return None
+    if lines is None:
+        return []
+    if not isinstance(lines, list) or not all(
+        isinstance(line, dict) and all(key in line for key in REQUIRED_KEYS) for line in lines
+    ):
+        return None
+    return lines
+
+def backfill():
+    """Convert legacy allocation_json blobs into portfolio_allocations rows. Unreadable blobs are left in place."""
+    log.setup_logging()
+    models.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    converted = skipped = 0
+    last_id = None
+    try:
+        while True:
+            # Keyset by id: skipped rows keep their allocation_json and would otherwise match forever
+            query = db.query(models.UserPortfolio).filter(models.UserPortfolio.allocation_json.isnot(None))
+            if last_id is not None:
+                query = query.filter(models.UserPortfolio.id > last_id)
+            portfolios = query.order_by(models.UserPortfolio.id).limit(BATCH_SIZE).all()
+            if not portfolios:
+                break
+            last_id = portfolios[-1].id
+            for portfolio in portfolios:
+                lines = legacy_lines(portfolio.allocation_json)
+                if lines is None:
+                    logger.warning("unreadable legacy allocation left in place", extra={"portfolio_id": portfolio.id})
+                    skipped += 1
+                    continue
+                for line in lines:
+                    line.setdefault("asset_class", portfolio_engine.asset_class_of(line.get("asset")))
+                portfolio_store.set_allocations(portfolio, portfolio.monthly_investment, lines)
+                converted += 1
+            db.commit()
+            print(f"Converted {converted} portfolios ({skipped} skipped)...")
+        print(f"Done. {converted} portfolios now use structured allocations; {skipped} unreadable ones left as they were.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    backfill()
@@ -0,0 +1,17 @@
+import sys
+import os
+sys.path.append(os.getcwd())
+from backend.db import database
+from backend.services import ranking_engine
+
+def refresh():
+    db = database.SessionLocal()
+    try:
+        print("Recomputing fundability scores for all startups...")
+        updated = ranking_engine.refresh_scores(db)
+        print(f"Done. {updated} startups scored.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    refresh()
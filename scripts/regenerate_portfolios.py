@@ -0,0 +1,42 @@
+import sys
+import os
+import argparse
+sys.path.append(os.getcwd())
+from backend.db import models, database
+from backend.services import portfolio_rebuild
+
+def regenerate(batch_size, checkpoint, rebuild_all):
+    models.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+
+    start_after = None
+    if checkpoint and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            start_after = f.read().strip() or None
+        print(f"Resuming after user_data id {start_after}")
+
+    def report(processed, rebuilt, last_id):
+        print(f"Processed {processed} profiles, rebuilt {rebuilt} portfolios...")
+        if checkpoint:
+            with open(checkpoint, "w") as f:
+                f.write(last_id)
+
+    try:
+        print(f"{portfolio_rebuild.stale_portfolio_count(db)} portfolios predate the current templates.")
+        processed, rebuilt = portfolio_rebuild.regenerate_portfolios(
+            db, batch_size=batch_size, start_after=start_after, only_stale=not rebuild_all, progress=report
+        )
+        print(f"Done. {processed} profiles processed, {rebuilt} portfolios rebuilt.")
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild every portfolio from the current allocation templates")
+    parser.add_argument("--batch-size", type=int, default=portfolio_rebuild.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--checkpoint", default="regenerate_portfolios.checkpoint",
+                        help="File recording the last processed id; an interrupted run resumes from it")
+    parser.add_argument("--all", action="store_true", help="Also rebuild portfolios already on the current template version")
+    args = parser.parse_args()
+    regenerate(args.batch_size, args.checkpoint, args.all)
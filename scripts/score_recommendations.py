@@ -0,0 +1,30 @@
+import sys
+import os
+import csv
+import argparse
+sys.path.append(os.getcwd())
+from backend.db import database
+from backend.services import recommendation_engine
+
+def score(output, batch_size):
+    db = database.SessionLocal()
+    scored = 0
+    try:
+        with open(output, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("user_id",) + recommendation_engine.RECOMMENDATION_FIELDS)
+            for user_ids, batch in recommendation_engine.iter_user_scores(db, batch_size=batch_size):
+                columns = [batch[field].tolist() for field in recommendation_engine.RECOMMENDATION_FIELDS]
+                writer.writerows(zip(user_ids, *columns))
+                scored += len(user_ids)
+                print(f"Scored {scored} users...")
+        print(f"Done. {scored} users written to {output}.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nightly recommendation report for every job user")
+    parser.add_argument("--output", default="recommendations.csv")
+    parser.add_argument("--batch-size", type=int, default=recommendation_engine.DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    score(args.output, args.batch_size)
@@ -0,0 +1,70 @@
+import copy
+import json
+import os
+import tempfile
+
+from backend.services import portfolio_engine
+
+# In-process: the template file is read by the engine, not served over HTTP
+with open(portfolio_engine.DEFAULT_TEMPLATES_PATH) as f:
+    SHIPPED = json.load(f)
+
+def templates(**changes):
+    data = copy.deepcopy(SHIPPED)
+    data.update(changes)
+    return data
+
+def test_template_must_sum_to_100():
+    data = templates()
+    data["templates"]["high"][0]["percent"] = 50
+    try:
+        portfolio_engine.TemplateRegistry(data)
+    except ValueError as e:
+        assert "'high' sums to 90%" in str(e), e
+    else:
+        raise AssertionError("a template summing to 90% was accepted")
+
+def test_unknown_default_template():
+    try:
+        portfolio_engine.TemplateRegistry(templates(default="aggressive"))
+    except ValueError as e:
+        assert "'aggressive'" in str(e), e
+    else:
+        raise AssertionError("an undefined default template was accepted")
+
+def test_shipped_templates_load():
+    registry = portfolio_engine.TemplateRegistry(SHIPPED)
+    assert registry.version == SHIPPED["version"]
+    # Unknown risk tolerances fall back to the default; startups get their own template
+    assert registry.resolve("reckless") is registry.templates[SHIPPED["default"]]
+    assert registry.resolve("high", user_type="startup") is registry.templates["startup"]
+    lines = registry.resolve("moderate").scale(1000)
+    assert sum(line["amount"] for line in lines) == 1000
+
+def test_version_bump_reloads_templates():
+    bumped = templates(version=SHIPPED["version"] + 1)
+    bumped["templates"]["low"] = [
+        {"asset": "Treasury Bills", "asset_class": "cash", "percent": 100, "color": "#3B82F6"}
+    ]
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(bumped, f)
+    original_path = portfolio_engine.TEMPLATES_PATH
+    try:
+        portfolio_engine.TEMPLATES_PATH = f.name
+        portfolio_engine.reload_templates()
+        assert portfolio_engine.template_version() == SHIPPED["version"] + 1
+        lines = portfolio_engine.build_allocations(500, "low")
+        assert [(line["asset"], line["amount"]) for line in lines] == [("Treasury Bills", 500)]
+        assert portfolio_engine.asset_class_of("Treasury Bills") == "cash"
+    finally:
+        portfolio_engine.TEMPLATES_PATH = original_path
+        portfolio_engine.reload_templates()
+        os.unlink(f.name)
+    assert portfolio_engine.template_version() == SHIPPED["version"]
+
+if __name__ == "__main__":
+    test_template_must_sum_to_100()
+    test_unknown_default_template()
+    test_shipped_templates_load()
+    test_version_bump_reloads_templates()
+    print("Allocation template tests passed.")
@@ -0,0 +1,84 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_bulk_read():
+    print("--- Starting Bulk Mark-Read Verification ---")
+
+    startup_email, startup_pass = create_user("startup_bulk")
+    st_token, st_id = login(startup_email, startup_pass)
+    st_headers = {"Authorization": f"Bearer {st_token}"}
+
+    # Three investors each send one request
+    investor_headers = []
+    for i in range(3):
+        email, password = create_user(f"investor_bulk{i}")
+        token, _ = login(email, password)
+        headers = {"Authorization": f"Bearer {token}"}
+        investor_headers.append(headers)
+        resp = requests.post(f"{BASE_URL}/invest/connect", json={
+            "startupId": st_id,
+            "message": f"Request {i}"
+        }, headers=headers)
+        assert resp.json()["success"] == True
+
+    msgs = requests.get(f"{BASE_URL}/invest/requests", headers=st_headers).json()
+    assert len(msgs) == 3
+    assert all(m["is_read"] == False for m in msgs)
+
+    # 1. Mark a subset by id
+    first_id = msgs[0]["id"]
+    resp = requests.post(f"{BASE_URL}/invest/read-bulk", json={"ids": [first_id]}, headers=st_headers)
+    assert resp.json()["updated"] == 1
+
+    # 2. Mark everything else in one call
+    resp = requests.post(f"{BASE_URL}/invest/read-bulk", json={}, headers=st_headers)
+    assert resp.json()["updated"] == 2
+
+    msgs = requests.get(f"{BASE_URL}/invest/requests", headers=st_headers).json()
+    assert all(m["is_read"] == True for m in msgs)
+    print("Investment requests bulk-marked read.")
+
+    # 3. Accepting creates notifications for the investors
+    for m in msgs:
+        requests.post(f"{BASE_URL}/invest/startup/requests/update", json={
+            "id": m["id"],
+            "action": "accept"
+        }, headers=st_headers)
+
+    inv_headers = investor_headers[0]
+    notifs = requests.get(f"{BASE_URL}/notifications/", headers=inv_headers).json()
+    assert len(notifs) == 1
+    assert notifs[0]["read"] == False
+
+    # 4. A cursor in the past matches nothing
+    resp = requests.post(f"{BASE_URL}/notifications/read-bulk", json={"before": "2000-01-01T00:00:00"}, headers=inv_headers)
+    assert resp.json()["updated"] == 0
+
+    resp = requests.post(f"{BASE_URL}/notifications/read-bulk", json={}, headers=inv_headers)
+    assert resp.json()["updated"] == 1
+
+    notifs = requests.get(f"{BASE_URL}/notifications/", headers=inv_headers).json()
+    assert notifs[0]["read"] == True
+    print("Notifications bulk-marked read.")
+
+    print("--- Verification PASSED: Bulk Mark-Read Works ---")
+
+if __name__ == "__main__":
+    try:
+        test_bulk_read()
+    except Exception as e:
+        print(f"FAILED: {e}")
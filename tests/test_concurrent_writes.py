@@ -0,0 +1,70 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_optimistic_concurrency():
+    print("--- Starting Optimistic Concurrency Verification ---")
+
+    email, password = create_user("cas_user")
+    token, _ = login(email, password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    version = requests.get(f"{BASE_URL}/auth/me", headers=headers).json()["data"]["version"]
+    assert version is not None
+
+    personal = {
+        "monthly_income": 5000,
+        "monthly_expenses": 2000,
+        "current_savings": 10000,
+        "monthly_investment": 400,
+    }
+
+    # 1. "Tab A" writes with the version it read
+    resp = requests.put(f"{BASE_URL}/finance/personal", json={**personal, "version": version}, headers=headers)
+    assert resp.status_code == 200, resp.text
+    new_version = resp.json()["data"]["version"]
+    assert new_version == version + 1
+
+    # 2. "Tab B" still holds the old version -> conflict, nothing clobbered
+    resp = requests.put(f"{BASE_URL}/finance/treasury", json={
+        "cash_balance": 1, "annual_revenue": 1, "monthly_expenses": 999,
+        "debt": 0, "other_assets": 0, "version": version
+    }, headers=headers)
+    assert resp.status_code == 409, resp.text
+    assert resp.json()["detail"]["current_version"] == new_version
+    assert requests.get(f"{BASE_URL}/finance/me", headers=headers).json()["monthly_expenses"] == 2000
+    print("Stale write rejected with 409.")
+
+    # 3. Same for the profile and investment endpoints
+    resp = requests.put(f"{BASE_URL}/auth/profile", json={"risk_tolerance": "high", "version": version}, headers=headers)
+    assert resp.status_code == 409
+    resp = requests.put(f"{BASE_URL}/finance/investment", json={"amount": 10, "version": version}, headers=headers)
+    assert resp.status_code == 409
+    resp = requests.put(f"{BASE_URL}/auth/update-investment", json={"monthly_investment": 10, "version": version}, headers=headers)
+    assert resp.status_code == 409
+
+    # 4. Clients that don't send a version keep last-write-wins behaviour
+    resp = requests.put(f"{BASE_URL}/finance/investment", json={"amount": 10}, headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["version"] == new_version + 1
+
+    print("--- Verification PASSED: Optimistic Concurrency Works ---")
+
+if __name__ == "__main__":
+    try:
+        test_optimistic_concurrency()
+    except Exception as e:
+        print(f"FAILED: {e}")
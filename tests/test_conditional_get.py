@@ -0,0 +1,76 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def check_revalidation(path, headers):
+    resp = requests.get(f"{BASE_URL}{path}", headers=headers)
+    assert resp.status_code == 200, resp.text
+    etag = resp.headers.get("ETag")
+    assert etag and etag.startswith('W/"'), f"{path} sent no weak ETag"
+
+    resp = requests.get(f"{BASE_URL}{path}", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 304, f"{path} should be 304, got {resp.status_code}"
+    assert resp.content == b""
+    return etag
+
+def test_conditional_get():
+    print("--- Starting Conditional GET Verification ---")
+
+    email, password = create_user("etag_user")
+    token, _ = login(email, password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    requests.put(f"{BASE_URL}/auth/profile", json={
+        "user_type": "job",
+        "monthly_income": 6000,
+        "monthly_expenses": 3000,
+        "monthly_investment": 500,
+        "risk_tolerance": "moderate"
+    }, headers=headers)
+
+    # 1. Every read-mostly endpoint revalidates to 304
+    paths = ["/finance/me", "/finance/job-plan", "/finance/treasury", "/portfolio/me", "/startups/my"]
+    etags = {path: check_revalidation(path, headers) for path in paths}
+    print("All endpoints answer 304 when unchanged.")
+
+    # 2. A write changes the ETag
+    requests.put(f"{BASE_URL}/finance/personal", json={
+        "monthly_income": 6500,
+        "monthly_expenses": 3000,
+        "current_savings": 1000,
+        "monthly_investment": 500
+    }, headers=headers)
+    resp = requests.get(f"{BASE_URL}/finance/me", headers={**headers, "If-None-Match": etags["/finance/me"]})
+    assert resp.status_code == 200
+    assert resp.json()["monthly_income"] == 6500
+    assert resp.headers["ETag"] != etags["/finance/me"]
+
+    # 3. Creating a startup invalidates /startups/my
+    requests.post(f"{BASE_URL}/startups/", json={
+        "name": "Etag Co", "revenue": 0, "burn": 0, "cash": 0, "growth": 0,
+        "team": 1, "runway": 0, "survival_score": 0
+    }, headers=headers)
+    resp = requests.get(f"{BASE_URL}/startups/my", headers={**headers, "If-None-Match": etags["/startups/my"]})
+    assert resp.status_code == 200
+    assert len(resp.json()) == 1
+
+    print("--- Verification PASSED: Conditional GET Works ---")
+
+if __name__ == "__main__":
+    try:
+        test_conditional_get()
+    except Exception as e:
+        print(f"FAILED: {e}")
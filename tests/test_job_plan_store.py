@@ -0,0 +1,77 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def get_plan(headers):
+    resp = requests.get(f"{BASE_URL}/finance/job-plan", headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/json")
+    return resp.json(), resp.headers["ETag"]
+
+def test_job_plan_store():
+    print("--- Starting Stored Job Plan Verification ---")
+
+    email, password = create_user("plan_user")
+    token, _ = login(email, password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = requests.put(f"{BASE_URL}/auth/profile", json={
+        "user_type": "job",
+        "monthly_income": 8000,
+        "monthly_expenses": 3000,
+        "risk_tolerance": "high"
+    }, headers=headers)
+    assert resp.status_code == 200, resp.text
+
+    # 1. The plan stored on the profile write matches the engine's output
+    plan, etag = get_plan(headers)
+    assert plan["monthly_income"] == 8000
+    assert plan["recommended_investment"] == 8000 * 0.25
+    assert plan["recommended_savings"] == 8000 * 0.10
+    assert "'high' risk profile" in plan["message"]
+
+    # 2. A profile write that leaves the plan's inputs alone keeps its ETag
+    resp = requests.put(f"{BASE_URL}/auth/profile", json={"investment_goal": "retirement"}, headers=headers)
+    assert resp.status_code == 200, resp.text
+    resp = requests.get(f"{BASE_URL}/finance/job-plan", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+
+    # 3. Changing an input through /finance/personal rebuilds the plan
+    resp = requests.put(f"{BASE_URL}/finance/personal", json={
+        "monthly_income": 10000,
+        "monthly_expenses": 4000,
+        "current_savings": 0,
+        "monthly_investment": 0
+    }, headers=headers)
+    assert resp.status_code == 200, resp.text
+    new_plan, new_etag = get_plan(headers)
+    assert new_etag != etag
+    assert new_plan["monthly_income"] == 10000
+    assert new_plan["recommended_investment"] == 10000 * 0.25
+    assert new_plan["monthly_expenses"] == 4000
+
+    # 4. Non-job users still get no plan
+    email, password = create_user("plan_startup")
+    token, _ = login(email, password)
+    startup_headers = {"Authorization": f"Bearer {token}"}
+    requests.put(f"{BASE_URL}/auth/profile", json={"user_type": "startup"}, headers=startup_headers)
+    resp = requests.get(f"{BASE_URL}/finance/job-plan", headers=startup_headers)
+    assert resp.status_code == 400
+
+    print("Stored job plan test passed.")
+
+if __name__ == "__main__":
+    test_job_plan_store()
@@ -0,0 +1,50 @@
+import requests
+import uuid
+import re
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_metrics():
+    print("--- Starting Metrics Verification ---")
+
+    email, password = create_user("metrics_user")
+    token, _ = login(email, password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 1. Server-Timing reports app time and the request's queries
+    resp = requests.get(f"{BASE_URL}/notifications/unread-count", headers=headers)
+    timing = resp.headers["Server-Timing"]
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', timing)
+    assert timing.startswith("app;dur=") and match, timing
+    assert int(match.group(1)) >= 1
+    print(f"Server-Timing: {timing}")
+
+    # 2. Prometheus exposition, labelled by route template rather than raw path
+    requests.delete(f"{BASE_URL}/startups/{uuid.uuid4()}", headers=headers)
+    requests.get(f"{BASE_URL}/no-such-page/{uuid.uuid4()}")
+    body = requests.get(f"{BASE_URL}/metrics").text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'route="/notifications/unread-count"' in body
+    assert 'db_queries_per_request_count{method="GET",route="/notifications/unread-count"}' in body
+    assert 'route="/startups/{startup_id}"' in body
+    assert 'route="unmatched"' in body
+
+    print("--- Verification PASSED: Metrics Work ---")
+
+if __name__ == "__main__":
+    try:
+        test_metrics()
+    except Exception as e:
+        print(f"FAILED: {e}")
@@ -0,0 +1,84 @@
+import requests
+import uuid
+import json
+import threading
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_notification_stream():
+    print("--- Starting Notification Push Verification ---")
+
+    startup_email, startup_pass = create_user("startup_push")
+    st_token, st_id = login(startup_email, startup_pass)
+    st_headers = {"Authorization": f"Bearer {st_token}"}
+
+    investor_email, investor_pass = create_user("investor_push")
+    inv_token, _ = login(investor_email, investor_pass)
+    inv_headers = {"Authorization": f"Bearer {inv_token}"}
+
+    # 1. Stream rejects anonymous clients
+    resp = requests.get(f"{BASE_URL}/notifications/stream", timeout=5)
+    assert resp.status_code == 401
+
+    # 2. Investor opens the stream (token as query param, like EventSource)
+    stream = requests.get(
+        f"{BASE_URL}/notifications/stream",
+        params={"access_token": inv_token},
+        stream=True,
+        timeout=20
+    )
+    assert stream.status_code == 200
+    assert stream.headers["content-type"].startswith("text/event-stream")
+
+    received = []
+
+    def listen():
+        event = None
+        for line in stream.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line.split(":", 1)[1].strip()
+            elif line.startswith("data:") and event == "notification":
+                received.append(json.loads(line.split(":", 1)[1]))
+                return
+
+    listener = threading.Thread(target=listen, daemon=True)
+    listener.start()
+
+    # 3. Startup accepts a request -> notification is pushed
+    requests.post(f"{BASE_URL}/invest/connect", json={
+        "startupId": st_id,
+        "message": "Push check"
+    }, headers=inv_headers)
+    request_id = requests.get(f"{BASE_URL}/invest/requests", headers=st_headers).json()[0]["id"]
+    requests.post(f"{BASE_URL}/invest/startup/requests/update", json={
+        "id": request_id,
+        "action": "accept"
+    }, headers=st_headers)
+
+    listener.join(timeout=10)
+    stream.close()
+
+    assert len(received) == 1, "No notification pushed"
+    assert received[0]["type"] == "investor_request_accepted"
+    assert received[0]["read"] == False
+    print(f"Pushed: {received[0]['message']}")
+
+    print("--- Verification PASSED: Notification Push Works ---")
+
+if __name__ == "__main__":
+    try:
+        test_notification_stream()
+    except Exception as e:
+        print(f"FAILED: {e}")
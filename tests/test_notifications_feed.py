@@ -0,0 +1,71 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_notifications_feed_pagination():
+    print("--- Starting Notifications Feed Verification ---")
+
+    investor_email, investor_pass = create_user("investor_feed")
+    inv_token, _ = login(investor_email, investor_pass)
+    inv_headers = {"Authorization": f"Bearer {inv_token}"}
+
+    # 1. Three startups accept the investor -> three notifications
+    for i in range(3):
+        email, password = create_user(f"startup_feed{i}")
+        st_token, st_id = login(email, password)
+        st_headers = {"Authorization": f"Bearer {st_token}"}
+        requests.post(f"{BASE_URL}/invest/connect", json={
+            "startupId": st_id,
+            "message": f"Feed {i}"
+        }, headers=inv_headers)
+        request_id = requests.get(f"{BASE_URL}/invest/requests", headers=st_headers).json()[0]["id"]
+        requests.post(f"{BASE_URL}/invest/startup/requests/update", json={
+            "id": request_id,
+            "action": "accept"
+        }, headers=st_headers)
+
+    # 2. First page
+    resp = requests.get(f"{BASE_URL}/notifications/", params={"limit": 2}, headers=inv_headers)
+    page1 = resp.json()
+    assert len(page1) == 2
+    cursor = resp.headers.get("X-Next-Cursor")
+    assert cursor, "Expected a next-page cursor"
+
+    # 3. Second page picks up exactly where the first stopped
+    resp = requests.get(f"{BASE_URL}/notifications/", params={"limit": 2, "cursor": cursor}, headers=inv_headers)
+    page2 = resp.json()
+    assert len(page2) == 1
+    assert "X-Next-Cursor" not in resp.headers
+    ids = [n["id"] for n in page1 + page2]
+    assert len(set(ids)) == 3
+    print("Keyset pages are complete and disjoint.")
+
+    # 4. Delta fetch since the newest item returns nothing new
+    newest = page1[0]["created_at"]
+    resp = requests.get(f"{BASE_URL}/notifications/", params={"since": newest}, headers=inv_headers)
+    assert resp.json() == []
+
+    # 5. Garbage cursors are rejected
+    resp = requests.get(f"{BASE_URL}/notifications/", params={"cursor": "nope"}, headers=inv_headers)
+    assert resp.status_code == 400
+
+    print("--- Verification PASSED: Notifications Feed Pagination Works ---")
+
+if __name__ == "__main__":
+    try:
+        test_notifications_feed_pagination()
+    except Exception as e:
+        print(f"FAILED: {e}")
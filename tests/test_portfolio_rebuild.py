@@ -0,0 +1,190 @@
+import copy
+import json
+import os
+import tempfile
+import uuid
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.db import database, models
+from backend.services import portfolio_engine, portfolio_rebuild
+
+# In-process against a scratch database: the rebuild is a batch job, not an endpoint
+with open(portfolio_engine.DEFAULT_TEMPLATES_PATH) as f:
+    SHIPPED = json.load(f)
+
+class Templates:
+    """Point the engine at a copy of the shipped templates with another version number."""
+
+    def __init__(self, version):
+        data = copy.deepcopy(SHIPPED)
+        data["version"] = version
+        self.file = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        json.dump(data, self.file)
+        self.file.close()
+
+    def __enter__(self):
+        self.original = portfolio_engine.TEMPLATES_PATH
+        portfolio_engine.TEMPLATES_PATH = self.file.name
+        portfolio_engine.reload_templates()
+        return self
+
+    def __exit__(self, *exc):
+        portfolio_engine.TEMPLATES_PATH = self.original
+        portfolio_engine.reload_templates()
+        os.unlink(self.file.name)
+
+def scratch_session():
+    path = os.path.join(tempfile.mkdtemp(), "rebuild.db")
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def add_user(db, user_type="job", monthly_investment=0.0, budget=0.0, risk="moderate"):
+    user = models.User(email=f"rebuild_{uuid.uuid4()}@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    db.add(models.UserData(
+        user_id=user.id, user_type=user_type, monthly_investment=monthly_investment,
+        budget=budget, risk_tolerance=risk,
+    ))
+    db.commit()
+    return user.id
+
+def portfolios(db):
+    """user_id -> (template_version, monthly_investment, [(position, asset, amount, allocation id)])"""
+    result = {}
+    for p in db.query(models.UserPortfolio).all():
+        lines = sorted(
+            (a.position, a.asset, a.amount, a.id)
+            for a in db.query(models.PortfolioAllocation).filter(models.PortfolioAllocation.portfolio_id == p.id)
+        )
+        result[p.user_id] = (p.template_version, p.monthly_investment, lines)
+    return result
+
+def assert_clean(db, expected_users):
+    """One portfolio per user, each with exactly its template's lines and no strays."""
+    counts = db.execute(text("SELECT user_id, COUNT(*) FROM user_portfolio GROUP BY user_id")).all()
+    assert sorted(user for user, _ in counts) == sorted(expected_users)
+    assert all(count == 1 for _, count in counts), counts
+    orphans = db.execute(text(
+        "SELECT COUNT(*) FROM portfolio_allocations a LEFT JOIN user_portfolio p ON p.id = a.portfolio_id WHERE p.id IS NULL"
+    )).scalar()
+    assert orphans == 0
+    for _, _, lines in portfolios(db).values():
+        assert [position for position, *_ in lines] == list(range(len(lines))), lines
+
+def test_stale_rows_rebuilt_and_current_rows_skipped():
+    db = scratch_session()
+    with Templates(1):
+        moderate = add_user(db, monthly_investment=1000)
+        low = add_user(db, monthly_investment=500, risk="low")
+        startup = add_user(db, user_type="startup", budget=10000)
+        no_amount = add_user(db)
+
+        processed, rebuilt = portfolio_rebuild.regenerate_portfolios(db)
+        assert (processed, rebuilt) == (4, 3)
+        assert_clean(db, [moderate, low, startup])
+        assert portfolio_rebuild.stale_portfolio_count(db) == 0
+        first = portfolios(db)
+        assert first[startup][1] == 10000 * portfolio_engine.STARTUP_INVESTMENT_SHARE
+        assert sum(amount for _, _, amount, _ in first[moderate][2]) == 1000
+
+    with Templates(2):
+        assert portfolio_rebuild.stale_portfolio_count(db) == 3
+        # Another writer already rebuilt this one from version 2
+        db.execute(text("UPDATE user_portfolio SET template_version = 2 WHERE user_id = :u"), {"u": moderate})
+        db.commit()
+
+        processed, rebuilt = portfolio_rebuild.regenerate_portfolios(db)
+        assert (processed, rebuilt) == (4, 2)
+        second = portfolios(db)
+        assert second[moderate][2] == first[moderate][2]  # skipped: same allocation rows
+        for user in (low, startup):
+            assert second[user][0] == 2
+            assert {line[3] for line in second[user][2]}.isdisjoint(line[3] for line in first[user][2])
+        assert_clean(db, [moderate, low, startup])
+        assert portfolio_rebuild.stale_portfolio_count(db) == 0
+    assert no_amount not in second
+    db.close()
+
+def test_portfolio_without_profile_amount_is_stamped():
+    db = scratch_session()
+    with Templates(1):
+        user = add_user(db, monthly_investment=800)
+        portfolio_rebuild.regenerate_portfolios(db)
+        # The profile amount goes away (e.g. the portfolio came from /portfolio/generate)
+        db.execute(text("UPDATE user_data SET monthly_investment = 0 WHERE user_id = :u"), {"u": user})
+        db.commit()
+
+    with Templates(2):
+        assert portfolio_rebuild.stale_portfolio_count(db) == 1
+        assert portfolio_rebuild.regenerate_portfolios(db) == (1, 1)
+        version, amount, lines = portfolios(db)[user]
+        assert (version, amount) == (2, 800)
+        assert sum(line_amount for _, _, line_amount, _ in lines) == 800
+        assert portfolio_rebuild.stale_portfolio_count(db) == 0
+        # Converged: nothing left to do
+        assert portfolio_rebuild.regenerate_portfolios(db) == (1, 0)
+    db.close()
+
+def test_resume_with_start_after():
+    db = scratch_session()
+    users = [add_user(db, monthly_investment=100 * (i + 1)) for i in range(5)]
+    checkpoints = []
+
+    class Interrupted(Exception):
+        pass
+
+    def stop_after_two(processed, rebuilt, last_id):
+        checkpoints.append(last_id)
+        if processed == 2:
+            raise Interrupted
+
+    with Templates(1):
+        try:
+            portfolio_rebuild.regenerate_portfolios(db, batch_size=1, progress=stop_after_two)
+        except Interrupted:
+            pass
+        assert len(portfolios(db)) == 2
+        assert portfolio_rebuild.regenerate_portfolios(db, batch_size=2, start_after=checkpoints[-1]) == (3, 3)
+        assert_clean(db, users)
+        assert portfolio_rebuild.stale_portfolio_count(db) == 0
+    db.close()
+
+def test_portfolio_created_mid_batch_is_upserted():
+    db = scratch_session()
+    user = add_user(db, monthly_investment=600)
+    original = database.dialect_insert
+
+    def racing_insert(session):
+        # A profile write creates the portfolio after the batch read which users had one
+        session.execute(text(
+            "INSERT INTO user_portfolio (id, user_id, monthly_investment) VALUES ('racer', :u, 600)"
+        ), {"u": user})
+        session.execute(text(
+            "INSERT INTO portfolio_allocations (id, portfolio_id, user_id, position, asset, percent, amount) "
+            "VALUES ('racer-line', 'racer', :u, 0, 'Old Line', 100, 600)"
+        ), {"u": user})
+        return original(session)
+
+    with Templates(1):
+        database.dialect_insert = racing_insert
+        try:
+            assert portfolio_rebuild.regenerate_portfolios(db) == (1, 1)
+        finally:
+            database.dialect_insert = original
+        assert_clean(db, [user])
+        version, amount, lines = portfolios(db)[user]
+        assert version == 1 and amount == 600
+        assert "Old Line" not in [asset for _, asset, _, _ in lines]
+        assert db.query(models.UserPortfolio).filter(models.UserPortfolio.user_id == user).one().id == "racer"
+    db.close()
+
+if __name__ == "__main__":
+    test_stale_rows_rebuilt_and_current_rows_skipped()
+    test_portfolio_without_profile_amount_is_stamped()
+    test_resume_with_start_after()
+    test_portfolio_created_mid_batch_is_upserted()
+    print("Portfolio rebuild tests passed.")
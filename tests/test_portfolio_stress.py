@@ -0,0 +1,103 @@
+import json
+import os
+import sqlite3
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+ADMIN_EMAIL = "admin@example.com"  # Server must run with ADMIN_EMAILS=admin@example.com
+# The server's database (same DATABASE_URL override as backend/db/database.py), for legacy rows the API can't create
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+DB_PATH = (
+    DATABASE_URL[len("sqlite:///"):] if DATABASE_URL.startswith("sqlite:///")
+    else os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend", "db", "app.db")
+)
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_portfolio_stress():
+    print("--- Starting Stress Test Verification ---")
+
+    email, password = create_user("stress_user")
+    token, user_id = login(email, password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # High risk: 90% equity, 10% crypto
+    requests.put(f"{BASE_URL}/auth/profile", json={
+        "user_type": "job",
+        "monthly_income": 8000,
+        "monthly_expenses": 4000,
+        "monthly_investment": 1000,
+        "risk_tolerance": "high"
+    }, headers=headers)
+
+    # 1. Default scenarios match the client-side shocks
+    results = {r["scenario"]: r for r in requests.get(f"{BASE_URL}/portfolio/stress", headers=headers).json()}
+    recession = results["Global Recession"]
+    assert abs(recession["change_percent"] - (-0.32)) < 1e-9
+    assert recession["projected_value"] == 680
+    print(f"Recession drawdown: {recession['change_percent']:.0%}")
+
+    # 2. Custom scenarios only
+    resp = requests.post(f"{BASE_URL}/portfolio/stress", json={
+        "include_defaults": False,
+        "scenarios": [{"name": "Crypto Winter", "shocks": {"crypto": -0.8}}]
+    }, headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert [r["scenario"] for r in resp.json()] == ["Crypto Winter"]
+    assert resp.json()[0]["change_amount"] == -80
+
+    # 3. Unknown asset classes are rejected
+    resp = requests.post(f"{BASE_URL}/portfolio/stress", json={
+        "scenarios": [{"name": "Typo", "shocks": {"equities": -0.1}}]
+    }, headers=headers)
+    assert resp.status_code == 400
+
+    # 4. Legacy portfolio: only the JSON blob, written before lines carried an asset class
+    legacy = [
+        {"asset": "Tech Growth Stocks", "percent": 60, "amount": 600, "color": "#8B5CF6"},
+        {"asset": "Emerging Markets", "percent": 30, "amount": 300, "color": "#EC4899"},
+        {"asset": "Crypto / Alt Assets", "percent": 10, "amount": 100, "color": "#EF4444"},
+    ]
+    conn = sqlite3.connect(DB_PATH)
+    portfolio_id = conn.execute("SELECT id FROM user_portfolio WHERE user_id = ?", (user_id,)).fetchone()[0]
+    conn.execute("DELETE FROM portfolio_allocations WHERE portfolio_id = ?", (portfolio_id,))
+    conn.execute("UPDATE user_portfolio SET allocation_json = ? WHERE id = ?", (json.dumps(legacy), portfolio_id))
+    conn.commit()
+    conn.close()
+
+    results = {r["scenario"]: r for r in requests.get(f"{BASE_URL}/portfolio/stress", headers=headers).json()}
+    assert abs(results["Global Recession"]["change_percent"] - (-0.32)) < 1e-9, results["Global Recession"]
+    assert results["Global Recession"]["projected_value"] == 680
+    print(f"Legacy recession drawdown: {results['Global Recession']['change_percent']:.0%}")
+
+    # 5. Book-wide report is admin-only
+    assert requests.get(f"{BASE_URL}/portfolio/stress/book", headers=headers).status_code == 403
+
+    requests.post(f"{BASE_URL}/auth/signup", json={"email": ADMIN_EMAIL, "password": "password123"})
+    admin_token, _ = login(ADMIN_EMAIL, "password123")
+    resp = requests.get(f"{BASE_URL}/portfolio/stress/book", headers={"Authorization": f"Bearer {admin_token}"})
+    assert resp.status_code == 200, resp.text
+    book = resp.json()
+    assert book["portfolios"] >= 1
+    recession = next(s for s in book["scenarios"] if s["scenario"] == "Global Recession")
+    assert recession["worst_portfolio_change_percent"] <= -0.32
+    print(f"Book of {book['portfolios']} portfolios, recession change {recession['change_percent']:.1%}")
+
+    print("--- Verification PASSED: Stress Testing Works ---")
+
+if __name__ == "__main__":
+    try:
+        test_portfolio_stress()
+    except Exception as e:
+        print(f"FAILED: {e}")
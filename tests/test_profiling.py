@@ -0,0 +1,66 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+ADMIN_EMAIL = "admin@example.com"  # Server must run with ADMIN_EMAILS=admin@example.com
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_profiling():
+    print("--- Starting Profiler Verification ---")
+
+    email, password = create_user("profiled_user")
+    token, _ = login(email, password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 1. Admin only
+    resp = requests.post(f"{BASE_URL}/admin/profiling", json={"route": "/scenarios/simulate", "method": "POST"}, headers=headers)
+    assert resp.status_code == 403
+
+    requests.post(f"{BASE_URL}/auth/signup", json={"email": ADMIN_EMAIL, "password": "password123"})
+    admin_token, _ = login(ADMIN_EMAIL, "password123")
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+
+    # 2. Unknown routes are rejected
+    resp = requests.post(f"{BASE_URL}/admin/profiling", json={"route": "/nope"}, headers=admin_headers)
+    assert resp.status_code == 404
+
+    # 3. Profile a CPU-heavy route
+    resp = requests.post(f"{BASE_URL}/admin/profiling", json={
+        "route": "/scenarios/simulate", "method": "POST", "interval_ms": 1, "max_requests": 5
+    }, headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+
+    for _ in range(3):
+        requests.post(f"{BASE_URL}/scenarios/simulate", json={"type": "invest", "paths": 50000}, headers=headers)
+
+    status = requests.get(f"{BASE_URL}/admin/profiling", headers=admin_headers).json()
+    assert status["requests_profiled"] == 3
+    assert status["samples"] > 0
+
+    folded = requests.delete(f"{BASE_URL}/admin/profiling", headers=admin_headers).text
+    first = folded.splitlines()[0]
+    stack, count = first.rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+    assert "simulation_engine" in folded
+    print(f"Hottest stack: {first[-120:]}")
+
+    assert requests.get(f"{BASE_URL}/admin/profiling", headers=admin_headers).status_code == 404
+
+    print("--- Verification PASSED: Profiler Works ---")
+
+if __name__ == "__main__":
+    try:
+        test_profiling()
+    except Exception as e:
+        print(f"FAILED: {e}")
@@ -0,0 +1,89 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+ADMIN_EMAIL = "admin@example.com"  # Server must run with ADMIN_EMAILS=admin@example.com
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_recommendations_cache():
+    print("--- Starting Deterministic Recommendations Verification ---")
+
+    email, password = create_user("recs_user")
+    token, user_id = login(email, password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    requests.put(f"{BASE_URL}/auth/profile", json={
+        "user_type": "job",
+        "monthly_income": 6000,
+        "monthly_expenses": 3500,
+        "risk_tolerance": "moderate"
+    }, headers=headers)
+
+    # 1. Same profile, same confidence scores
+    first = requests.get(f"{BASE_URL}/recommendations/job", headers=headers)
+    second = requests.get(f"{BASE_URL}/recommendations/job", headers=headers)
+    assert first.json() == second.json()
+    assert 55 <= first.json()["confidence_score"] <= 95
+
+    # 2. Repeat loads are 304s
+    etag = first.headers["ETag"]
+    resp = requests.get(f"{BASE_URL}/recommendations/job", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+
+    # 3. A profile write changes the version and the recommendation
+    requests.put(f"{BASE_URL}/auth/profile", json={"monthly_income": 9000}, headers=headers)
+    resp = requests.get(f"{BASE_URL}/recommendations/job", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["monthly_disposable"] == 5500
+    print("Recommendations stable between loads, refreshed after profile write.")
+    single = resp.json()
+
+    # 4. Savings now count towards confidence (savings over 3x income: +10 per category)
+    requests.put(f"{BASE_URL}/auth/profile", json={"current_savings": 50000}, headers=headers)
+    saver = requests.get(f"{BASE_URL}/recommendations/job", headers=headers).json()
+    assert saver["savings_confidence"] > single["savings_confidence"]
+    requests.put(f"{BASE_URL}/auth/profile", json={"current_savings": 0}, headers=headers)
+
+    # 5. Batch scoring agrees with the single-user path
+    assert requests.post(f"{BASE_URL}/recommendations/batch", json={"user_ids": [user_id]}, headers=headers).status_code == 403
+
+    requests.post(f"{BASE_URL}/auth/signup", json={"email": ADMIN_EMAIL, "password": "password123"})
+    admin_token, _ = login(ADMIN_EMAIL, "password123")
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    resp = requests.post(f"{BASE_URL}/recommendations/batch", json={"user_ids": [user_id, "missing"]}, headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+    batch = resp.json()
+    assert batch["user_ids"] == [user_id]
+    assert batch["confidence_score"] == [single["confidence_score"]]
+    assert batch["recommended_investment"] == [single["recommended_investment"]]
+
+    resp = requests.post(f"{BASE_URL}/recommendations/batch", json={
+        "income": [9000, 0], "expenses": [3500, 100], "savings": [0, 0], "risk_tolerance": ["moderate", "high"]
+    }, headers=admin_headers)
+    columns = resp.json()
+    assert columns["confidence_score"][0] == single["confidence_score"]
+    assert columns["monthly_disposable"] == [5500, 0]
+
+    resp = requests.post(f"{BASE_URL}/recommendations/batch", json={
+        "income": [1], "expenses": [1, 2], "savings": [0], "risk_tolerance": ["low"]
+    }, headers=admin_headers)
+    assert resp.status_code == 400
+
+    print("--- Verification PASSED: Deterministic Recommendations Work ---")
+
+if __name__ == "__main__":
+    try:
+        test_recommendations_cache()
+    except Exception as e:
+        print(f"FAILED: {e}")
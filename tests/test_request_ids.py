@@ -0,0 +1,26 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+def test_request_ids():
+    print("--- Starting Request ID Verification ---")
+
+    # 1. Every response carries a request id
+    resp = requests.get(f"{BASE_URL}/")
+    generated = resp.headers.get("X-Request-ID")
+    assert generated and len(generated) == 32
+
+    # 2. A caller-supplied id is propagated, so logs can be joined across services
+    incoming = f"trace-{uuid.uuid4()}"
+    resp = requests.get(f"{BASE_URL}/", headers={"X-Request-ID": incoming})
+    assert resp.headers["X-Request-ID"] == incoming
+    print(f"Request id echoed: {incoming}")
+
+    print("--- Verification PASSED: Request IDs Work ---")
+
+if __name__ == "__main__":
+    try:
+        test_request_ids()
+    except Exception as e:
+        print(f"FAILED: {e}")
@@ -0,0 +1,78 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def create_startup(headers, name):
+    resp = requests.post(f"{BASE_URL}/startups/", json={
+        "name": name,
+        "description": "Cascade test",
+        "revenue": 1000, "burn": 500, "cash": 10000, "growth": 5,
+        "team": 3, "runway": 20, "survival_score": 70
+    }, headers=headers)
+    assert resp.status_code == 200, resp.text
+    return resp.json()["id"]
+
+def connect_and_accept(inv_headers, st_headers, startup_id):
+    requests.post(f"{BASE_URL}/invest/connect", json={"startupId": startup_id}, headers=inv_headers)
+    pending = [
+        r for r in requests.get(f"{BASE_URL}/invest/startup/requests", headers=st_headers).json()
+        if r["status"] == "pending"
+    ]
+    requests.post(f"{BASE_URL}/invest/startup/requests/update", json={
+        "id": pending[0]["id"],
+        "action": "accept"
+    }, headers=st_headers)
+
+def test_startup_delete_cascade():
+    print("--- Starting Startup Delete Cascade Verification ---")
+
+    startup_email, startup_pass = create_user("founder_cascade")
+    st_token, _ = login(startup_email, startup_pass)
+    st_headers = {"Authorization": f"Bearer {st_token}"}
+
+    investor_email, investor_pass = create_user("investor_cascade")
+    inv_token, _ = login(investor_email, investor_pass)
+    inv_headers = {"Authorization": f"Bearer {inv_token}"}
+
+    # Names overlap on purpose: a text match on "Acme" would hit both
+    suffix = uuid.uuid4().hex[:6]
+    acme_id = create_startup(st_headers, f"Acme{suffix}")
+    labs_id = create_startup(st_headers, f"Acme{suffix} Labs")
+
+    connect_and_accept(inv_headers, st_headers, acme_id)
+    connect_and_accept(inv_headers, st_headers, labs_id)
+    assert len(requests.get(f"{BASE_URL}/notifications/", headers=inv_headers).json()) == 2
+
+    resp = requests.delete(f"{BASE_URL}/startups/{acme_id}", headers=st_headers)
+    assert resp.status_code == 200, resp.text
+
+    notifs = requests.get(f"{BASE_URL}/notifications/", headers=inv_headers).json()
+    assert len(notifs) == 1, "Only the deleted startup's notification should be removed"
+    assert "Labs" in notifs[0]["message"]
+
+    # Badge is recounted after the cascade
+    assert requests.get(f"{BASE_URL}/notifications/unread-count", headers=inv_headers).json()["unread"] == 1
+
+    remaining = requests.get(f"{BASE_URL}/invest/startup/requests", headers=st_headers).json()
+    assert len(remaining) == 1
+
+    print("--- Verification PASSED: Startup Delete Cascade Is Precise ---")
+
+if __name__ == "__main__":
+    try:
+        test_startup_delete_cascade()
+    except Exception as e:
+        print(f"FAILED: {e}")
@@ -0,0 +1,56 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_startup_ranking():
+    print("--- Starting Startup Ranking Verification ---")
+
+    founder_email, founder_pass = create_user("founder_rank")
+    f_token, _ = login(founder_email, founder_pass)
+    f_headers = {"Authorization": f"Bearer {f_token}"}
+
+    # 1. Score is materialized on create
+    resp = requests.post(f"{BASE_URL}/startups/", json={
+        "name": f"Perfect {uuid.uuid4().hex[:6]}",
+        "revenue": 50000, "burn": 5000, "cash": 500000, "growth": 40,
+        "team": 5, "runway": 24, "survival_score": 100
+    }, headers=f_headers)
+    assert resp.status_code == 200, resp.text
+    perfect = resp.json()
+    assert perfect["fundability_score"] == 100
+
+    # 2. Investors of every risk profile get a ranked list containing it
+    for risk in ["low", "moderate", "high"]:
+        email, password = create_user(f"investor_rank_{risk}")
+        token, _ = login(email, password)
+        headers = {"Authorization": f"Bearer {token}"}
+        requests.put(f"{BASE_URL}/auth/profile", json={"user_type": "job", "risk_tolerance": risk}, headers=headers)
+
+        resp = requests.get(f"{BASE_URL}/startups/recommended", params={"k": 100}, headers=headers)
+        assert resp.status_code == 200, resp.text
+        ranked = resp.json()
+        scores = [s["match_score"] for s in ranked]
+        assert scores == sorted(scores, reverse=True)
+        assert scores[0] == 100
+        print(f"{risk}: top match {ranked[0]['name']} ({scores[0]})")
+
+    print("--- Verification PASSED: Startup Ranking Works ---")
+
+if __name__ == "__main__":
+    try:
+        test_startup_ranking()
+    except Exception as e:
+        print(f"FAILED: {e}")
@@ -0,0 +1,78 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_treasury_forecast():
+    print("--- Starting Treasury Forecast Verification ---")
+
+    email, password = create_user("treasury_user")
+    token, _ = login(email, password)
+    headers = {"Authorization": f"Bearer {token}"}
+    requests.put(f"{BASE_URL}/auth/profile", json={"user_type": "startup"}, headers=headers)
+
+    # 1. Saving the treasury materializes runway: 120k cash, 10k/month net burn
+    resp = requests.put(f"{BASE_URL}/finance/treasury", json={
+        "cash_balance": 120000, "annual_revenue": 120000, "monthly_expenses": 20000,
+        "debt": 0, "other_assets": 0
+    }, headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["data"]["runway_months"] == 12
+
+    resp = requests.get(f"{BASE_URL}/finance/treasury", headers=headers)
+    treasury = resp.json()
+    assert treasury["monthly_net_burn"] == 10000
+    assert treasury["runway_months"] == 12
+    assert treasury["cash_zero_date"]
+
+    resp = requests.get(f"{BASE_URL}/auth/me", headers=headers)
+    assert resp.json()["data"]["runway_months"] == 12
+
+    # 2. Base projection plus a growth x burn sweep in one call
+    resp = requests.post(f"{BASE_URL}/finance/treasury/forecast", json={
+        "months": 36, "revenue_growth": 0.02,
+        "growth_grid": [0, 0.05, 0.1], "burn_grid": [-0.02, 0, 0.02]
+    }, headers=headers)
+    assert resp.status_code == 200, resp.text
+    forecast = resp.json()
+    summary = forecast["summary"]
+    assert summary["runway_months"] == 12
+    assert summary["projected_runway_months"] > 12  # Revenue growth stretches the runway
+    assert summary["burn_multiple"] == round(10000 / (120000 * 0.02), 2)
+    assert len(forecast["projection"]) == 36
+    assert forecast["projection"][0] == {
+        "month": 1, "revenue": 10000, "expenses": 20000, "net_cash_flow": -10000, "cash": 110000
+    }
+
+    grid = forecast["grid"]
+    assert len(grid["runway_months"]) == 3 and all(len(row) == 3 for row in grid["runway_months"])
+    assert grid["runway_months"][0][1] == 12
+    # More growth never shortens runway; more burn never lengthens it (None = lasts the horizon)
+    runway = [[m if m is not None else float("inf") for m in row] for row in grid["runway_months"]]
+    for i in range(3):
+        for j in range(2):
+            assert runway[i][j] >= runway[i][j + 1]
+            assert runway[j][i] <= runway[j + 1][i]
+
+    # 3. Rates at or below -100% are rejected
+    resp = requests.post(f"{BASE_URL}/finance/treasury/forecast", json={
+        "growth_grid": [-1.5], "burn_grid": [0]
+    }, headers=headers)
+    assert resp.status_code == 400
+
+    print("Treasury forecast test passed.")
+
+if __name__ == "__main__":
+    test_treasury_forecast()
@@ -0,0 +1,100 @@
+import os
+import sqlite3
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+# The server's database (same DATABASE_URL override as backend/db/database.py), for legacy rows the API can't create
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+DB_PATH = (
+    DATABASE_URL[len("sqlite:///"):] if DATABASE_URL.startswith("sqlite:///")
+    else os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend", "db", "app.db")
+)
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def unread(path, headers):
+    resp = requests.get(f"{BASE_URL}{path}", headers=headers)
+    assert resp.status_code == 200, resp.text
+    return resp.json()["unread"]
+
+def test_unread_counts():
+    print("--- Starting Unread Counter Verification ---")
+
+    startup_email, startup_pass = create_user("startup_badge")
+    st_token, st_id = login(startup_email, startup_pass)
+    st_headers = {"Authorization": f"Bearer {st_token}"}
+
+    investor_email, investor_pass = create_user("investor_badge")
+    inv_token, _ = login(investor_email, investor_pass)
+    inv_headers = {"Authorization": f"Bearer {inv_token}"}
+
+    # 1. Fresh users start at zero (counter rows are built on first read)
+    assert unread("/invest/startup/requests/unread-count", st_headers) == 0
+    assert unread("/notifications/unread-count", inv_headers) == 0
+
+    # 2. New request bumps the startup badge
+    resp = requests.post(f"{BASE_URL}/invest/connect", json={
+        "startupId": st_id,
+        "message": "Badge check"
+    }, headers=inv_headers)
+    assert resp.json()["success"] == True
+    assert unread("/invest/startup/requests/unread-count", st_headers) == 1
+
+    request_id = requests.get(f"{BASE_URL}/invest/requests", headers=st_headers).json()[0]["id"]
+
+    # 3. Reading it clears the badge; reading twice does not go negative
+    requests.post(f"{BASE_URL}/invest/read/{request_id}", headers=st_headers)
+    requests.post(f"{BASE_URL}/invest/read/{request_id}", headers=st_headers)
+    assert unread("/invest/startup/requests/unread-count", st_headers) == 0
+
+    # 4. Accepting notifies the investor
+    requests.post(f"{BASE_URL}/invest/startup/requests/update", json={
+        "id": request_id,
+        "action": "accept"
+    }, headers=st_headers)
+    assert unread("/notifications/unread-count", inv_headers) == 1
+
+    requests.post(f"{BASE_URL}/notifications/read-bulk", json={}, headers=inv_headers)
+    assert unread("/notifications/unread-count", inv_headers) == 0
+
+    # 5. A counter created by the first new request counts it, before the badge was ever read
+    owner_email, owner_pass = create_user("startup_legacy_badge")
+    owner_token, owner_id = login(owner_email, owner_pass)
+    owner_headers = {"Authorization": f"Bearer {owner_token}"}
+    resp = requests.post(f"{BASE_URL}/invest/connect", json={
+        "startupId": owner_id,
+        "message": "Legacy badge check"
+    }, headers=inv_headers)
+    assert resp.json()["success"] == True
+    assert unread("/invest/startup/requests/unread-count", owner_headers) == 1
+
+    # 6. Legacy requests linked only by owner email show in the inbox, the badge and mark-read alike
+    conn = sqlite3.connect(DB_PATH)
+    with conn:
+        conn.execute("UPDATE investment_requests_v2 SET startup_user_id = NULL WHERE startup_owner = ?", (owner_email,))
+        conn.execute("DELETE FROM unread_counters WHERE user_id = ?", (owner_id,))  # rebuilt on next read
+    conn.close()
+    inbox = requests.get(f"{BASE_URL}/invest/startup/requests", headers=owner_headers).json()
+    assert len(inbox) == 1
+    assert unread("/invest/startup/requests/unread-count", owner_headers) == 1
+    requests.post(f"{BASE_URL}/invest/read/{inbox[0]['id']}", headers=owner_headers)
+    assert unread("/invest/startup/requests/unread-count", owner_headers) == 0
+
+    print("--- Verification PASSED: Unread Counters Work ---")
+
+if __name__ == "__main__":
+    try:
+        test_unread_counts()
+    except Exception as e:
+        print(f"FAILED: {e}")
@@ -0,0 +1,54 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+def create_user(email_prefix, password="password123"):
+    email = f"{email_prefix}_{uuid.uuid4()}@example.com"
+    resp = requests.post(f"{BASE_URL}/auth/signup", json={"email": email, "password": password})
+    if resp.status_code != 200:
+        raise Exception(f"Signup failed: {resp.text}")
+    print(f"Created user: {email}")
+    return email, password
+
+def login(email, password):
+    resp = requests.post(f"{BASE_URL}/auth/login", data={"username": email, "password": password})
+    return resp.json()["access_token"], resp.json()["user_id"]
+
+def test_validate_ids():
+    print("--- Starting Validate IDs Verification ---")
+
+    email, password = create_user("founder_validate")
+    token, _ = login(email, password)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = requests.post(f"{BASE_URL}/startups/", json={
+        "name": "Validate Me", "revenue": 0, "burn": 0, "cash": 0, "growth": 0,
+        "team": 1, "runway": 0, "survival_score": 0
+    }, headers=headers)
+    real_id = resp.json()["id"]
+    fake_id = str(uuid.uuid4())
+
+    # 1. Duplicates are collapsed, order follows the request
+    resp = requests.post(f"{BASE_URL}/startups/validate-ids", json=[real_id, real_id, fake_id], headers=headers)
+    assert resp.json() == {"valid_ids": [real_id]}
+
+    # 2. Bitmap form: one bit per submitted id -> 110 -> 0xC0
+    resp = requests.post(f"{BASE_URL}/startups/validate-ids", params={"format": "bitmap"},
+                         json=[real_id, real_id, fake_id], headers=headers)
+    assert resp.json() == {"size": 3, "bitmap": "wA=="}
+
+    # 3. Large caches no longer hit the bound-parameter limit
+    big = [str(uuid.uuid4()) for _ in range(5000)] + [real_id]
+    resp = requests.post(f"{BASE_URL}/startups/validate-ids", json=big, headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["valid_ids"] == [real_id]
+    print("5001 ids validated in one call.")
+
+    print("--- Verification PASSED: Validate IDs Works ---")
+
+if __name__ == "__main__":
+    try:
+        test_validate_ids()
+    except Exception as e:
+        print(f"FAILED: {e}")